@@ -2,7 +2,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from database import init_db
+from database import init_db, SessionLocal, async_engine
 from middleware.cors import CORS_SETTINGS
 from routers import (
     auth_router,
@@ -10,9 +10,20 @@ from routers import (
     search_router,
     cart_router,
     booking_router,
-    payment_router
+    payment_router,
+    filter_router,
+    projections_router,
+    rates_router
 )
-from core.frp import event_bus, log_event
+from core.frp import event_bus, log_event, ALL_EVENTS
+from database.event_sink import event_sink
+from core.projections import projections
+from controllers.projection_controller import ProjectionController
+from core.cache import cache_registry
+from core.inventory import inventory_index
+from controllers.inventory_controller import InventoryController
+from controllers.search_cache import search_cache
+from controllers.hold_expiry import hold_expiry
 from config.settings import settings
 
 # Create FastAPI app
@@ -36,6 +47,9 @@ app.include_router(search_router)
 app.include_router(cart_router)
 app.include_router(booking_router)
 app.include_router(payment_router)
+app.include_router(filter_router)
+app.include_router(projections_router)
+app.include_router(rates_router)
 
 # Mount static files
 try:
@@ -49,18 +63,56 @@ except RuntimeError:
 async def startup_event():
     """Initialize database and event bus on startup."""
     init_db()
-    # Subscribe to events for logging
-    event_bus.subscribe("SEARCH", log_event)
-    event_bus.subscribe("BOOKED", log_event)
-    event_bus.subscribe("CANCELLED", log_event)
-    event_bus.subscribe("PAYMENT", log_event)
+    # Subscribe to events for logging, off the request path
+    event_bus.configure(
+        settings.EVENT_BUS_QUEUE_SIZE,
+        settings.EVENT_BUS_OVERFLOW,
+        settings.EVENT_BUS_SAMPLE_EVERY
+    )
+    for name in ("SEARCH", "BOOKED", "CANCELLED", "PAYMENT"):
+        event_bus.subscribe(name, log_event, background=True)
+    if settings.EVENT_BUS_WORKERS > 0:
+        event_bus.start(settings.EVENT_BUS_WORKERS)
+    # Audit trail: events are buffered and inserted in batches
+    if settings.EVENT_SINK_ENABLED:
+        event_sink.recover()
+        event_sink.subscribe(event_bus, ALL_EVENTS)
+        event_sink.start()
+    # Load the in-memory inventory index and read models, then keep them current through events
+    db = SessionLocal()
+    try:
+        InventoryController.load_index(db, inventory_index)
+        ProjectionController.rebuild(db, projections, settings.PROJECTION_SNAPSHOT_PATH)
+    finally:
+        db.close()
+    projections.subscribe(event_bus)
+    inventory_index.subscribe(event_bus)
+    search_cache.subscribe(event_bus)
+    # Unpaid holds expire on a timing wheel; deadlines pending before a restart are reloaded
+    if settings.HOLD_TTL > 0:
+        hold_expiry.subscribe(event_bus)
+        hold_expiry.recover()
+        hold_expiry.start()
     print(f"✅ {settings.APP_NAME} started successfully!")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up on shutdown."""
+    hold_expiry.close()
+    # Handle every queued event before the process exits
+    event_bus.stop(settings.EVENT_BUS_FLUSH_TIMEOUT)
+    event_sink.close()
+    # The snapshot is checkpointed on stored event ids, so it is only written
+    # once the sink stored every event; otherwise the previous one is kept
+    if settings.PROJECTION_SNAPSHOT_PATH and event_sink.persisted():
+        db = SessionLocal()
+        try:
+            ProjectionController.save(db, projections, settings.PROJECTION_SNAPSHOT_PATH)
+        finally:
+            db.close()
     event_bus.clear()
+    await async_engine.dispose()
     print("👋 Application shutdown")
 
 
@@ -81,6 +133,18 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/caches")
+async def cache_statistics():
+    """Hit, miss and eviction counters of every registered cache."""
+    return cache_registry.stats()
+
+
+@app.get("/health/events")
+async def event_statistics():
+    """Event bus queue depth, drops and per-handler latency/failures."""
+    return {**event_bus.stats(), "sink": event_sink.stats(), "hold_expiry": hold_expiry.stats()}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
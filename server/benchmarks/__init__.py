@@ -0,0 +1,7 @@
+"""Benchmarks package - run modules with `python -m benchmarks.<name>`."""
+import sys
+from pathlib import Path
+
+# Add server directory to path for imports
+server_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(server_dir))
@@ -0,0 +1,70 @@
+"""Benchmark: amenity filtering on JSON text vs the bitmask columns.
+
+Run from the server directory:
+    python -m benchmarks.amenity_filter --hotels 200000
+
+Counts hotels having WiFi AND Pool AND Spa four ways: LIKE on the JSON
+column vs ``features_mask & bits`` in SQLite, and json.loads + list
+membership vs one NumPy AND in memory.
+"""
+import argparse
+import json
+import random
+import time
+import numpy as np
+from sqlalchemy import func, insert, select
+from core.amenities import AMENITIES, has_amenities
+from core.predicates import ContainsAll
+from models import Hotel
+from benchmarks.seed import make_engine
+
+WANTED = ("WiFi", "Pool", "Spa")
+
+
+def timed(label: str, fn):
+    started = time.perf_counter()
+    result = fn()
+    print(f"  {label:<22} {(time.perf_counter() - started) * 1000:9.1f} ms  -> {result}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hotels", type=int, default=200000)
+    args = parser.parse_args()
+
+    rnd = random.Random(1)
+    rows = [
+        {
+            "id": i,
+            "name": f"Hotel {i}",
+            "stars": 3,
+            "city": "Tashkent",
+            "features": json.dumps(rnd.sample(AMENITIES.names, rnd.randint(2, 10)))
+        }
+        for i in range(1, args.hotels + 1)
+    ]
+    engine, _ = make_engine()
+    with engine.begin() as conn:
+        conn.execute(insert(Hotel), rows)
+
+    columns = {"features": Hotel.features, "features_mask": Hotel.features_mask}
+    like = ContainsAll("features", WANTED)
+    bits = has_amenities(WANTED)
+    print(f"{args.hotels} hotels, filter {' AND '.join(WANTED)}")
+    with engine.connect() as conn:
+        count = lambda predicate: conn.scalar(select(func.count()).where(predicate.to_sql(columns)))
+        expected = timed("SQL LIKE on JSON", lambda: count(like))
+        assert timed("SQL bitmask AND", lambda: count(bits)) == expected
+        features, masks = zip(*conn.execute(select(Hotel.features, Hotel.features_mask)).all())
+
+    def parse_and_check():
+        return sum(all(name in json.loads(text) for name in WANTED) for text in features)
+
+    mask_array = np.array(masks, dtype=np.int64)
+    assert timed("Python json.loads", parse_and_check) == expected
+    assert timed("NumPy bitmask AND", lambda: int(bits.mask({"features_mask": mask_array}).sum())) == expected
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Benchmark: search throughput vs parallel clients, on the loop vs in the threadpool.
+
+Run from the server directory:
+    python -m benchmarks.async_concurrency --hotels 1200 --requests 64
+
+Each client is a coroutine on one event loop, as route handlers are. The
+"blocking" handler calls the sync controller directly, so each request
+holds the loop until it is done. The "threadpool" handler awaits
+AsyncSearchController, which runs the same controller on a worker thread.
+Every request is a different search, so nothing is coalesced, and the
+search result cache is disabled.
+
+Most of a search is Python work under the GIL (ORM hydration, building
+and ranking offers); only the time SQLite spends reading runs in parallel.
+Throughput therefore stays about flat with more clients in both columns
+(on one core, 60 hotels: about 130 req/s each; 1200 hotels: about
+8-11 req/s each). What the threadpool changes is the loop stall: while a
+search runs, the blocking handler keeps the loop from serving anything
+else for a whole request (about 0.5 s at 60 hotels, 3 s at 1200), while
+with the threadpool the loop keeps being scheduled between GIL switches
+(tens to a few hundred ms under load).
+"""
+import os
+
+os.environ["SEARCH_CACHE_SIZE"] = "0"
+
+import argparse
+import asyncio
+import itertools
+import tempfile
+import time
+from pathlib import Path
+from typing import Tuple
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from controllers.search_controller import SearchController
+from controllers.async_controller import AsyncSearchController
+from benchmarks.seed import CITIES, make_engine, seed_catalog
+
+
+async def run_clients(handler, queries, clients: int) -> Tuple[float, float]:
+    """Serve every query once with ``clients`` concurrent workers.
+
+    Returns req/s and the longest the event loop was unable to run anything
+    else, measured by a ticker that asks to wake up every millisecond.
+    """
+    pending = iter(queries)
+    done = asyncio.Event()
+    stall = 0.0
+
+    async def client():
+        for query in pending:
+            await handler(*query)
+
+    async def ticker():
+        nonlocal stall
+        while not done.is_set():
+            asked = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stall = max(stall, time.perf_counter() - asked - 0.001)
+
+    ticking = asyncio.ensure_future(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await ticking
+    return len(queries) / elapsed, stall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hotels", type=int, default=1200)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    path = str(Path(tempfile.mkdtemp()) / "bench.db")
+    engine, _ = make_engine(path)
+    stats = seed_catalog(engine, hotels=args.hotels, days=args.days)
+    print(f"seeded {stats['hotels']} hotels, {stats['rate_plans']} rate plans, {stats['prices']} prices")
+    dates = stats["dates"]
+    # Distinct searches: city, checkin, 1-3 nights and guests all vary
+    searches = itertools.product(range(len(dates) - 3), CITIES, (1, 2, 3), (1, 2))
+    queries = [
+        (city, dates[start], dates[start + nights], guests)
+        for start, city, nights, guests in itertools.islice(searches, args.requests)
+    ]
+
+    pooled = create_engine(
+        f"sqlite:///{path}", pool_size=max(args.clients), connect_args={"check_same_thread": False}
+    )
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=pooled)
+
+    async def blocking_handler(city, checkin, checkout, guests):
+        db = session_factory()
+        try:
+            SearchController.search_page(db, city, checkin, checkout, guests)
+        finally:
+            db.close()
+
+    async def threadpool_handler(city, checkin, checkout, guests):
+        db = session_factory()
+        try:
+            await AsyncSearchController.search_page(db, city, checkin, checkout, guests)
+        finally:
+            db.close()
+
+    async def bench():
+        # Warm up connections and the page cache
+        await run_clients(threadpool_handler, queries, max(args.clients))
+        for clients in args.clients:
+            blocking_rps, blocking_stall = await run_clients(blocking_handler, queries, clients)
+            threadpool_rps, threadpool_stall = await run_clients(threadpool_handler, queries, clients)
+            print(
+                f"clients={clients:<3} blocking={blocking_rps:8.1f} req/s (loop stalled {blocking_stall * 1000:6.1f} ms)"
+                f"  threadpool={threadpool_rps:8.1f} req/s (loop stalled {threadpool_stall * 1000:6.1f} ms)"
+            )
+
+    asyncio.run(bench())
+    pooled.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark: weekend-aware date-range pricing - per-day loop vs closed form vs batch.
+
+Run from the server directory:
+    python -m benchmarks.date_range_pricing --rows 200000
+"""
+import argparse
+import random
+import time
+import numpy as np
+from core.days import Day
+from core.memo import calculate_date_range_price, calculate_date_range_prices
+from core.recursion import split_date_range
+
+
+def loop_price(start_date: str, end_date: str, base_price: int) -> int:
+    """The former implementation: parse and test every day of the range."""
+    total = 0
+    for date_str in split_date_range(start_date, end_date):
+        multiplier = 1.2 if Day.parse(date_str).to_date().weekday() >= 5 else 1.0
+        total += int(base_price * multiplier)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--max-nights", type=int, default=30)
+    args = parser.parse_args()
+
+    rnd = random.Random(42)
+    first = Day.parse("2025-01-01")
+    starts = np.array([first + rnd.randrange(365) for _ in range(args.rows)], dtype=np.int64)
+    ends = starts + np.array([rnd.randrange(args.max_nights) for _ in range(args.rows)], dtype=np.int64)
+    prices = np.array([rnd.randrange(100000, 2000000) for _ in range(args.rows)], dtype=np.int64)
+    iso_rows = [(Day(s).isoformat(), Day(e).isoformat(), int(p)) for s, e, p in zip(starts, ends, prices)]
+
+    sample = iso_rows[:min(len(iso_rows), 20000)]
+    started = time.perf_counter()
+    expected = [loop_price(*row) for row in sample]
+    loop = (time.perf_counter() - started) / len(sample)
+
+    started = time.perf_counter()
+    scalar = [calculate_date_range_price(*row) for row in iso_rows]
+    closed = (time.perf_counter() - started) / len(iso_rows)
+
+    started = time.perf_counter()
+    batch = calculate_date_range_prices(starts, ends, prices)
+    vectorized = (time.perf_counter() - started) / len(iso_rows)
+
+    assert scalar[:len(sample)] == expected
+    assert batch.tolist() == scalar
+    print(f"loop        {loop * 1e6:9.3f} us/row")
+    print(f"closed form {closed * 1e6:9.3f} us/row")
+    print(f"batch       {vectorized * 1e6:9.3f} us/row  ({args.rows} rows in {vectorized * args.rows * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
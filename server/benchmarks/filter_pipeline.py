@@ -0,0 +1,75 @@
+"""Benchmark: FilterService.apply_filters, one tuple per stage vs fused.
+
+Run from the server directory:
+    python -m benchmarks.filter_pipeline --offers 1000000
+
+The staged pipeline is the former apply_filters: five ``pipe`` steps, each
+building a full tuple. Peak memory is measured with tracemalloc on top of
+the input offers.
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from core.compose import pipe
+from core.domain import Hotel, RoomType, RatePlan, SearchOffer
+from core.service import FilterService
+from core.transforms import sort_by_price, filter_available_offers
+
+
+def make_offers(n: int, seed: int = 7) -> tuple:
+    """``n`` offers over 1000 hotels with random prices and availability."""
+    rng = random.Random(seed)
+    hotels = [Hotel(i, f"Hotel {i}", rng.randint(1, 5), "Tashkent") for i in range(1000)]
+    offers = []
+    for i in range(n):
+        hotel = hotels[i % len(hotels)]
+        room = RoomType(i, hotel.id, "Standard", 2)
+        rate = RatePlan(i, hotel.id, room.id, "BB", "Bed & Breakfast", True, 1)
+        offers.append(SearchOffer(hotel, room, rate, rng.randint(50, 1000), rng.random() < 0.8))
+    return tuple(offers)
+
+
+def staged_filters(offers, min_price, max_price, min_stars, sort_by):
+    """The pre-fusion apply_filters: one tuple per stage."""
+    return pipe(
+        lambda offers: tuple(o for o in offers if o.total_price >= min_price),
+        lambda offers: tuple(o for o in offers if o.total_price <= max_price),
+        lambda offers: tuple(o for o in offers if o.hotel.stars >= min_stars),
+        lambda offers: filter_available_offers(offers),
+        lambda offers: sort_by_price(offers) if sort_by == "price" else offers
+    )(offers)
+
+
+def fused_filters(offers, min_price, max_price, min_stars, sort_by):
+    return FilterService.apply_filters(offers, min_price, max_price, min_stars, sort_by)
+
+
+def measure(label: str, fn, *args):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<8} {elapsed * 1000:9.1f} ms  peak {peak / 2**20:7.1f} MiB  ({len(result)} offers)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--offers", type=int, default=1000000)
+    args = parser.parse_args()
+
+    offers = make_offers(args.offers)
+    print(f"{len(offers)} offers, price 100..900, stars >= 2")
+    for sort_by in ("price", "none"):
+        print(f"sort_by={sort_by}")
+        filters = (100, 900, 2, sort_by)
+        staged = measure("staged", staged_filters, offers, *filters)
+        fused = measure("fused", fused_filters, offers, *filters)
+        assert staged == fused
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark: nightly price rows vs run-length rate intervals.
+
+Run from the server directory:
+    python -m benchmarks.rate_intervals --hotels 1200 --days 90 --quotes 2000
+
+Seeds both representations of the same prices, then compares their row
+counts and on-disk size and times stay quotes against each: SUM over the
+nights in ``prices`` vs SUM(amount * overlap) over ``rate_intervals``.
+``--weekend-surcharge 0.2`` prices weekends differently, which splits every
+week into two runs.
+"""
+import argparse
+import random
+import time
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from core.days import to_day
+from benchmarks.seed import make_engine, seed_catalog
+
+NIGHTLY = text(
+    "SELECT SUM(amount), COUNT(*) FROM prices WHERE rate_id = :rate_id AND day >= :start AND day < :end"
+)
+INTERVALS = text(
+    "SELECT SUM(amount * (MIN(day_to, :end) - MAX(day_from, :start))), "
+    "SUM(MIN(day_to, :end) - MAX(day_from, :start)) "
+    "FROM rate_intervals WHERE rate_id = :rate_id AND day_from < :end AND day_to > :start"
+)
+
+
+def table_bytes(conn, table: str):
+    """Bytes of a table and its indexes, if SQLite was built with dbstat."""
+    try:
+        return conn.execute(text(
+            "SELECT SUM(pgsize) FROM dbstat WHERE name = :table "
+            "OR name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table)"
+        ), {"table": table}).scalar()
+    except OperationalError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hotels", type=int, default=1200)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--quotes", type=int, default=2000)
+    parser.add_argument("--weekend-surcharge", type=float, default=0.0)
+    args = parser.parse_args()
+
+    engine, _ = make_engine()
+    stats = seed_catalog(
+        engine, hotels=args.hotels, days=args.days,
+        weekend_surcharge=args.weekend_surcharge, nightly_prices=True
+    )
+    first_day = to_day(stats["dates"][0])
+    rnd = random.Random(3)
+    stays = []
+    for _ in range(args.quotes):
+        start = first_day + rnd.randrange(args.days - 7)
+        stays.append({"rate_id": rnd.randint(1, stats["rate_plans"]), "start": start, "end": start + rnd.randint(1, 7)})
+
+    with engine.connect() as conn:
+        print(f"{stats['rate_plans']} rate plans x {args.days} nights")
+        for table in ("prices", "rate_intervals"):
+            rows = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+            size = table_bytes(conn, table)
+            size_text = f"{size / 1024:10.0f} KiB" if size is not None else "   (no dbstat)"
+            print(f"  {table:<15} {rows:9d} rows {size_text}")
+
+        results = {}
+        for name, statement in (("nightly", NIGHTLY), ("intervals", INTERVALS)):
+            started = time.perf_counter()
+            results[name] = [tuple(conn.execute(statement, stay).one()) for stay in stays]
+            elapsed = time.perf_counter() - started
+            print(f"  {name:<10} {args.quotes / elapsed:10.0f} quotes/s  ({elapsed * 1e6 / args.quotes:6.1f} us each)")
+        assert results["nightly"] == results["intervals"], "the two representations disagree"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: core.recursion at 10^5 - 10^6 elements.
+
+Run from the server directory:
+    python -m benchmarks.recursion --sizes 100000 1000000
+
+The former recursive versions hit RecursionError at about 1000 levels, and
+the slicing ones (sum_recursive, reverse_recursive) were O(n^2), so only
+the current implementations are timed.
+"""
+import argparse
+import time
+from datetime import date, timedelta
+from core.recursion import (
+    split_date_range,
+    flatten_tuple,
+    filter_tree,
+    max_depth,
+    count_leaves,
+    sum_recursive,
+    reverse_recursive,
+    iter_flatten
+)
+
+
+def deep_tree(depth: int) -> tuple:
+    """A single chain of nested tuples ``depth`` levels deep."""
+    tree = (depth - 1,)
+    for i in range(depth - 2, -1, -1):
+        tree = (i, tree)
+    return tree
+
+
+def wide_tree(leaves: int, fanout: int = 10) -> tuple:
+    """A balanced tree with ``leaves`` leaves."""
+    level = tuple(range(leaves))
+    while len(level) > fanout:
+        level = tuple(level[i:i + fanout] for i in range(0, len(level), fanout))
+    return level
+
+
+def timed(label: str, fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    print(f"  {label:<28} {(time.perf_counter() - started) * 1000:9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        print(f"n = {n}")
+        start = date(2000, 1, 1)
+        timed("split_date_range", split_date_range, start.isoformat(), (start + timedelta(days=n)).isoformat())
+        numbers = tuple(range(n))
+        timed("sum_recursive", sum_recursive, numbers)
+        timed("reverse_recursive", reverse_recursive, numbers)
+        for name, tree in (("deep", deep_tree(n)), ("wide", wide_tree(n))):
+            timed(f"flatten_tuple ({name})", flatten_tuple, tree)
+            timed(f"filter_tree ({name})", filter_tree, lambda x: x % 2 == 0, tree)
+            timed(f"max_depth ({name})", max_depth, tree)
+            timed(f"count_leaves ({name})", count_leaves, tree)
+            timed(f"iter_flatten first ({name})", next, iter_flatten(tree))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark: legacy per-row search loop vs the set-based SearchEngine.
+
+Run from the server directory:
+    python -m benchmarks.search_queries --hotels 1200 --runs 30 --legacy-runs 5
+
+The legacy loop issues one query per room type and rate plan, each of which
+walks the single-column date index, so it is given fewer runs by default.
+"""
+import argparse
+import time
+from typing import List
+from sqlalchemy.orm import Session
+from models.Hotel import Hotel as HotelModel
+from models.room_type import RoomType as RoomTypeModel
+from models.rate_plan import RatePlan as RatePlanModel
+from models.Price import Price as PriceModel
+from models.Availability import Availability as AvailabilityModel
+from core.recursion import split_date_range
+from core.days import DateRange
+from controllers.search_engine import SearchEngine
+from benchmarks.seed import CITIES, make_engine, seed_catalog, QueryCounter, percentile
+
+
+def legacy_search_hotels(db: Session, city: str, checkin: str, checkout: str, guests: int = 1) -> List[dict]:
+    """The original N+1 loop from SearchController.search_hotels, kept as a baseline.
+
+    It reads the legacy per-night ``prices`` table, which the catalog fills
+    for it.
+    """
+    hotels = db.query(HotelModel).filter(HotelModel.city.ilike(f"%{city}%")).all()
+    if not hotels:
+        return []
+    dates = split_date_range(checkin, checkout)
+    results = []
+    for hotel in hotels:
+        room_types = db.query(RoomTypeModel).filter(
+            RoomTypeModel.hotel_id == hotel.id,
+            RoomTypeModel.capacity >= guests
+        ).all()
+        for room_type in room_types:
+            availabilities = db.query(AvailabilityModel).filter(
+                AvailabilityModel.room_type_id == room_type.id,
+                AvailabilityModel.date.in_(dates)
+            ).all()
+            if len(availabilities) < len(dates):
+                continue
+            if not all(a.available > 0 for a in availabilities):
+                continue
+            rate_plans = db.query(RatePlanModel).filter(
+                RatePlanModel.room_type_id == room_type.id
+            ).all()
+            for rate_plan in rate_plans:
+                prices = db.query(PriceModel).filter(
+                    PriceModel.rate_id == rate_plan.id,
+                    PriceModel.date.in_(dates)
+                ).all()
+                if len(prices) < len(dates):
+                    continue
+                total_price = sum(p.amount for p in prices)
+                results.append(SearchEngine.build_offer(hotel, room_type, rate_plan, total_price, len(dates)))
+    results.sort(key=lambda x: x["total_price"])
+    return results[:50]
+
+
+def engine_search_hotels(db: Session, city: str, checkin: str, checkout: str, guests: int = 1) -> List[dict]:
+    """SearchController.search_hotels without the event publish."""
+    results = SearchEngine.find_offers(db, city, DateRange.parse(checkin, checkout), guests)
+    results.sort(key=lambda x: x["total_price"])
+    return results[:50]
+
+
+def measure(name, search, session_factory, counter, queries, runs):
+    """Run the searches and print query count and latency percentiles."""
+    latencies, query_counts = [], []
+    for i in range(runs):
+        city, checkin, checkout, guests = queries[i % len(queries)]
+        db = session_factory()
+        try:
+            counter.reset()
+            started = time.perf_counter()
+            search(db, city, checkin, checkout, guests)
+            latencies.append((time.perf_counter() - started) * 1000)
+            query_counts.append(counter.count)
+        finally:
+            db.close()
+    print(
+        f"{name:<8} queries/search avg={sum(query_counts) / len(query_counts):8.1f}  "
+        f"p50={percentile(latencies, 50):8.2f} ms  p95={percentile(latencies, 95):8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hotels", type=int, default=1200)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--legacy-runs", type=int, default=5)
+    args = parser.parse_args()
+
+    engine, session_factory = make_engine()
+    stats = seed_catalog(engine, hotels=args.hotels, days=args.days, nightly_prices=True)
+    print(
+        f"seeded {stats['hotels']} hotels, {stats['room_types']} room types, "
+        f"{stats['rate_plans']} rate plans, {stats['prices']} prices"
+    )
+    dates = stats["dates"]
+    queries = [
+        (city, dates[i], dates[i + 3], 1 + i % 3)
+        for i, city in enumerate(CITIES)
+    ]
+
+    # Both paths must return the same offers
+    city, checkin, checkout, guests = queries[0]
+    db = session_factory()
+    try:
+        legacy = legacy_search_hotels(db, city, checkin, checkout, guests)
+        assert legacy == engine_search_hotels(db, city, checkin, checkout, guests)
+    finally:
+        db.close()
+
+    counter = QueryCounter(engine)
+    measure("legacy", legacy_search_hotels, session_factory, counter, queries, args.legacy_runs)
+    measure("engine", engine_search_hotels, session_factory, counter, queries, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Benchmark: time-to-first-result of the streaming search vs the full search.
+
+Run from the server directory:
+    python -m benchmarks.search_stream --hotels 5000
+"""
+import argparse
+import time
+import tracemalloc
+from controllers.search_controller import SearchController
+from benchmarks.seed import make_engine, seed_catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hotels", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=14)
+    args = parser.parse_args()
+
+    engine, session_factory = make_engine()
+    stats = seed_catalog(engine, hotels=args.hotels, days=args.days)
+    dates = stats["dates"]
+    city, checkin, checkout = "Tashkent", dates[0], dates[5]
+    print(f"seeded {stats['hotels']} hotels, {stats['rate_plans']} rate plans")
+
+    db = session_factory()
+    try:
+        tracemalloc.start()
+        started = time.perf_counter()
+        results = SearchController.search_hotels(db, city, checkin, checkout)
+        full = time.perf_counter() - started
+        full_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        stream = SearchController.stream_ndjson(SearchController.stream_offers(db, city, checkin, checkout))
+        next(stream)
+        first = time.perf_counter() - started
+        count = 1 + sum(1 for _ in stream)
+        total = time.perf_counter() - started
+        stream_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        db.close()
+
+    print(f"search   first result {full * 1000:9.1f} ms  ({len(results)} offers, peak {full_peak / 1e6:6.1f} MB)")
+    print(f"stream   first chunk  {first * 1000:9.1f} ms  "
+          f"(all {count} chunks in {total * 1000:.1f} ms, peak {stream_peak / 1e6:6.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Synthetic catalog for benchmarks - bulk inserts, no Faker."""
+import math
+import random
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Tuple
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from database.base import Base
+from core.rates import encode_runs
+import models
+
+CITIES = ("Tashkent", "Samarkand", "Bukhara", "Khiva", "Nukus")
+
+
+def make_engine(path: str = None) -> Tuple[Engine, sessionmaker]:
+    """Create a file-backed SQLite engine with all tables."""
+    if path is None:
+        path = str(Path(tempfile.mkdtemp()) / "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def seed_catalog(
+    engine: Engine,
+    hotels: int = 1200,
+    days: int = 30,
+    start: date = date(2025, 1, 1),
+    seed: int = 42,
+    weekend_surcharge: float = 0.0,
+    nightly_prices: bool = False
+) -> dict:
+    """Insert hotels, room types, rate plans, rate intervals and availability.
+
+    ``nightly_prices`` also fills the legacy one-row-per-night ``prices``
+    table, for baselines that read it.
+    """
+    rnd = random.Random(seed)
+    calendar = tuple(start + timedelta(days=i) for i in range(days))
+    dates = tuple(d.isoformat() for d in calendar)
+
+    hotel_rows, room_rows, rate_rows, price_rows, interval_rows, avail_rows = [], [], [], [], [], []
+    room_id = rate_id = 0
+    for hotel_id in range(1, hotels + 1):
+        hotel_rows.append({
+            "id": hotel_id,
+            "name": f"Hotel {hotel_id}",
+            "stars": rnd.randint(3, 5),
+            "city": CITIES[hotel_id % len(CITIES)],
+            "features": '["WiFi", "Pool"]'
+        })
+        for _ in range(rnd.randint(2, 4)):
+            room_id += 1
+            room_rows.append({
+                "id": room_id,
+                "hotel_id": hotel_id,
+                "name": rnd.choice(["Standard", "Deluxe", "Suite"]),
+                "capacity": rnd.randint(1, 4),
+                "beds": '["Double"]',
+                "features": '["TV"]'
+            })
+            for date_str in dates:
+                avail_rows.append({
+                    "room_type_id": room_id,
+                    "date": date_str,
+                    "available": 0 if rnd.random() < 0.02 else rnd.randint(1, 10)
+                })
+            for _ in range(rnd.randint(1, 3)):
+                rate_id += 1
+                rate_rows.append({
+                    "id": rate_id,
+                    "hotel_id": hotel_id,
+                    "room_type_id": room_id,
+                    "title": rnd.choice(["Best Price", "Flexible", "Non-refundable"]),
+                    "meal": rnd.choice(["BB", "HB", "FB", "AI"]),
+                    "refundable": rnd.random() < 0.5,
+                    "cancel_before_days": rnd.randint(1, 7)
+                })
+                base = rnd.randint(50000, 500000)
+                nights = [
+                    (d.toordinal(), int(base * (1 + weekend_surcharge)) if d.weekday() >= 5 else base, "UZS")
+                    for d in calendar
+                ]
+                if nightly_prices:
+                    for d, (_, amount, currency) in zip(dates, nights):
+                        price_rows.append({"rate_id": rate_id, "date": d, "amount": amount, "currency": currency})
+                for run in encode_runs(nights):
+                    interval_rows.append({
+                        "rate_id": rate_id,
+                        "date_from": date.fromordinal(run.start).isoformat(),
+                        "date_to": date.fromordinal(run.end).isoformat(),
+                        "amount": run.amount,
+                        "currency": run.currency
+                    })
+
+    with engine.begin() as conn:
+        conn.execute(models.Hotel.__table__.insert(), hotel_rows)
+        conn.execute(models.RoomType.__table__.insert(), room_rows)
+        conn.execute(models.RatePlan.__table__.insert(), rate_rows)
+        conn.execute(models.RateInterval.__table__.insert(), interval_rows)
+        if price_rows:
+            conn.execute(models.Price.__table__.insert(), price_rows)
+        conn.execute(models.Availability.__table__.insert(), avail_rows)
+
+    return {
+        "hotels": len(hotel_rows),
+        "room_types": len(room_rows),
+        "rate_plans": len(rate_rows),
+        "prices": len(rate_rows) * days,
+        "rate_intervals": len(interval_rows),
+        "availabilities": len(avail_rows),
+        "dates": dates
+    }
+
+
+class QueryCounter:
+    """Count SQL statements sent through an engine."""
+
+    def __init__(self, engine: Engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def reset(self):
+        self.count = 0
+
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
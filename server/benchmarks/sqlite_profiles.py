@@ -0,0 +1,115 @@
+"""Benchmark: concurrent read and write throughput under each SQLite profile.
+
+Run from the server directory:
+    python -m benchmarks.sqlite_profiles --hotels 600 --seconds 5
+
+For every profile in ``SQLITE_PROFILES`` a fresh file database is seeded,
+then reader threads run the stay price lookup while writer threads update
+availability one small transaction at a time, as bookings do. Under the
+rollback journal a writer blocks every reader; under WAL readers keep going
+and only writers queue. "busy" counts statements that gave up on a lock.
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from database.base import Base
+from database.session import SQLITE_PROFILES, apply_sqlite_profile
+from core.days import to_day
+from benchmarks.seed import seed_catalog
+
+READ = text(
+    "SELECT rate_id, SUM(amount * (MIN(day_to, :end) - MAX(day_from, :start))) FROM rate_intervals "
+    "WHERE rate_id IN (:a, :b, :c) AND day_from < :end AND day_to > :start GROUP BY rate_id"
+)
+WRITE = text(
+    "UPDATE availabilities SET available = available + :delta "
+    "WHERE room_type_id = :room_type_id AND day = :day"
+)
+
+
+def run_profile(profile: str, args) -> dict:
+    path = str(Path(tempfile.mkdtemp()) / f"{profile}.db")
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=args.readers + args.writers
+    )
+    apply_sqlite_profile(engine, profile)
+    Base.metadata.create_all(bind=engine)
+    stats = seed_catalog(engine, hotels=args.hotels, days=args.days)
+    first_day = to_day(stats["dates"][0])
+
+    counts = {"reads": 0, "writes": 0, "busy": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def count(key: str):
+        with lock:
+            counts[key] += 1
+
+    def reader(seed: int):
+        rnd = random.Random(seed)
+        with engine.connect() as conn:
+            while time.perf_counter() < deadline:
+                rate = rnd.randint(1, stats["rate_plans"] - 2)
+                start = first_day + rnd.randint(0, args.days - 4)
+                try:
+                    conn.execute(READ, {"a": rate, "b": rate + 1, "c": rate + 2,
+                                        "start": start, "end": start + 3}).all()
+                    conn.rollback()
+                    count("reads")
+                except OperationalError:
+                    conn.rollback()
+                    count("busy")
+
+    def writer(seed: int):
+        rnd = random.Random(seed)
+        while time.perf_counter() < deadline:
+            params = {
+                "delta": rnd.choice((-1, 1)),
+                "room_type_id": rnd.randint(1, stats["room_types"]),
+                "day": first_day + rnd.randint(0, args.days - 1),
+            }
+            try:
+                with engine.begin() as conn:
+                    conn.execute(WRITE, params)
+                count("writes")
+            except OperationalError:
+                count("busy")
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+    threads += [threading.Thread(target=writer, args=(1000 + i,)) for i in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return {key: value / args.seconds if key != "busy" else value for key, value in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hotels", type=int, default=600)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--profiles", nargs="+", default=list(SQLITE_PROFILES))
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:g}s per profile")
+    for profile in args.profiles:
+        result = run_profile(profile, args)
+        print(
+            f"  {profile:<9} reads={result['reads']:9.1f}/s  "
+            f"writes={result['writes']:8.1f}/s  busy={result['busy']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,22 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./hotel_booking.db"
+    ASYNC_DATABASE_URL: Optional[str] = None  # derived from DATABASE_URL when unset
+    SQL_ECHO: bool = False  # log every SQL statement
+    
+    # Database performance profile: legacy, durable, balanced or fast (see
+    # database/session.py); the DB_* pragmas below override single values
+    DB_PROFILE: str = "balanced"
+    DB_JOURNAL_MODE: Optional[str] = None  # DELETE, WAL, ...
+    DB_SYNCHRONOUS: Optional[str] = None  # OFF, NORMAL, FULL
+    DB_CACHE_SIZE: Optional[int] = None  # pages, or KiB when negative
+    DB_MMAP_SIZE: Optional[int] = None  # bytes; 0 disables memory mapping
+    DB_TEMP_STORE: Optional[str] = None  # DEFAULT, FILE or MEMORY
+    DB_BUSY_TIMEOUT: Optional[int] = None  # ms to wait for a lock
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a pooled connection
+    DB_STATEMENT_CACHE_SIZE: int = 256  # prepared statements kept per connection
     
     # Security
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
@@ -18,6 +34,34 @@ class Settings(BaseSettings):
     APP_NAME: str = "Hotel Booking System"
     DEBUG: bool = True
     
+    # Search result cache
+    SEARCH_CACHE_SIZE: int = 1024
+    SEARCH_CACHE_TTL: float = 60.0  # seconds
+    SEARCH_MAX_NIGHTS: int = 30  # longer stays are rejected before the search runs
+    
+    # Event bus: background handlers (logging) run on worker threads
+    EVENT_BUS_WORKERS: int = 2  # 0 runs every handler inside the request
+    EVENT_BUS_QUEUE_SIZE: int = 10000
+    EVENT_BUS_OVERFLOW: str = "block"  # block, drop_oldest or sample
+    EVENT_BUS_SAMPLE_EVERY: int = 10  # "sample" keeps 1 in N overflowing events
+    EVENT_BUS_FLUSH_TIMEOUT: float = 5.0  # seconds to drain the queue on shutdown
+    
+    # Event persistence: write-behind batches into the events table
+    EVENT_SINK_ENABLED: bool = True
+    EVENT_SINK_BATCH_SIZE: int = 500
+    EVENT_SINK_FLUSH_INTERVAL: float = 1.0  # seconds
+    EVENT_SINK_MAX_BUFFER: int = 50000  # beyond this events spill to disk (or the oldest are dropped)
+    EVENT_SINK_SPILL_PATH: Optional[str] = "./events.spill"
+    
+    # Held bookings: unpaid holds expire and their rooms go back to inventory
+    HOLD_TTL: float = 900.0  # seconds; 0 keeps holds until cancelled
+    HOLD_EXPIRY_TICK: float = 1.0  # seconds per timing wheel tick
+    HOLD_EXPIRY_SLOTS: int = 3600  # timing wheel buckets
+    HOLD_EXPIRY_BATCH_SIZE: int = 500  # bookings expired per transaction
+    
+    # Read models: snapshot written on shutdown, events after it replayed on startup
+    PROJECTION_SNAPSHOT_PATH: Optional[str] = "./projections.snapshot.json"
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -2,15 +2,49 @@
 from .auth_controller import AuthController
 from .hotel_controller import HotelController
 from .search_controller import SearchController
+from .search_engine import SearchEngine
+from .search_cache import SearchResultCache
 from .cart_controller import CartController
 from .booking_controller import BookingController
 from .payment_controller import PaymentController
+from .inventory_controller import InventoryController
+from .reservation_controller import ReservationController
+from .hold_expiry import HoldExpiryScheduler
+from .filter_controller import FilterController
+from .rate_controller import RateController
+from .projection_controller import ProjectionController
+from .async_controller import (
+    AsyncAuthController,
+    AsyncHotelController,
+    AsyncSearchController,
+    AsyncCartController,
+    AsyncBookingController,
+    AsyncPaymentController,
+    AsyncFilterController,
+    AsyncRateController,
+)
 
 __all__ = [
     "AuthController",
     "HotelController",
     "SearchController",
+    "SearchEngine",
+    "SearchResultCache",
     "CartController",
     "BookingController",
     "PaymentController",
+    "InventoryController",
+    "ReservationController",
+    "HoldExpiryScheduler",
+    "FilterController",
+    "RateController",
+    "ProjectionController",
+    "AsyncAuthController",
+    "AsyncHotelController",
+    "AsyncSearchController",
+    "AsyncCartController",
+    "AsyncBookingController",
+    "AsyncPaymentController",
+    "AsyncFilterController",
+    "AsyncRateController",
 ]
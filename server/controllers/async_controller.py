@@ -0,0 +1,218 @@
+"""Async controllers - the sync controllers run in the threadpool.
+
+Each method hands the sync controller and the request's Session to
+``run_in_threadpool``: the business logic is shared, and the ORM, Python
+and NumPy work of a request runs on a worker thread, so the event loop
+keeps accepting requests and SQLite, which releases the GIL while it
+works, serves several of them at once. Searches and hotel lookups are
+coalesced: identical requests in flight share one computation, which runs
+on its own session rather than on the caller's.
+"""
+from typing import Any, Callable, List, Optional
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from database.session import SessionLocal
+from models.user import User
+from controllers.auth_controller import AuthController
+from controllers.hotel_controller import HotelController, hotel_flight
+from controllers.search_controller import SearchController, search_flight
+from controllers.search_cache import SearchResultCache
+from controllers.cart_controller import CartController
+from controllers.booking_controller import BookingController
+from controllers.payment_controller import PaymentController
+from controllers.filter_controller import FilterController
+from controllers.rate_controller import RateController
+from core.predicates import Predicate
+
+
+def _run_on_own_session(bind: Engine, fn: Callable[..., Any], *args) -> Any:
+    """Run a sync controller call on a new session of ``bind``.
+
+    A coalesced computation outlives the request that started it and is
+    shared by every caller, so it must not borrow the leader's session.
+    """
+    db = SessionLocal(bind=bind)
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+class AsyncAuthController:
+    """Authentication in the threadpool."""
+
+    @staticmethod
+    async def register_user(db: Session, username: str, email: str, password: str) -> User:
+        """Register a new user."""
+        return await run_in_threadpool(AuthController.register_user, db, username, email, password)
+
+    @staticmethod
+    async def authenticate_user(db: Session, username: str, password: str) -> User:
+        """Authenticate user and return user object."""
+        return await run_in_threadpool(AuthController.authenticate_user, db, username, password)
+
+
+class AsyncHotelController:
+    """Hotel queries in the threadpool."""
+
+    @staticmethod
+    async def get_all_hotels(db: Session) -> List[dict]:
+        """Get all hotels."""
+        return await run_in_threadpool(HotelController.get_all_hotels, db)
+
+    @staticmethod
+    async def get_hotel_by_id(db: Session, hotel_id: int) -> dict:
+        """Get hotel by ID with room types."""
+        return await hotel_flight.do_async(
+            hotel_id, run_in_threadpool, _run_on_own_session, db.get_bind(),
+            HotelController.get_hotel_by_id, hotel_id
+        )
+
+
+class AsyncSearchController:
+    """Search in the threadpool."""
+
+    @staticmethod
+    async def search_hotels(
+        db: Session,
+        city: str,
+        checkin: str,
+        checkout: str,
+        guests: int = 1,
+        sort_by: str = "price",
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> List[dict]:
+        """Search for available hotels."""
+        page = await AsyncSearchController.search_page(
+            db, city, checkin, checkout, guests, sort_by, limit, cursor
+        )
+        return page["results"]
+
+    @staticmethod
+    async def search_page(
+        db: Session,
+        city: str,
+        checkin: str,
+        checkout: str,
+        guests: int = 1,
+        sort_by: str = "price",
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> dict:
+        """Search and return one page of the best offers plus a cursor for the next.
+
+        The SEARCH event is published here, once per caller, before joining
+        the coalesced search.
+        """
+        SearchController.page_after(sort_by, cursor)
+        SearchController.parse_stay(checkin, checkout)
+        SearchController.publish_search(city, checkin, checkout)
+        key = SearchResultCache.make_key(city, checkin, checkout, guests, sort_by, limit, cursor)
+        return await search_flight.do_async(
+            key, run_in_threadpool, _run_on_own_session, db.get_bind(),
+            SearchController.search_page, city, checkin, checkout, guests, sort_by, limit, cursor
+        )
+
+
+class AsyncCartController:
+    """Cart operations in the threadpool."""
+
+    @staticmethod
+    async def get_cart_items(db: Session) -> List[dict]:
+        """Get all cart items."""
+        return await run_in_threadpool(CartController.get_cart_items, db)
+
+    @staticmethod
+    async def add_to_cart(
+        db: Session,
+        hotel_id: int,
+        room_type_id: int,
+        rate_id: int,
+        checkin: str,
+        checkout: str,
+        guests: int
+    ) -> dict:
+        """Add item to cart with validation."""
+        return await run_in_threadpool(
+            CartController.add_to_cart, db, hotel_id, room_type_id, rate_id, checkin, checkout, guests
+        )
+
+    @staticmethod
+    async def remove_from_cart(db: Session, item_id: int):
+        """Remove item from cart."""
+        return await run_in_threadpool(CartController.remove_from_cart, db, item_id)
+
+    @staticmethod
+    async def clear_cart(db: Session):
+        """Clear all cart items."""
+        return await run_in_threadpool(CartController.clear_cart, db)
+
+
+class AsyncBookingController:
+    """Bookings in the threadpool."""
+
+    @staticmethod
+    async def create_booking(db: Session, guest_id: int, cart_item_ids: List[int]) -> dict:
+        """Create booking from cart items."""
+        return await run_in_threadpool(BookingController.create_booking, db, guest_id, cart_item_ids)
+
+    @staticmethod
+    async def cancel_booking(db: Session, booking_id: int) -> dict:
+        """Cancel booking."""
+        return await run_in_threadpool(BookingController.cancel_booking, db, booking_id)
+
+    @staticmethod
+    async def get_booking(db: Session, booking_id: int) -> dict:
+        """Get booking details."""
+        return await run_in_threadpool(BookingController.get_booking, db, booking_id)
+
+
+class AsyncPaymentController:
+    """Payments in the threadpool."""
+
+    @staticmethod
+    async def create_payment(db: Session, booking_id: int, method: str = "card") -> dict:
+        """Create payment for booking."""
+        return await run_in_threadpool(PaymentController.create_payment, db, booking_id, method)
+
+    @staticmethod
+    async def get_payment(db: Session, payment_id: int) -> dict:
+        """Get payment details."""
+        return await run_in_threadpool(PaymentController.get_payment, db, payment_id)
+
+
+class AsyncFilterController:
+    """Filtering in the threadpool."""
+
+    @staticmethod
+    async def filter_offers(db: Session, date: str, predicate: Predicate, limit: int = 100) -> List[dict]:
+        """Rate plans priced on ``date`` that match, cheapest first."""
+        return await run_in_threadpool(FilterController.filter_offers, db, date, predicate, limit)
+
+
+class AsyncRateController:
+    """Rate intervals in the threadpool."""
+
+    @staticmethod
+    async def get_intervals(db: Session, rate_id: int) -> List[dict]:
+        """Stored intervals of a rate plan."""
+        return await run_in_threadpool(RateController.get_intervals, db, rate_id)
+
+    @staticmethod
+    async def get_prices(db: Session, rate_id: int, date_from: str, date_to: str) -> List[dict]:
+        """Per-night prices of a rate plan."""
+        return await run_in_threadpool(RateController.get_prices, db, rate_id, date_from, date_to)
+
+    @staticmethod
+    async def set_rate(
+        db: Session,
+        rate_id: int,
+        date_from: str,
+        date_to: str,
+        amount: int,
+        currency: str = "UZS"
+    ) -> List[dict]:
+        """Price a range of nights."""
+        return await run_in_threadpool(RateController.set_rate, db, rate_id, date_from, date_to, amount, currency)
@@ -1,14 +1,17 @@
 """Booking controller."""
-from typing import List
+from typing import Iterable, List
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException, status
 from models.Booking import Booking as BookingModel
 from models.Guest import Guest as GuestModel
 from models.cart import CartItem as CartItemModel
 from models.Payment import Payment as PaymentModel
-from core.frp import event_bus, create_event, EVENT_BOOKED, EVENT_CANCELLED
+from core.frp import event_bus, create_event, format_stays, EVENT_BOOKED, EVENT_CANCELLED
 from core.memo import calculate_cancellation_penalty
+from controllers.reservation_controller import ReservationController
+from config.settings import settings
 
 
 class BookingController:
@@ -37,25 +40,44 @@ class BookingController:
         # Calculate total (simplified - would need to fetch prices)
         total = len(cart_items) * 100000  # Placeholder
         
-        # Create booking
+        # Create booking and take one room per cart item in the same transaction;
+        # an unpaid booking gives the rooms back after HOLD_TTL seconds
+        expires_at = None
+        if settings.HOLD_TTL > 0:
+            expires_at = (datetime.now(timezone.utc) + timedelta(seconds=settings.HOLD_TTL)).isoformat()
         booking = BookingModel(
             guest_id=guest_id,
             total=total,
-            status="held"
+            status="held",
+            expires_at=expires_at
         )
         db.add(booking)
+        db.flush()
+        stays = ReservationController.hold(
+            db, booking.id, ((item.room_type_id, item.checkin, item.checkout, 1) for item in cart_items)
+        )
+        hotel_of = {item.room_type_id: item.hotel_id for item in cart_items}
         db.commit()
         db.refresh(booking)
         
         # Publish event
-        event = create_event(EVENT_BOOKED, booking_id=booking.id, guest_id=guest_id)
+        event = create_event(
+            EVENT_BOOKED,
+            booking_id=booking.id,
+            guest_id=guest_id,
+            total=total,
+            stays=format_stays(stays),
+            hotel_stays=format_stays((hotel_of[rt], checkin, checkout, rooms) for rt, checkin, checkout, rooms in stays),
+            expires_at=booking.expires_at or ""
+        )
         event_bus.publish(event)
         
         return {
             "id": booking.id,
             "guest_id": booking.guest_id,
             "total": booking.total,
-            "status": booking.status
+            "status": booking.status,
+            "expires_at": booking.expires_at
         }
     
     @staticmethod
@@ -75,12 +97,19 @@ class BookingController:
             total_amount=booking.total
         )
         
-        # Update booking
-        booking.status = "cancelled"
+        # Update booking; only the request that flips the status gives the rooms back
+        cancelled = db.query(BookingModel).filter(
+            BookingModel.id == booking_id,
+            BookingModel.status != "cancelled"
+        ).update({"status": "cancelled"})
+        if not cancelled:
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Booking already cancelled")
+        released = ReservationController.release(db, booking_id)
         db.commit()
         
         # Publish event
-        event = create_event(EVENT_CANCELLED, booking_id=booking_id, penalty=penalty)
+        event = create_event(EVENT_CANCELLED, booking_id=booking_id, penalty=penalty, stays=format_stays(released))
         event_bus.publish(event)
         
         return {
@@ -100,5 +129,37 @@ class BookingController:
             "id": booking.id,
             "guest_id": booking.guest_id,
             "total": booking.total,
-            "status": booking.status
+            "status": booking.status,
+            "expires_at": booking.expires_at
         }
+    
+    @staticmethod
+    def expire_bookings(db: Session, booking_ids: Iterable[int]) -> List[int]:
+        """Cancel the bookings that are still held and give their rooms back; returns the ids cancelled.
+
+        One transaction for the whole batch. Bookings paid or cancelled in
+        the meantime are skipped: the status only changes from ``held``.
+        """
+        booking_ids = list(booking_ids)
+        if not booking_ids:
+            return []
+        expired = db.execute(
+            update(BookingModel).where(
+                BookingModel.id.in_(booking_ids),
+                BookingModel.status == "held"
+            ).values(status="cancelled").returning(BookingModel.id).execution_options(synchronize_session=False)
+        ).scalars().all()
+        released = ReservationController.release_many(db, expired)
+        db.commit()
+        
+        # Publish events; an expired hold costs nothing
+        for booking_id in sorted(expired):
+            event = create_event(
+                EVENT_CANCELLED,
+                booking_id=booking_id,
+                penalty=0,
+                stays=format_stays(released.get(booking_id, ())),
+                reason="expired"
+            )
+            event_bus.publish(event)
+        return sorted(expired)
@@ -0,0 +1,107 @@
+"""Filter controller - predicates pushed down into the offer query."""
+from typing import List, Optional, Sequence
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from models.Hotel import Hotel as HotelModel
+from models.room_type import RoomType as RoomTypeModel
+from models.rate_plan import RatePlan as RatePlanModel
+from models.rate_interval import RateInterval as RateIntervalModel
+from core.days import Day
+from core.predicates import Predicate, Between, all_of
+from core.amenities import has_amenities, has_beds, json_names
+from service.filter_service import filter_city, filter_capacity, filter_features, filter_price
+
+# Predicate field -> column of the hotel x room type x rate plan x rate interval join
+FILTER_COLUMNS = {
+    "city": HotelModel.city,
+    "stars": HotelModel.stars,
+    "features": HotelModel.features,
+    "features_mask": HotelModel.features_mask,
+    "capacity": RoomTypeModel.capacity,
+    "room_features": RoomTypeModel.features,
+    "room_features_mask": RoomTypeModel.features_mask,
+    "beds": RoomTypeModel.beds,
+    "beds_mask": RoomTypeModel.beds_mask,
+    "price": RateIntervalModel.amount,
+    "currency": RateIntervalModel.currency,
+}
+
+
+class FilterController:
+    """Filter offers in the database instead of in Python."""
+
+    @staticmethod
+    def build_predicate(
+        city: Optional[str] = None,
+        min_guests: Optional[int] = None,
+        features: Sequence[str] = (),
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        currency: Optional[str] = None,
+        room_features: Sequence[str] = (),
+        beds: Sequence[str] = ()
+    ) -> Predicate:
+        """AND of the filters that were given."""
+        price = None
+        if currency is not None:
+            price = filter_price(min_price, max_price, currency)
+        elif min_price is not None or max_price is not None:
+            price = Between("price", min_price, max_price)
+        return all_of((
+            filter_city(city) if city is not None else None,
+            filter_capacity(min_guests) if min_guests is not None else None,
+            filter_features(features) if features else None,
+            has_amenities(room_features, "room_features") if room_features else None,
+            has_beds(beds) if beds else None,
+            price,
+        ))
+
+    @staticmethod
+    def filter_offers(
+        db: Session,
+        date: str,
+        predicate: Predicate,
+        limit: int = 100
+    ) -> List[dict]:
+        """Rate plans priced on ``date`` that match, cheapest first.
+
+        The predicate becomes the WHERE clause, so only matching rows leave
+        the database.
+        """
+        try:
+            day = Day.parse(date)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid date")
+
+        rows = db.query(HotelModel, RoomTypeModel, RatePlanModel, RateIntervalModel).join(
+            RoomTypeModel, RoomTypeModel.hotel_id == HotelModel.id
+        ).join(
+            RatePlanModel, RatePlanModel.room_type_id == RoomTypeModel.id
+        ).join(
+            RateIntervalModel, RateIntervalModel.rate_id == RatePlanModel.id
+        ).filter(
+            RateIntervalModel.day_from <= day,
+            RateIntervalModel.day_to > day,
+            predicate.to_sql(FILTER_COLUMNS)
+        ).order_by(
+            RateIntervalModel.amount, RatePlanModel.id
+        ).limit(limit).all()
+
+        return [
+            {
+                "hotel_id": hotel.id,
+                "hotel_name": hotel.name,
+                "city": hotel.city,
+                "stars": hotel.stars,
+                "features": list(json_names(hotel.features)),
+                "room_type_id": room_type.id,
+                "room_name": room_type.name,
+                "capacity": room_type.capacity,
+                "rate_id": rate.id,
+                "rate_title": rate.title,
+                "date": day.isoformat(),
+                "price": price.amount,
+                "currency": price.currency,
+            }
+            for hotel, room_type, rate, price in rows
+        ]
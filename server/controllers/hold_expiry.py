@@ -0,0 +1,140 @@
+"""Hold expiry - cancel held bookings that were not paid in time."""
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+from sqlalchemy.orm import Session
+from models.Booking import Booking as BookingModel
+from controllers.booking_controller import BookingController
+from core.domain import Event as DomainEvent
+from core.frp import EVENT_BOOKED, EVENT_CANCELLED, EVENT_PAYMENT
+from core.timing_wheel import TimingWheel
+from config.settings import settings
+from database.session import SessionLocal
+
+
+def _timestamp(value: str) -> float:
+    return datetime.fromisoformat(value).timestamp()
+
+
+class HoldExpiryScheduler:
+    """Expire held bookings at their ``expires_at`` from a timing wheel.
+
+    A BOOKED event schedules the booking; PAYMENT and CANCELLED take it off
+    the wheel, so inserting and cancelling are O(1) however many holds are
+    pending. A background thread advances the wheel every tick and hands
+    the due bookings to ``BookingController.expire_bookings`` in batches of
+    ``batch_size`` - one transaction and a CANCELLED event per booking.
+    A batch that fails goes back on the wheel for the next tick.
+
+    The wheel only lives in memory; ``recover()`` reloads every held
+    booking with an ``expires_at`` at startup, and those that expired while
+    the server was down go in the first batches.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        tick: float = 1.0,
+        slots: int = 3600,
+        batch_size: int = 500,
+        clock: Callable[[], float] = time.time
+    ):
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self._clock = clock
+        self.wheel = TimingWheel(tick, slots, start=clock())
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._counters = {"scheduled": 0, "recovered": 0, "expired": 0, "batches": 0, "failures": 0}
+
+    # Event handlers
+
+    def on_booked(self, event: DomainEvent):
+        """BOOKED handler - start the booking's clock."""
+        payload = dict(event.payload)
+        if payload.get("expires_at"):
+            self.wheel.schedule(int(payload["booking_id"]), _timestamp(payload["expires_at"]))
+            self._counters["scheduled"] += 1
+
+    def on_settled(self, event: DomainEvent):
+        """PAYMENT and CANCELLED handler - the booking no longer expires."""
+        self.wheel.cancel(int(dict(event.payload)["booking_id"]))
+
+    def subscribe(self, bus):
+        """Follow bookings published on ``bus``."""
+        bus.subscribe(EVENT_BOOKED, self.on_booked)
+        bus.subscribe(EVENT_PAYMENT, self.on_settled)
+        bus.subscribe(EVENT_CANCELLED, self.on_settled)
+
+    # Expiry
+
+    def recover(self) -> int:
+        """Schedule every held booking that has a deadline; call once at startup."""
+        db = self.session_factory()
+        try:
+            rows = db.query(BookingModel.id, BookingModel.expires_at).filter(
+                BookingModel.status == "held",
+                BookingModel.expires_at.isnot(None)
+            ).yield_per(10000)
+            count = 0
+            for booking_id, expires_at in rows:
+                self.wheel.schedule(booking_id, _timestamp(expires_at))
+                count += 1
+        finally:
+            db.close()
+        self._counters["recovered"] += count
+        return count
+
+    def expire_due(self, now: Optional[float] = None) -> List[int]:
+        """Cancel the bookings due by ``now``; returns the ids cancelled."""
+        due = self.wheel.advance(self._clock() if now is None else now)
+        expired = []
+        for i in range(0, len(due), self.batch_size):
+            batch = due[i:i + self.batch_size]
+            db = self.session_factory()
+            try:
+                expired += BookingController.expire_bookings(db, [booking_id for booking_id, _ in batch])
+                self._counters["batches"] += 1
+            except Exception as e:
+                print(f"Error expiring holds: {e}")
+                db.rollback()
+                self._counters["failures"] += 1
+                for booking_id, deadline in batch:
+                    self.wheel.schedule(booking_id, deadline)
+            finally:
+                db.close()
+        self._counters["expired"] += len(expired)
+        return expired
+
+    def _run(self):
+        while not self._stop.wait(self.wheel.tick):
+            self.expire_due()
+
+    def start(self):
+        """Start the background expiry thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="hold-expiry", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """Stop the expiry thread; pending holds are picked up again by ``recover()``."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> dict:
+        """Scheduled, recovered and expired counts plus the holds pending."""
+        return {**self._counters, "pending": len(self.wheel)}
+
+
+# Global scheduler on the application database
+hold_expiry = HoldExpiryScheduler(
+    SessionLocal,
+    tick=settings.HOLD_EXPIRY_TICK,
+    slots=settings.HOLD_EXPIRY_SLOTS,
+    batch_size=settings.HOLD_EXPIRY_BATCH_SIZE
+)
@@ -4,7 +4,11 @@ from sqlalchemy.orm import Session
 from models.Hotel import Hotel as HotelModel
 from models.room_type import RoomType as RoomTypeModel
 from core.domain import Hotel, RoomType
-import json
+from core.singleflight import SingleFlight
+from core.amenities import json_names
+
+# Concurrent lookups of the same hotel share one query
+hotel_flight = SingleFlight("hotel")
 
 
 class HotelController:
@@ -20,7 +24,7 @@ class HotelController:
                 "name": h.name,
                 "stars": h.stars,
                 "city": h.city,
-                "features": json.loads(h.features) if h.features else []
+                "features": list(json_names(h.features))
             }
             for h in hotels
         ]
@@ -40,14 +44,14 @@ class HotelController:
             "name": hotel.name,
             "stars": hotel.stars,
             "city": hotel.city,
-            "features": json.loads(hotel.features) if hotel.features else [],
+            "features": list(json_names(hotel.features)),
             "room_types": [
                 {
                     "id": rt.id,
                     "name": rt.name,
                     "capacity": rt.capacity,
-                    "beds": json.loads(rt.beds) if rt.beds else [],
-                    "features": json.loads(rt.features) if rt.features else []
+                    "beds": list(json_names(rt.beds)),
+                    "features": list(json_names(rt.features))
                 }
                 for rt in room_types
             ]
@@ -56,7 +60,7 @@ class HotelController:
     @staticmethod
     def convert_to_domain(hotel_model: HotelModel) -> Hotel:
         """Convert SQLAlchemy model to immutable domain entity."""
-        features = tuple(json.loads(hotel_model.features)) if hotel_model.features else ()
+        features = json_names(hotel_model.features)
         return Hotel(
             id=hotel_model.id,
             name=hotel_model.name,
@@ -0,0 +1,20 @@
+"""Inventory controller - loads the in-memory inventory index."""
+from sqlalchemy.orm import Session
+from models.Availability import Availability as AvailabilityModel
+from core.inventory import InventoryIndex, inventory_index
+from controllers.rate_controller import RateController
+
+
+class InventoryController:
+    """Bridge between the rate intervals/availabilities tables and the inventory index."""
+    
+    @staticmethod
+    def load_index(db: Session, index: InventoryIndex = inventory_index) -> InventoryIndex:
+        """Load availability and prices into the index."""
+        availability_rows = db.query(
+            AvailabilityModel.room_type_id,
+            AvailabilityModel.day,
+            AvailabilityModel.available
+        ).yield_per(10000)
+        index.load(availability_rows, RateController.price_rows(db))
+        return index
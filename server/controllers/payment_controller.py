@@ -34,14 +34,20 @@ class PaymentController:
         )
         db.add(payment)
         
-        # Update booking status
-        booking.status = "confirmed"
+        # Update booking status, unless the hold expired or was cancelled meanwhile
+        confirmed = db.query(BookingModel).filter(
+            BookingModel.id == booking_id,
+            BookingModel.status != "cancelled"
+        ).update({"status": "confirmed"})
+        if not confirmed:
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Cannot pay for cancelled booking")
         
         db.commit()
         db.refresh(payment)
         
         # Publish event
-        event = create_event(EVENT_PAYMENT, payment_id=payment.id, booking_id=booking_id)
+        event = create_event(EVENT_PAYMENT, payment_id=payment.id, booking_id=booking_id, amount=payment.amount)
         event_bus.publish(event)
         
         return {
@@ -0,0 +1,78 @@
+"""Projection controller - rebuild read models from the events table and read them."""
+from typing import Iterator, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from models.Event import Event as EventModel
+from core.domain import Event as DomainEvent
+from core.frp import decode_payload
+from core.projections import ProjectionSet
+
+
+class ProjectionController:
+    """Read-model maintenance and O(1) reads."""
+
+    @staticmethod
+    def stored_events(db: Session, after_id: Optional[int] = None, batch_size: int = 1000) -> Iterator[DomainEvent]:
+        """Events from the events table stored after row ``after_id``, in id order, streamed."""
+        query = select(EventModel.id, EventModel.ts, EventModel.name, EventModel.payload)
+        if after_id is not None:
+            query = query.where(EventModel.id > after_id)
+        rows = db.execute(
+            query.order_by(EventModel.id).execution_options(yield_per=batch_size)
+        )
+        for event_id, ts, name, payload in rows:
+            yield DomainEvent(event_id, ts, name, decode_payload(payload))
+
+    @staticmethod
+    def rebuild(db: Session, projections: ProjectionSet, snapshot_path: Optional[str] = None) -> dict:
+        """Load the snapshot (if any), then replay the events after its checkpoint."""
+        if snapshot_path:
+            restored = projections.load(snapshot_path)
+        else:
+            projections.reset()
+            restored = False
+        replayed = projections.replay(ProjectionController.stored_events(db, projections.checkpoint))
+        return {"restored": restored, "replayed": replayed, "checkpoint": projections.checkpoint}
+
+    @staticmethod
+    def save(db: Session, projections: ProjectionSet, snapshot_path: str) -> Optional[int]:
+        """Snapshot the projections, checkpointed at the newest stored event.
+
+        Call once every event the projections applied is stored (the event
+        sink is closed and persisted everything); returns the checkpoint.
+        """
+        last_id = db.execute(select(func.max(EventModel.id))).scalar()
+        projections.save(snapshot_path, last_id)
+        return last_id
+
+    @staticmethod
+    def occupancy(projections: ProjectionSet, hotel_id: int, night: str) -> dict:
+        """Rooms booked at a hotel for one night."""
+        try:
+            rooms = projections["occupancy"].rooms_booked(hotel_id, night)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date")
+        return {"hotel_id": hotel_id, "date": night, "rooms_booked": rooms}
+
+    @staticmethod
+    def revenue(projections: ProjectionSet, day: Optional[str] = None) -> dict:
+        """Net revenue of one day, or in total."""
+        revenue = projections["revenue"]
+        if day is None:
+            return {"total": revenue.total}
+        try:
+            return {"date": day, "revenue": revenue.revenue_on(day)}
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date")
+
+    @staticmethod
+    def demand(projections: ProjectionSet, city: str, night: Optional[str] = None) -> dict:
+        """Searches for a city, optionally only those covering one night."""
+        demand = projections["demand"]
+        if night is None:
+            return {"city": city, "searches": demand.searches(city)}
+        try:
+            return {"city": city, "date": night, "searches": demand.searches_for_night(city, night)}
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date")
@@ -0,0 +1,163 @@
+"""Rate controller - run-length rate intervals and the per-night price adapter."""
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from models.rate_plan import RatePlan as RatePlanModel
+from models.rate_interval import RateInterval as RateIntervalModel
+from core.days import Day, DateRange
+from core.rates import RateRun, RateSchedule, expand_prices, set_range
+from core.frp import event_bus, create_event, EVENT_PRICE_CHANGED
+
+
+class RateController:
+    """Prices as ``rate_intervals`` rows, read back per night where needed."""
+
+    @staticmethod
+    def _run(row: RateIntervalModel) -> RateRun:
+        return RateRun(row.day_from, row.day_to, row.amount, row.currency)
+
+    @staticmethod
+    def _overlapping(db: Session, rate_ids: Iterable[int], start: int, end: int):
+        """Interval rows of the rates that share a night with ``[start, end)``."""
+        return db.query(RateIntervalModel).filter(
+            RateIntervalModel.rate_id.in_(list(rate_ids)),
+            RateIntervalModel.day_from < end,
+            RateIntervalModel.day_to > start
+        ).order_by(RateIntervalModel.rate_id, RateIntervalModel.day_from)
+
+    @staticmethod
+    def _parse_stay(date_from: str, date_to: str) -> DateRange:
+        try:
+            stay = DateRange.parse(date_from, date_to)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid date")
+        if not stay.nights:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_to must be after date_from")
+        return stay
+
+    # Reads
+
+    @staticmethod
+    def schedules(db: Session, rate_ids: Iterable[int], start: int, end: int) -> Dict[int, RateSchedule]:
+        """Per-rate schedules of the intervals touching ``[start, end)``."""
+        runs: Dict[int, List[RateRun]] = {}
+        for row in RateController._overlapping(db, rate_ids, start, end):
+            runs.setdefault(row.rate_id, []).append(RateController._run(row))
+        return {rate_id: RateSchedule(rate_runs) for rate_id, rate_runs in runs.items()}
+
+    @staticmethod
+    def stay_totals(db: Session, rate_ids: Iterable[int], start: int, end: int) -> Dict[int, Optional[int]]:
+        """rate_id -> total for the nights ``[start, end)``, or None if a night is unpriced.
+
+        Each rate's intervals are summed run by run through its
+        ``RateSchedule``, without expanding them into nights.
+        """
+        rate_ids = list(rate_ids)
+        schedules = RateController.schedules(db, rate_ids, start, end)
+        return {
+            rate_id: schedules[rate_id].stay_total(start, end) if rate_id in schedules else None
+            for rate_id in rate_ids
+        }
+
+    @staticmethod
+    def night_prices(db: Session, rate_ids: Iterable[int], start: int, end: int) -> Dict[Tuple[int, int], int]:
+        """(rate_id, day) -> amount for every priced night in ``[start, end)``.
+
+        The shape the per-night ``prices`` table used to give; one interval
+        row covers all the nights it spans.
+        """
+        prices = {}
+        for row in RateController._overlapping(db, rate_ids, start, end):
+            for day in range(max(row.day_from, start), min(row.day_to, end)):
+                prices[(row.rate_id, day)] = row.amount
+        return prices
+
+    @staticmethod
+    def price_rows(db: Session) -> Iterator[Tuple[int, int, int]]:
+        """(rate_id, day, amount) of every priced night, for the inventory index."""
+        rows = db.query(
+            RateIntervalModel.rate_id,
+            RateIntervalModel.day_from,
+            RateIntervalModel.day_to,
+            RateIntervalModel.amount
+        ).yield_per(10000)
+        for rate_id, day_from, day_to, amount in rows:
+            for day in range(day_from, day_to):
+                yield rate_id, day, amount
+
+    @staticmethod
+    def get_intervals(db: Session, rate_id: int) -> List[dict]:
+        """Stored intervals of a rate plan, in date order."""
+        rows = db.query(RateIntervalModel).filter(
+            RateIntervalModel.rate_id == rate_id
+        ).order_by(RateIntervalModel.day_from).all()
+        return [
+            {
+                "rate_id": row.rate_id,
+                "date_from": row.date_from,
+                "date_to": row.date_to,
+                "amount": row.amount,
+                "currency": row.currency,
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def get_prices(db: Session, rate_id: int, date_from: str, date_to: str) -> List[dict]:
+        """Per-night prices of a rate plan from ``date_from`` up to ``date_to``."""
+        stay = RateController._parse_stay(date_from, date_to)
+        runs = [RateController._run(row) for row in RateController._overlapping(db, [rate_id], stay.start, stay.end)]
+        return [
+            {"rate_id": price.rate_id, "date": price.date, "amount": price.amount, "currency": price.currency}
+            for price in expand_prices(rate_id, runs, stay.start, stay.end)
+        ]
+
+    # Writes
+
+    @staticmethod
+    def set_rate(
+        db: Session,
+        rate_id: int,
+        date_from: str,
+        date_to: str,
+        amount: int,
+        currency: str = "UZS"
+    ) -> List[dict]:
+        """Price the nights ``date_from`` up to ``date_to`` (exclusive) at ``amount``.
+
+        The intervals the range cuts are split, and neighbours that end up
+        with the same price merge into one interval - intervals that only
+        touch the range are loaded for that.
+        """
+        if amount < 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Amount must not be negative")
+        stay = RateController._parse_stay(date_from, date_to)
+        if db.query(RatePlanModel.id).filter(RatePlanModel.id == rate_id).first() is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Rate plan not found")
+
+        rows = RateController._overlapping(db, [rate_id], stay.start - 1, stay.end + 1).all()
+        runs = set_range([RateController._run(row) for row in rows], stay.start, stay.end, amount, currency)
+        for row in rows:
+            db.delete(row)
+        # Deletes first: a new interval may reuse a deleted one's start
+        db.flush()
+        db.add_all(
+            RateIntervalModel(
+                rate_id=rate_id,
+                date_from=Day(run.start).isoformat(),
+                date_to=Day(run.end).isoformat(),
+                amount=run.amount,
+                currency=run.currency
+            )
+            for run in runs
+        )
+        db.commit()
+
+        event_bus.publish(create_event(
+            EVENT_PRICE_CHANGED,
+            rate_id=rate_id,
+            date=stay.start.isoformat(),
+            date_to=stay.end.isoformat(),
+            amount=amount
+        ))
+        return RateController.get_intervals(db, rate_id)
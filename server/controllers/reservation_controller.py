@@ -0,0 +1,146 @@
+"""Reservation controller - atomic inventory holds with conditional updates."""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from models.Availability import Availability as AvailabilityModel
+from models.hold import Hold as HoldModel
+from core.days import DateRange
+
+# room_type_id, checkin, checkout, rooms - the format_stays tuple
+Stay = Tuple[int, str, str, int]
+
+
+class ReservationController:
+    """Take rooms out of inventory and give them back, one night row at a time.
+
+    Taking rooms is a single conditional UPDATE over the stay's nights:
+    ``available = available - n WHERE ... AND available >= n``. The check and
+    the decrement are one statement, so two bookings can never both take
+    the last room; if fewer rows than nights were updated, a night was full
+    (or has no inventory row) and the transaction is rolled back, undoing
+    the nights already taken. Only the rows of the stay are written, so
+    bookings of other room types and dates do not wait on each other beyond
+    the database's own write lock.
+
+    No method commits; the caller commits the booking and its holds
+    together.
+    """
+
+    @staticmethod
+    def reserve(db: Session, room_type_id: int, start: int, end: int, rooms: int = 1) -> bool:
+        """Take ``rooms`` on every night of ``[start, end)``; False if a night cannot spare them."""
+        result = db.execute(
+            update(AvailabilityModel).where(
+                AvailabilityModel.room_type_id == room_type_id,
+                AvailabilityModel.day >= start,
+                AvailabilityModel.day < end,
+                AvailabilityModel.available >= rooms
+            ).values(
+                available=AvailabilityModel.available - rooms
+            ).execution_options(synchronize_session=False)
+        )
+        return result.rowcount == end - start
+
+    @staticmethod
+    def _give_back(db: Session, room_type_id: int, start: int, end: int, rooms: int):
+        db.execute(
+            update(AvailabilityModel).where(
+                AvailabilityModel.room_type_id == room_type_id,
+                AvailabilityModel.day >= start,
+                AvailabilityModel.day < end
+            ).values(
+                available=AvailabilityModel.available + rooms
+            ).execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def hold(db: Session, booking_id: int, stays: Iterable[Stay]) -> Tuple[Stay, ...]:
+        """Reserve every stay for the booking and record the holds; returns the stays held.
+
+        All or nothing: if one stay is sold out the session is rolled back
+        and 409 raised. Stays are taken in (room type, checkin) order so
+        concurrent bookings touch rows in the same order. The stays come
+        back with their dates normalised to YYYY-MM-DD, ready for
+        ``format_stays``.
+        """
+        held = []
+        for room_type_id, checkin, checkout, rooms in sorted(stays):
+            try:
+                stay = DateRange.parse(checkin, checkout)
+            except ValueError:
+                db.rollback()
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid date")
+            if not stay.nights or rooms < 1:
+                db.rollback()
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty stay")
+            if not ReservationController.reserve(db, room_type_id, stay.start, stay.end, rooms):
+                db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Room type {room_type_id} is sold out for {checkin} - {checkout}"
+                )
+            hold = HoldModel(
+                booking_id=booking_id,
+                room_type_id=room_type_id,
+                date_from=stay.start.isoformat(),
+                date_to=stay.end.isoformat(),
+                rooms=rooms
+            )
+            db.add(hold)
+            held.append((room_type_id, hold.date_from, hold.date_to, rooms))
+        return tuple(held)
+
+    @staticmethod
+    def release_many(db: Session, booking_ids: Iterable[int]) -> Dict[int, Tuple[Stay, ...]]:
+        """Give back the rooms of the bookings' active holds; returns the released stays per booking.
+
+        The holds are flipped to ``released`` by one conditional UPDATE that
+        returns the rows it changed, and only those rooms are returned, so a
+        hold released twice at once (a double cancel, or a cancel racing an
+        expiry) gives its rooms back only once. Rooms of the same room type
+        and nights go back in one statement.
+        """
+        booking_ids = list(booking_ids)
+        if not booking_ids:
+            return {}
+        flipped = db.execute(
+            update(HoldModel).where(
+                HoldModel.booking_id.in_(booking_ids),
+                HoldModel.status == "active"
+            ).values(status="released").returning(
+                HoldModel.booking_id, HoldModel.room_type_id, HoldModel.date_from, HoldModel.date_to,
+                HoldModel.day_from, HoldModel.day_to, HoldModel.rooms
+            ).execution_options(synchronize_session=False)
+        ).all()
+        rooms_back = defaultdict(int)
+        released = defaultdict(list)
+        for booking_id, room_type_id, date_from, date_to, day_from, day_to, rooms in flipped:
+            rooms_back[(room_type_id, day_from, day_to)] += rooms
+            released[booking_id].append((room_type_id, date_from, date_to, rooms))
+        for (room_type_id, start, end), rooms in sorted(rooms_back.items()):
+            ReservationController._give_back(db, room_type_id, start, end, rooms)
+        return {booking_id: tuple(sorted(stays)) for booking_id, stays in released.items()}
+
+    @staticmethod
+    def release(db: Session, booking_id: int) -> Tuple[Stay, ...]:
+        """Give back the rooms of the booking's active holds; returns the released stays."""
+        return ReservationController.release_many(db, [booking_id]).get(booking_id, ())
+
+    @staticmethod
+    def active_holds(db: Session, booking_id: int) -> List[dict]:
+        """Rooms the booking currently holds."""
+        holds = db.query(HoldModel).filter(
+            HoldModel.booking_id == booking_id,
+            HoldModel.status == "active"
+        ).order_by(HoldModel.id).all()
+        return [
+            {
+                "room_type_id": hold.room_type_id,
+                "checkin": hold.date_from,
+                "checkout": hold.date_to,
+                "rooms": hold.rooms,
+            }
+            for hold in holds
+        ]
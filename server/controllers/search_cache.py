@@ -0,0 +1,135 @@
+"""Search result cache with event-driven invalidation."""
+from typing import FrozenSet, Hashable, NamedTuple, Optional, Tuple
+from core.cache import TTLCache, cache_registry
+from core.domain import Event as DomainEvent
+from core.frp import EVENT_PRICE_CHANGED, EVENT_BOOKED, EVENT_CANCELLED, parse_stays
+from core.inventory import to_day
+from config.settings import settings
+
+
+class CachedSearch(NamedTuple):
+    """A cached search page and what it depends on."""
+    page: dict
+    city: str
+    first_day: int  # checkin ordinal
+    last_day: int  # checkout ordinal (inclusive - the checkout day is covered too)
+    hotel_ids: FrozenSet[int]
+    room_type_ids: FrozenSet[int]
+
+
+class SearchResultCache:
+    """LRU + TTL cache of search pages keyed by (city, dates, guests, paging).
+
+    Events evict only the entries they can affect:
+
+    * an event naming a ``city`` evicts that city's overlapping entries;
+    * a BOOKED event can only take rooms away, so it evicts the overlapping
+      entries whose results contain the booked room type (or hotel);
+    * PRICE_CHANGED and CANCELLED can also bring new offers into a page, so
+      without a city they evict every entry overlapping their dates.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 60.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def make_key(
+        city: str,
+        checkin: str,
+        checkout: str,
+        guests: int,
+        sort_by: str = "price",
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Hashable:
+        """Cache key for one search page."""
+        return (city.strip().lower(), checkin, checkout, guests, sort_by, limit, cursor or "")
+
+    def get(self, key: Hashable) -> Optional[dict]:
+        """Cached page or None."""
+        entry = self._cache.get(key)
+        return entry.page if entry is not None else None
+
+    def put(self, key: Hashable, page: dict):
+        """Cache a page, remembering the hotels and room types it shows."""
+        city, checkin, checkout = key[0], key[1], key[2]
+        self._cache.set(key, CachedSearch(
+            page=page,
+            city=city,
+            first_day=to_day(checkin),
+            last_day=to_day(checkout),
+            hotel_ids=frozenset(o["hotel"]["id"] for o in page["results"]),
+            room_type_ids=frozenset(o["room_type"]["id"] for o in page["results"])
+        ))
+
+    def invalidate(
+        self,
+        first_day: int,
+        last_day: int,
+        city: Optional[str] = None,
+        hotel_id: Optional[int] = None,
+        room_type_id: Optional[int] = None,
+        only_listed: bool = False
+    ) -> int:
+        """Evict entries overlapping [first_day, last_day] that the change can affect."""
+        evicted = 0
+        for key, entry in self._cache.items():
+            if entry.last_day < first_day or entry.first_day > last_day:
+                continue
+            if city is not None:
+                affected = city.strip().lower() in entry.city or entry.city in city.strip().lower()
+            elif only_listed:
+                affected = hotel_id in entry.hotel_ids or room_type_id in entry.room_type_ids
+            else:
+                affected = True
+            if affected and self._cache.pop(key):
+                evicted += 1
+        return evicted
+
+    # Event handlers
+
+    def on_price_changed(self, event: DomainEvent):
+        """A price change can move any offer of the city into or out of a page."""
+        payload = dict(event.payload)
+        start = to_day(payload["date"])
+        end = to_day(payload["date_to"]) - 1 if "date_to" in payload else start
+        self.invalidate(start, end, city=payload.get("city"))
+
+    def on_booked(self, event: DomainEvent):
+        """Bookings only remove inventory: evict pages that show the room type."""
+        payload = dict(event.payload)
+        for room_type_id, checkin, checkout, _ in parse_stays(payload.get("stays", "")):
+            self.invalidate(
+                to_day(checkin), to_day(checkout),
+                city=payload.get("city"),
+                room_type_id=room_type_id,
+                only_listed=True
+            )
+
+    def on_cancelled(self, event: DomainEvent):
+        """Released rooms can add offers anywhere in the city."""
+        payload = dict(event.payload)
+        for _, checkin, checkout, _ in parse_stays(payload.get("stays", "")):
+            self.invalidate(to_day(checkin), to_day(checkout), city=payload.get("city"))
+
+    def subscribe(self, bus):
+        """Invalidate through the event bus."""
+        bus.subscribe(EVENT_PRICE_CHANGED, self.on_price_changed)
+        bus.subscribe(EVENT_BOOKED, self.on_booked)
+        bus.subscribe(EVENT_CANCELLED, self.on_cancelled)
+
+    def clear(self):
+        """Drop every entry."""
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """Hit, miss, eviction and invalidation counters."""
+        return self._cache.stats()
+
+
+# Global search cache instance
+search_cache = SearchResultCache(
+    maxsize=settings.SEARCH_CACHE_SIZE,
+    ttl=settings.SEARCH_CACHE_TTL
+)
+cache_registry.register("search_results", search_cache)
@@ -1,17 +1,27 @@
 """Search controller with functional approach."""
-from typing import List
+from typing import Iterator, List, Optional
+import json
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from datetime import datetime
 from models.Hotel import Hotel as HotelModel
 from models.room_type import RoomType as RoomTypeModel
 from models.rate_plan import RatePlan as RatePlanModel
-from models.Price import Price as PriceModel
 from models.Availability import Availability as AvailabilityModel
-from core.transforms import filter_hotels_by_city
-from core.recursion import split_date_range
+from core.domain import RoomType, RatePlan
+from core.lazy import lazy_search_offers, chunk
+from core.days import DateRange
 from core.frp import event_bus, create_event, EVENT_SEARCH
+from core.inventory import inventory_index
+from core.topk import SORT_KEYS, top_k, encode_cursor, decode_cursor
+from core.singleflight import SingleFlight
+from controllers.search_engine import SearchEngine
+from controllers.search_cache import SearchResultCache, search_cache
 from controllers.hotel_controller import HotelController
-import json
+from controllers.rate_controller import RateController
+from config.settings import settings
+
+# Identical searches in flight at the same time share one computation
+search_flight = SingleFlight("search")
 
 
 class SearchController:
@@ -23,88 +33,186 @@ class SearchController:
         city: str,
         checkin: str,
         checkout: str,
-        guests: int = 1
+        guests: int = 1,
+        sort_by: str = "price",
+        limit: int = 50,
+        cursor: Optional[str] = None
     ) -> List[dict]:
-        """Search for available hotels."""
-        # Publish search event
-        event = create_event(EVENT_SEARCH, city=city, checkin=checkin, checkout=checkout)
-        event_bus.publish(event)
+        """Search for available hotels; concurrent identical searches run once.
         
-        # Get all hotels in city
-        hotels = db.query(HotelModel).filter(HotelModel.city.ilike(f"%{city}%")).all()
+        Every caller publishes its own SEARCH event, so demand counts do not
+        depend on how many searches happened to be coalesced.
+        """
+        SearchController.page_after(sort_by, cursor)
+        SearchController.parse_stay(checkin, checkout)
+        SearchController.publish_search(city, checkin, checkout)
+        key = SearchResultCache.make_key(city, checkin, checkout, guests, sort_by, limit, cursor)
+        return search_flight.do(
+            key, SearchController.search_page, db, city, checkin, checkout, guests, sort_by, limit, cursor
+        )["results"]
+    
+    @staticmethod
+    def page_after(sort_by: str, cursor: Optional[str] = None):
+        """Validate the sort order and decode the cursor; 400 if either is bad."""
+        if sort_by not in SORT_KEYS:
+            raise HTTPException(status_code=400, detail=f"sort_by must be one of {', '.join(SORT_KEYS)}")
+        if not cursor:
+            return None
+        decoded = decode_cursor(cursor, sort_by)
+        if decoded.is_left():
+            raise HTTPException(status_code=400, detail=decoded.get_left())
+        return decoded.get_right()
+    
+    @staticmethod
+    def parse_stay(checkin: str, checkout: str) -> DateRange:
+        """Stay of a search; 400 for a date that does not parse or a stay over SEARCH_MAX_NIGHTS."""
+        try:
+            stay = DateRange.parse(checkin, checkout)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date format")
+        if stay.nights > settings.SEARCH_MAX_NIGHTS:
+            raise HTTPException(
+                status_code=400, detail=f"A stay can be at most {settings.SEARCH_MAX_NIGHTS} nights"
+            )
+        return stay
+    
+    @staticmethod
+    def publish_search(city: str, checkin: str, checkout: str):
+        """Publish the SEARCH event of one search request."""
+        event_bus.publish(create_event(EVENT_SEARCH, city=city, checkin=checkin, checkout=checkout))
+    
+    @staticmethod
+    def search_page(
+        db: Session,
+        city: str,
+        checkin: str,
+        checkout: str,
+        guests: int = 1,
+        sort_by: str = "price",
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> dict:
+        """Search and return one page of the best offers plus a cursor for the next.
         
-        if not hotels:
-            return []
+        Offers are streamed into a bounded heap of ``limit`` items instead of
+        being collected and sorted in full. Pages are served from
+        ``search_cache`` until an event invalidates them or they expire.
+        This is the work coalesced by ``search_flight``, so it publishes no
+        SEARCH event; ``search_hotels`` and the async wrapper publish one per
+        caller.
+        """
+        after = SearchController.page_after(sort_by, cursor)
+        
+        cache_key = SearchResultCache.make_key(city, checkin, checkout, guests, sort_by, limit, cursor)
+        cached = search_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         # Get date range
-        dates = split_date_range(checkin, checkout)
+        stay = SearchController.parse_stay(checkin, checkout)
         
-        results = []
+        # Availability and prices from the in-memory index once it is loaded,
+        # otherwise from the database in a fixed number of queries
+        if inventory_index.loaded:
+            offers = SearchEngine.iter_offers_indexed(db, city, stay, guests, inventory_index)
+        else:
+            offers = SearchEngine.iter_offers(db, city, stay, guests)
         
-        for hotel in hotels:
-            # Get room types
-            room_types = db.query(RoomTypeModel).filter(
-                RoomTypeModel.hotel_id == hotel.id,
-                RoomTypeModel.capacity >= guests
-            ).all()
-            
-            for room_type in room_types:
-                # Check availability for all dates
-                availabilities = db.query(AvailabilityModel).filter(
-                    AvailabilityModel.room_type_id == room_type.id,
-                    AvailabilityModel.date.in_(dates)
-                ).all()
-                
-                if len(availabilities) < len(dates):
-                    continue
-                
-                is_available = all(a.available > 0 for a in availabilities)
-                
-                if not is_available:
-                    continue
-                
-                # Get rate plans
-                rate_plans = db.query(RatePlanModel).filter(
-                    RatePlanModel.room_type_id == room_type.id
-                ).all()
-                
-                for rate_plan in rate_plans:
-                    # Calculate total price
-                    prices = db.query(PriceModel).filter(
-                        PriceModel.rate_id == rate_plan.id,
-                        PriceModel.date.in_(dates)
-                    ).all()
-                    
-                    if len(prices) < len(dates):
-                        continue
-                    
-                    total_price = sum(p.amount for p in prices)
-                    
-                    results.append({
-                        "hotel": {
-                            "id": hotel.id,
-                            "name": hotel.name,
-                            "stars": hotel.stars,
-                            "city": hotel.city
-                        },
-                        "room_type": {
-                            "id": room_type.id,
-                            "name": room_type.name,
-                            "capacity": room_type.capacity
-                        },
-                        "rate_plan": {
-                            "id": rate_plan.id,
-                            "title": rate_plan.title,
-                            "meal": rate_plan.meal,
-                            "refundable": rate_plan.refundable
-                        },
-                        "total_price": total_price,
-                        "currency": "UZS",
-                        "nights": len(dates),
-                        "available": True
-                    })
+        key = SearchEngine.sort_key(sort_by)
+        results = top_k(offers, limit, key, after)
+        next_cursor = encode_cursor(sort_by, key(results[-1])) if results and len(results) == limit else None
+        
+        page = {"results": results, "next_cursor": next_cursor}
+        search_cache.put(cache_key, page)
+        return page
+    
+    @staticmethod
+    def stream_offers(
+        db: Session,
+        city: str,
+        checkin: str,
+        checkout: str,
+        guests: int = 1,
+        batch_size: int = 50
+    ) -> Iterator[dict]:
+        """Yield offers as lazy_search_offers produces them, unsorted.
+        
+        Hotels are read in keyset-paginated batches of ``batch_size``, and only
+        that batch's room types, rates, availability and prices are held in
+        memory, so memory stays flat however large the city is.
+        """
+        stay = SearchController.parse_stay(checkin, checkout)
+        SearchController.publish_search(city, checkin, checkout)
         
-        # Sort by price
-        results.sort(key=lambda x: x["total_price"])
+        index = inventory_index if inventory_index.loaded else None
+        last_id = 0
         
-        return results[:50]  # Limit to 50 results
+        while True:
+            hotel_rows = db.query(HotelModel).filter(
+                HotelModel.city.ilike(f"%{city}%"),
+                HotelModel.id > last_id
+            ).order_by(HotelModel.id).limit(batch_size).all()
+            if not hotel_rows:
+                return
+            last_id = hotel_rows[-1].id
+            hotels = tuple(HotelController.convert_to_domain(h) for h in hotel_rows)
+            
+            room_rows = db.query(RoomTypeModel).filter(
+                RoomTypeModel.hotel_id.in_([h.id for h in hotels]),
+                RoomTypeModel.capacity >= guests
+            ).order_by(RoomTypeModel.id).all()
+            room_types_map = {}
+            for rt in room_rows:
+                room_types_map.setdefault(rt.hotel_id, []).append(
+                    RoomType(id=rt.id, hotel_id=rt.hotel_id, name=rt.name, capacity=rt.capacity)
+                )
+            room_type_ids = [rt.id for rt in room_rows]
+            
+            rates_map = {}
+            for rp in db.query(RatePlanModel).filter(
+                RatePlanModel.room_type_id.in_(room_type_ids)
+            ).order_by(RatePlanModel.id):
+                rates_map.setdefault(rp.room_type_id, []).append(RatePlan(
+                    id=rp.id, hotel_id=rp.hotel_id, room_type_id=rp.room_type_id,
+                    title=rp.title, meal=rp.meal, refundable=rp.refundable,
+                    cancel_before_days=rp.cancel_before_days
+                ))
+            
+            rate_ids = [rate.id for rates in rates_map.values() for rate in rates]
+            availability_map, rate_totals = {}, None
+            if index is None:
+                availability_map = {
+                    (room_type_id, day): available
+                    for room_type_id, day, available in db.query(
+                        AvailabilityModel.room_type_id, AvailabilityModel.day, AvailabilityModel.available
+                    ).filter(
+                        AvailabilityModel.room_type_id.in_(room_type_ids),
+                        AvailabilityModel.day >= stay.start,
+                        AvailabilityModel.day < stay.end
+                    )
+                }
+                rate_totals = RateController.stay_totals(db, rate_ids, stay.start, stay.end)
+                priced = {rate_id for rate_id, total in rate_totals.items() if total is not None}
+            else:
+                _, complete = index.stay_totals(rate_ids, stay.start, stay.end)
+                priced = {rate_id for rate_id, ok in zip(rate_ids, complete) if ok}
+            
+            # Like search_hotels, only offer rates priced for every night
+            rates_map = {
+                room_type_id: [rate for rate in rates if rate.id in priced]
+                for room_type_id, rates in rates_map.items()
+            }
+            
+            for offer in lazy_search_offers(
+                hotels, room_types_map, rates_map, availability_map, {},
+                stay.start, stay.end, index=index, rate_totals=rate_totals
+            ):
+                yield SearchEngine.build_offer(
+                    offer.hotel, offer.room_type, offer.rate_plan, offer.total_price, stay.nights
+                )
+    
+    @staticmethod
+    def stream_ndjson(offers: Iterator[dict], chunk_size: int = 20) -> Iterator[str]:
+        """Group offers into newline-delimited JSON chunks."""
+        for batch in chunk(offers, chunk_size):
+            yield "".join(json.dumps(offer) + "\n" for offer in batch)
@@ -0,0 +1,239 @@
+"""Set-based search engine - fixed number of grouped queries per search."""
+from typing import Callable, Dict, Iterator, List, Set, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models.Hotel import Hotel as HotelModel
+from models.room_type import RoomType as RoomTypeModel
+from models.rate_plan import RatePlan as RatePlanModel
+from models.rate_interval import RateInterval as RateIntervalModel
+from models.Availability import Availability as AvailabilityModel
+from core.days import DateRange
+from core.inventory import InventoryIndex
+
+
+class SearchEngine:
+    """Fetch a whole city search in three queries instead of one per row."""
+
+    @staticmethod
+    def _scope(query, city: str, guests: int):
+        """Restrict a query to room types of hotels in the city that fit the guests."""
+        return query.filter(
+            HotelModel.city.ilike(f"%{city}%"),
+            RoomTypeModel.capacity >= guests
+        )
+
+    @staticmethod
+    def fetch_room_types(
+        db: Session,
+        city: str,
+        guests: int
+    ) -> List[Tuple[HotelModel, RoomTypeModel]]:
+        """Get (hotel, room_type) pairs for the city in one joined query."""
+        query = db.query(HotelModel, RoomTypeModel).join(
+            RoomTypeModel, RoomTypeModel.hotel_id == HotelModel.id
+        )
+        return SearchEngine._scope(query, city, guests).order_by(
+            HotelModel.id, RoomTypeModel.id
+        ).all()
+
+    @staticmethod
+    def fetch_available_room_type_ids(
+        db: Session,
+        city: str,
+        guests: int,
+        stay: DateRange
+    ) -> Set[int]:
+        """Get ids of room types with inventory on every night, grouped in SQL."""
+        query = db.query(AvailabilityModel.room_type_id).join(
+            RoomTypeModel, AvailabilityModel.room_type_id == RoomTypeModel.id
+        ).join(
+            HotelModel, RoomTypeModel.hotel_id == HotelModel.id
+        )
+        rows = SearchEngine._scope(query, city, guests).filter(
+            AvailabilityModel.day >= stay.start,
+            AvailabilityModel.day < stay.end
+        ).group_by(
+            AvailabilityModel.room_type_id
+        ).having(
+            func.count(AvailabilityModel.id) >= stay.nights,
+            func.min(AvailabilityModel.available) > 0
+        ).all()
+        return {row[0] for row in rows}
+
+    @staticmethod
+    def fetch_rate_totals(
+        db: Session,
+        city: str,
+        guests: int,
+        stay: DateRange
+    ) -> Dict[int, List[Tuple[RatePlanModel, int]]]:
+        """Get priced rate plans grouped by room type: room_type_id -> [(rate_plan, total)].
+
+        Each interval contributes ``amount`` times the nights it shares with
+        the stay; a rate is priced when those nights add up to the stay.
+        """
+        # SQLite's two-argument min/max are scalar: the interval clipped to the stay
+        nights = func.min(RateIntervalModel.day_to, stay.end) - func.max(RateIntervalModel.day_from, stay.start)
+        query = db.query(RatePlanModel, func.sum(RateIntervalModel.amount * nights)).join(
+            RateIntervalModel, RateIntervalModel.rate_id == RatePlanModel.id
+        ).join(
+            RoomTypeModel, RatePlanModel.room_type_id == RoomTypeModel.id
+        ).join(
+            HotelModel, RoomTypeModel.hotel_id == HotelModel.id
+        )
+        rows = SearchEngine._scope(query, city, guests).filter(
+            RateIntervalModel.day_from < stay.end,
+            RateIntervalModel.day_to > stay.start
+        ).group_by(
+            RatePlanModel.id
+        ).having(
+            func.sum(nights) >= stay.nights
+        ).order_by(RatePlanModel.id).all()
+
+        result: Dict[int, List[Tuple[RatePlanModel, int]]] = {}
+        for rate_plan, total in rows:
+            result.setdefault(rate_plan.room_type_id, []).append((rate_plan, int(total)))
+        return result
+
+    @staticmethod
+    def fetch_rate_plans(
+        db: Session,
+        city: str,
+        guests: int
+    ) -> Dict[int, List[RatePlanModel]]:
+        """Get rate plans grouped by room type, without prices."""
+        query = db.query(RatePlanModel).join(
+            RoomTypeModel, RatePlanModel.room_type_id == RoomTypeModel.id
+        ).join(
+            HotelModel, RoomTypeModel.hotel_id == HotelModel.id
+        )
+        result: Dict[int, List[RatePlanModel]] = {}
+        for rate_plan in SearchEngine._scope(query, city, guests).order_by(RatePlanModel.id):
+            result.setdefault(rate_plan.room_type_id, []).append(rate_plan)
+        return result
+
+    @staticmethod
+    def build_offer(
+        hotel: HotelModel,
+        room_type: RoomTypeModel,
+        rate_plan: RatePlanModel,
+        total_price: int,
+        nights: int
+    ) -> dict:
+        """Build the offer dict returned by the search API.
+
+        The one serializer of an offer for /search and /search/stream; the
+        hotel, room type and rate plan may be ORM rows or domain entities.
+        """
+        return {
+            "hotel": {
+                "id": hotel.id,
+                "name": hotel.name,
+                "stars": hotel.stars,
+                "city": hotel.city
+            },
+            "room_type": {
+                "id": room_type.id,
+                "name": room_type.name,
+                "capacity": room_type.capacity
+            },
+            "rate_plan": {
+                "id": rate_plan.id,
+                "title": rate_plan.title,
+                "meal": rate_plan.meal,
+                "refundable": rate_plan.refundable
+            },
+            "total_price": total_price,
+            "currency": "UZS",
+            "nights": nights,
+            "available": True
+        }
+
+    @staticmethod
+    def sort_key(sort_by: str) -> Callable[[dict], Tuple]:
+        """Sort key for offer dicts; the rate plan id makes every key unique."""
+        if sort_by == "stars":
+            return lambda o: (-o["hotel"]["stars"], o["total_price"], o["rate_plan"]["id"])
+        if sort_by == "price_per_night":
+            return lambda o: (o["total_price"] / max(o["nights"], 1), o["rate_plan"]["id"])
+        return lambda o: (o["total_price"], o["rate_plan"]["id"])
+
+    @staticmethod
+    def iter_offers(
+        db: Session,
+        city: str,
+        stay: DateRange,
+        guests: int = 1
+    ) -> Iterator[dict]:
+        """Yield every bookable offer for the city and stay (unsorted)."""
+        if not stay.nights:
+            return
+
+        pairs = SearchEngine.fetch_room_types(db, city, guests)
+        if not pairs:
+            return
+
+        available_ids = SearchEngine.fetch_available_room_type_ids(db, city, guests, stay)
+        rate_totals = SearchEngine.fetch_rate_totals(db, city, guests, stay)
+
+        for hotel, room_type in pairs:
+            if room_type.id not in available_ids:
+                continue
+            for rate_plan, total in rate_totals.get(room_type.id, ()):
+                yield SearchEngine.build_offer(hotel, room_type, rate_plan, total, stay.nights)
+
+    @staticmethod
+    def find_offers(
+        db: Session,
+        city: str,
+        stay: DateRange,
+        guests: int = 1
+    ) -> List[dict]:
+        """Find every bookable offer for the city and stay (unsorted)."""
+        return list(SearchEngine.iter_offers(db, city, stay, guests))
+
+    @staticmethod
+    def iter_offers_indexed(
+        db: Session,
+        city: str,
+        stay: DateRange,
+        guests: int,
+        index: InventoryIndex
+    ) -> Iterator[dict]:
+        """Yield offers using the in-memory index for availability and prices.
+
+        Only the catalog (hotels, room types, rate plans) comes from the database;
+        availability and stay totals are vectorized min/sum over index slices.
+        """
+        if not stay.nights:
+            return
+
+        pairs = SearchEngine.fetch_room_types(db, city, guests)
+        if not pairs:
+            return
+        rate_plans = SearchEngine.fetch_rate_plans(db, city, guests)
+
+        start, end = stay.start, stay.end
+        available = index.available_mask([rt.id for _, rt in pairs], start, end)
+        candidates = [
+            (hotel, room_type, rate_plan)
+            for (hotel, room_type), is_available in zip(pairs, available)
+            if is_available
+            for rate_plan in rate_plans.get(room_type.id, ())
+        ]
+        totals, complete = index.stay_totals([rp.id for _, _, rp in candidates], start, end)
+
+        for (hotel, room_type, rate_plan), total, priced in zip(candidates, totals, complete):
+            if priced:
+                yield SearchEngine.build_offer(hotel, room_type, rate_plan, int(total), stay.nights)
+
+    @staticmethod
+    def find_offers_indexed(
+        db: Session,
+        city: str,
+        stay: DateRange,
+        guests: int,
+        index: InventoryIndex
+    ) -> List[dict]:
+        """Find offers using the in-memory index for availability and prices."""
+        return list(SearchEngine.iter_offers_indexed(db, city, stay, guests, index))
@@ -3,34 +3,60 @@ from .domain import (
     Hotel, RoomType, RatePlan, Price, Availability,
     Guest, CartItem, Booking, Payment, Event, Rule, SearchOffer
 )
+from .days import Day, DateRange
 from .transforms import (
     apply_to_all, filter_items, fold_left, compose,
     calculate_total_price, filter_hotels_by_city, filter_hotels_by_stars
 )
 from .recursion import split_date_range, flatten_tuple, filter_tree
-from .memo import fibonacci_memo, calculate_date_range_price, memoize
+from .memo import fibonacci_memo, calculate_date_range_price, calculate_date_range_prices, memoize
 from .ftypes import Maybe, Either, validate_positive, validate_email, validate_non_empty
 from .lazy import lazy_search_offers, generate_calendar
 from .frp import EventBus, event_bus, create_event
+from .quotes import PriceTable
+from .rates import RateRun, RateSchedule, encode_runs, set_range, expand_prices
+from .rmq import RangeMinTree
+from .inventory import InventoryIndex, inventory_index
+from .singleflight import SingleFlight
+from .cache import BoundedCache, TTLCache, CacheRegistry, cache_registry
+from .timing_wheel import TimingWheel
+from .predicates import Predicate, Eq, Between, ContainsAll, And, Or, Not
+from .projections import Projection, ProjectionSet, projections
 from .service import SearchService, QuoteService, BookingService, FilterService
 
 __all__ = [
     # Domain
     "Hotel", "RoomType", "RatePlan", "Price", "Availability",
     "Guest", "CartItem", "Booking", "Payment", "Event", "Rule", "SearchOffer",
+    # Days
+    "Day", "DateRange",
     # Transforms
     "apply_to_all", "filter_items", "fold_left", "compose",
     "calculate_total_price", "filter_hotels_by_city", "filter_hotels_by_stars",
     # Recursion
     "split_date_range", "flatten_tuple", "filter_tree",
     # Memoization
-    "fibonacci_memo", "calculate_date_range_price", "memoize",
+    "fibonacci_memo", "calculate_date_range_price", "calculate_date_range_prices", "memoize",
     # FTypes
     "Maybe", "Either", "validate_positive", "validate_email", "validate_non_empty",
     # Lazy
     "lazy_search_offers", "generate_calendar",
     # FRP
     "EventBus", "event_bus", "create_event",
+    # Inventory
+    "PriceTable", "RangeMinTree", "InventoryIndex", "inventory_index",
+    # Concurrency
+    "SingleFlight",
+    # Timers
+    "TimingWheel",
+    # Caches
+    "BoundedCache", "TTLCache", "CacheRegistry", "cache_registry",
+    # Predicates
+    "Predicate", "Eq", "Between", "ContainsAll", "And", "Or", "Not",
+    # Rate intervals
+    "RateRun", "RateSchedule", "encode_runs", "set_range", "expand_prices",
+    # Projections
+    "Projection", "ProjectionSet", "projections",
     # Services
     "SearchService", "QuoteService", "BookingService", "FilterService",
 ]
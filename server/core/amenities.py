@@ -0,0 +1,145 @@
+"""Amenity bitmasks - one bit per known amenity, one AND per match.
+
+``Hotel.features``, ``RoomType.features`` and ``RoomType.beds`` stay JSON
+text (the source of truth, in its original order); a ``*_mask`` integer
+column next to each holds the bits of the names the dictionary knows.
+"has WiFi AND Pool AND Spa" is then ``mask & wanted == wanted`` - in Python,
+in SQL (SQLite's ``&``) or on a NumPy array.
+
+Bits are positions in a fixed tuple, so they are stable across processes
+and must only ever be appended to. A name outside the dictionary gets no
+bit; filters that ask for one fall back to matching the JSON text.
+"""
+import json
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Optional, Tuple
+import numpy as np
+from core.predicates import ContainsAll, Predicate
+
+# SQLite INTEGER is a signed 64-bit value
+MAX_BITS = 63
+
+
+class BitDictionary:
+    """Maps names to bits of an integer mask."""
+
+    def __init__(self, names: Iterable[str]):
+        self.names: Tuple[str, ...] = tuple(names)
+        if len(self.names) > MAX_BITS:
+            raise ValueError(f"at most {MAX_BITS} names fit in a mask")
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("names must be unique")
+        self._bits = {name: 1 << i for i, name in enumerate(self.names)}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._bits
+
+    def bit(self, name: str) -> int:
+        """The bit of one name (KeyError if unknown)."""
+        return self._bits[name]
+
+    def encode(self, names: Iterable[str]) -> int:
+        """Mask of the known names; unknown ones are skipped."""
+        mask = 0
+        for name in names:
+            mask |= self._bits.get(name, 0)
+        return mask
+
+    def encode_json(self, text: Optional[str]) -> int:
+        """Mask of a JSON list column value (NULL/empty is 0)."""
+        return self.encode(json_names(text))
+
+    def decode(self, mask: int) -> Tuple[str, ...]:
+        """Names whose bits are set, in dictionary order."""
+        return tuple(name for name, bit in self._bits.items() if mask & bit)
+
+    def require(self, names: Iterable[str]) -> Optional[int]:
+        """Mask that must be fully present, or None if a name is unknown."""
+        mask = 0
+        for name in names:
+            bit = self._bits.get(name)
+            if bit is None:
+                return None
+            mask |= bit
+        return mask
+
+
+@lru_cache(maxsize=4096)
+def json_names(text: Optional[str]) -> Tuple[str, ...]:
+    """Parse a JSON list column once per distinct value."""
+    return tuple(json.loads(text)) if text else ()
+
+
+# Hotel and room features share one dictionary; append new names at the end
+AMENITIES = BitDictionary((
+    "WiFi", "Pool", "Spa", "Restaurant", "Parking",
+    "TV", "Minibar", "Safe", "Balcony",
+    "Gym", "Bar", "Breakfast", "Air Conditioning", "Airport Shuttle",
+    "Laundry", "Kitchen", "Pet Friendly", "Room Service", "Sauna",
+    "Garden", "Terrace", "Elevator", "Wheelchair Accessible", "Non-smoking",
+    "Family Rooms", "Business Center", "Kids Club", "Beach", "Heating",
+    "Hair Dryer", "Kettle", "Bathtub", "Shower", "Desk", "Wardrobe", "View",
+))
+
+BED_TYPES = BitDictionary((
+    "Single", "Double", "Twin", "Queen", "King", "Sofa", "Bunk", "Crib",
+))
+
+
+class HasAll(Predicate):
+    """Every name is present - a bitmask AND when the mask is available.
+
+    ``field`` is the JSON/list field and ``field + "_mask"`` its mask. Rows,
+    column maps and arrays that carry the mask are tested with one AND;
+    otherwise, or when a name is not in the dictionary, the test falls back
+    to ``ContainsAll`` on the list itself.
+    """
+
+    __slots__ = ("field", "names", "dictionary", "bits", "_fallback")
+
+    def __init__(self, field: str, names: Iterable[str], dictionary: BitDictionary = AMENITIES):
+        self.field = field
+        self.names = tuple(names)
+        self.dictionary = dictionary
+        self.bits = dictionary.require(self.names)
+        self._fallback = ContainsAll(field, self.names)
+
+    @property
+    def mask_field(self) -> str:
+        return f"{self.field}_mask"
+
+    def _use_mask(self, source: Mapping) -> bool:
+        return self.bits is not None and self.mask_field in source
+
+    def __call__(self, row: Mapping) -> bool:
+        if self._use_mask(row):
+            return row[self.mask_field] & self.bits == self.bits
+        return self._fallback(row)
+
+    def to_sql(self, columns: Mapping[str, Any]):
+        if self._use_mask(columns):
+            return columns[self.mask_field].op("&")(self.bits) == self.bits
+        return self._fallback.to_sql(columns)
+
+    def mask(self, arrays: Mapping[str, np.ndarray]) -> np.ndarray:
+        if self._use_mask(arrays):
+            return (arrays[self.mask_field] & self.bits) == self.bits
+        return self._fallback.mask(arrays)
+
+    def fields(self) -> Tuple[str, ...]:
+        if self.bits is not None:
+            return (self.field, self.mask_field)
+        return (self.field,)
+
+    def __repr__(self) -> str:
+        return f"HasAll({self.field!r}, {self.names!r})"
+
+
+def has_amenities(names: Iterable[str], field: str = "features") -> HasAll:
+    """Predicate: the hotel (or room) has every amenity in ``names``."""
+    return HasAll(field, names, AMENITIES)
+
+
+def has_beds(names: Iterable[str], field: str = "beds") -> HasAll:
+    """Predicate: the room has every bed type in ``names``."""
+    return HasAll(field, names, BED_TYPES)
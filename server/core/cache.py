@@ -0,0 +1,270 @@
+"""Bounded caches with eviction statistics."""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+_MISSING = object()
+
+POLICIES = ("lru", "lfu")
+
+
+class _Entry:
+    """A cached value with its expiry, size and use count."""
+    __slots__ = ("value", "expires_at", "size", "uses")
+
+    def __init__(self, value: Any, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.uses = 1
+
+
+class BoundedCache:
+    """Thread-safe cache bounded by entries and/or bytes, with optional TTL.
+
+    ``policy`` picks the victim once a bound is exceeded: ``"lru"`` evicts
+    the least recently used entry, ``"lfu"`` the least frequently used one
+    (least recently used among equals). Both are O(1) per operation
+    (amortized for LFU).
+    ``maxsize=None`` / ``maxbytes=None`` / ``ttl=None`` disable that bound.
+    Sizes come from ``sizeof`` (shallow ``sys.getsizeof`` by default); a
+    value larger than ``maxbytes`` on its own is not cached.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 1024,
+        ttl: Optional[float] = None,
+        policy: str = "lru",
+        maxbytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {', '.join(POLICIES)}")
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.policy = policy
+        self._sizeof = sizeof if maxbytes is not None else (lambda value: 0)
+        self._clock = clock
+        self._lock = threading.RLock()
+        # Recency order for LRU; for LFU, one recency-ordered bucket per use count
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._buckets: Dict[int, "OrderedDict[Hashable, None]"] = {}
+        self._min_uses = 0
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    # Policy bookkeeping (callers hold the lock)
+
+    def _expired(self, entry: _Entry) -> bool:
+        return self.ttl is not None and self._clock() >= entry.expires_at
+
+    def _link(self, key: Hashable, entry: _Entry):
+        self._data[key] = entry
+        self.bytes += entry.size
+        if self.policy == "lfu":
+            self._buckets.setdefault(entry.uses, OrderedDict())[key] = None
+            if entry.uses == 1:
+                self._min_uses = 1
+
+    def _unlink(self, key: Hashable) -> _Entry:
+        # Emptying the fewest-used bucket leaves _min_uses as a lower bound
+        entry = self._data.pop(key)
+        self.bytes -= entry.size
+        if self.policy == "lfu":
+            bucket = self._buckets[entry.uses]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[entry.uses]
+        return entry
+
+    def _promote(self, key: Hashable, entry: _Entry):
+        """Link an unlinked entry back with one more use."""
+        if self.policy == "lfu" and entry.uses == self._min_uses and entry.uses not in self._buckets:
+            self._min_uses += 1
+        entry.uses += 1
+        self._link(key, entry)
+
+    def _touch(self, key: Hashable, entry: _Entry):
+        if self.policy == "lru":
+            self._data.move_to_end(key)
+            return
+        self._unlink(key)
+        self._promote(key, entry)
+
+    def _victim(self) -> Hashable:
+        if self.policy == "lfu":
+            # Only moves up from the bound; inserts reset it to 1
+            while self._min_uses not in self._buckets:
+                self._min_uses += 1
+            return next(iter(self._buckets[self._min_uses]))
+        return next(iter(self._data))
+
+    def _over_bounds(self) -> bool:
+        return (
+            (self.maxsize is not None and len(self._data) > self.maxsize)
+            or (self.maxbytes is not None and self.bytes > self.maxbytes)
+        )
+
+    # Public API
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value (counting the use) or ``default``."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self._expired(entry):
+                self._unlink(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._touch(key, entry)
+            self.hits += 1
+            return entry.value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting by policy while a bound is exceeded."""
+        size = self._sizeof(value)
+        expires_at = self._clock() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            previous = self._unlink(key) if key in self._data else None
+            if self.maxbytes is not None and size > self.maxbytes:
+                return
+            entry = _Entry(value, expires_at, size)
+            if previous is None:
+                self._link(key, entry)
+            else:
+                entry.uses = previous.uses
+                self._promote(key, entry)
+            while self._over_bounds():
+                self._unlink(self._victim())
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> bool:
+        """Invalidate one entry; True if it was cached."""
+        with self._lock:
+            if key not in self._data:
+                return False
+            self._unlink(key)
+            self.invalidations += 1
+            return True
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Snapshot of live (key, value) pairs, oldest first."""
+        with self._lock:
+            return [(k, e.value) for k, e in self._data.items() if not self._expired(e)]
+
+    def clear(self):
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+            self._buckets.clear()
+            self._min_uses = 0
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and not self._expired(entry)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss and eviction counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "bytes": self.bytes,
+                "maxbytes": self.maxbytes,
+                "policy": self.policy,
+            }
+
+
+class TTLCache(BoundedCache):
+    """Thread-safe LRU cache whose entries also expire after ``ttl`` seconds.
+
+    The least recently used entry is evicted once ``maxsize`` is reached.
+    ``ttl=None`` disables expiry.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        super().__init__(maxsize=maxsize, ttl=ttl, policy="lru", clock=clock)
+
+
+class CacheRegistry:
+    """Named caches reported together.
+
+    Accepts anything with ``stats()`` (BoundedCache, SearchResultCache,
+    memoized functions) or ``cache_info()`` (functools.lru_cache functions).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._caches: Dict[str, Any] = {}
+
+    def register(self, name: str, cache: Any) -> Any:
+        """Add a cache under ``name``; returns it so this works as a decorator."""
+        with self._lock:
+            self._caches[name] = cache
+        return cache
+
+    def unregister(self, name: str):
+        """Remove a cache from the report."""
+        with self._lock:
+            self._caches.pop(name, None)
+
+    @staticmethod
+    def _stats_of(cache: Any) -> Dict[str, Any]:
+        if hasattr(cache, "cache_stats"):
+            return cache.cache_stats()
+        if hasattr(cache, "stats"):
+            return cache.stats()
+        info = cache.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+            "policy": "lru",
+        }
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Statistics of every registered cache, by name."""
+        with self._lock:
+            caches = dict(self._caches)
+        return {name: self._stats_of(cache) for name, cache in caches.items()}
+
+    def clear_all(self):
+        """Empty every registered cache."""
+        with self._lock:
+            caches = list(self._caches.values())
+        for cache in caches:
+            if hasattr(cache, "cache_clear"):
+                cache.cache_clear()
+            else:
+                cache.clear()
+
+
+# Global cache registry
+cache_registry = CacheRegistry()
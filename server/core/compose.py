@@ -1,32 +1,132 @@
 """Function composition utilities."""
-from typing import Callable, TypeVar
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
 
 T = TypeVar('T')
+U = TypeVar('U')
+
+
+class Stage:
+    """A filter, map or sort step that ``pipe``/``compose`` can fuse.
+
+    Called on its own a stage takes an iterable and returns a tuple, like
+    ``filter_items``; inside a pipeline adjacent stages share one pass.
+    """
+    __slots__ = ("kind", "fn", "reverse")
+
+    def __init__(self, kind: str, fn: Callable, reverse: bool = False):
+        self.kind = kind
+        self.fn = fn
+        self.reverse = reverse
+
+    def __call__(self, items: Iterable) -> Tuple:
+        return _FusedRun((self,))(items)
+
+    def __repr__(self) -> str:
+        return f"{self.kind}_stage({getattr(self.fn, '__name__', self.fn)!r})"
+
+
+def filter_stage(predicate: Callable[[T], bool]) -> Stage:
+    """Keep the items satisfying predicate."""
+    return Stage("filter", predicate)
+
+
+def map_stage(func: Callable[[T], U]) -> Stage:
+    """Replace every item by ``func(item)``."""
+    return Stage("map", func)
+
+
+def sort_stage(key: Optional[Callable] = None, reverse: bool = False) -> Stage:
+    """Sort the items; ends a fused run because it needs all of them."""
+    return Stage("sort", key, reverse)
+
+
+def fuse(*stages: Stage) -> Callable[[Iterable], Iterator]:
+    """Lazy single pass over filter/map stages: items -> iterator.
+
+    The stages become nested builtin ``filter``/``map`` iterators, so each
+    item goes through every stage before the next one is read and nothing is
+    materialized - feed the result to ``top_k``, ``tuple`` or a loop.
+    """
+    for stage in stages:
+        if stage.kind == "sort":
+            raise ValueError("sort_stage cannot be streamed; use pipe")
+
+    def stream(items: Iterable) -> Iterator:
+        result = iter(items)
+        for stage in stages:
+            result = (filter if stage.kind == "filter" else map)(stage.fn, result)
+        return result
+    return stream
+
+
+class _FusedRun:
+    """Adjacent stages of a pipeline compiled into one pass, one tuple."""
+    __slots__ = ("stages", "_stream", "_sort")
+
+    def __init__(self, stages: Tuple[Stage, ...]):
+        self.stages = stages
+        *streamed, last = stages
+        self._sort = last if last.kind == "sort" else None
+        self._stream = fuse(*(streamed if self._sort else stages))
+
+    def __call__(self, items: Iterable) -> Tuple:
+        if self._sort is None:
+            return tuple(self._stream(items))
+        ordered = sorted(self._stream(items), key=self._sort.fn, reverse=self._sort.reverse)
+        return tuple(ordered)
+
+    def __repr__(self) -> str:
+        return f"fused({', '.join(map(repr, self.stages))})"
+
+
+def _compile(functions: Sequence[Callable]) -> Tuple[Callable, ...]:
+    """Group runs of adjacent stages (up to and including a sort) into fused steps."""
+    steps: List[Callable] = []
+    run: List[Stage] = []
+    for func in functions:
+        if isinstance(func, Stage):
+            run.append(func)
+            if func.kind == "sort":
+                steps.append(_FusedRun(tuple(run)))
+                run = []
+            continue
+        if run:
+            steps.append(_FusedRun(tuple(run)))
+            run = []
+        steps.append(func)
+    if run:
+        steps.append(_FusedRun(tuple(run)))
+    return tuple(steps)
 
 
 def compose(*functions: Callable) -> Callable:
     """Compose functions from right to left.
     
     compose(f, g, h)(x) == f(g(h(x)))
+
+    Adjacent filter/map stages are fused as in ``pipe``.
     """
-    def inner(arg):
-        result = arg
-        for func in reversed(functions):
-            result = func(result)
-        return result
-    return inner
+    return pipe(*reversed(functions))
 
 
 def pipe(*functions: Callable) -> Callable:
     """Pipe functions from left to right.
     
     pipe(f, g, h)(x) == h(g(f(x)))
+
+    Adjacent ``filter_stage``/``map_stage`` steps (optionally closed by a
+    ``sort_stage``) are compiled into a single pass that allocates one
+    result tuple instead of one per step. The compiled steps are exposed as
+    ``.steps``.
     """
+    steps = _compile(functions)
+
     def inner(arg):
         result = arg
-        for func in functions:
+        for func in steps:
             result = func(result)
         return result
+    inner.steps = steps
     return inner
 
 
@@ -0,0 +1,142 @@
+"""Integer day ordinals - compact date values for hot paths."""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Iterator, Sequence, Tuple
+import numpy as np
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> int:
+    """Ordinal of an ISO date string (a timestamp's time part is ignored)."""
+    return date.fromisoformat(value[:10]).toordinal()
+
+
+def to_day(value) -> int:
+    """Convert an ISO date string (or date, or ordinal) to a day ordinal."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, date):
+        return value.toordinal()
+    return _parse_iso(value)
+
+
+def weekend_days_before(ordinal):
+    """Saturdays and Sundays among ordinals ``0 .. ordinal - 1`` (closed form).
+
+    Ordinal 0 is a Sunday, so every full week contributes two weekend days
+    and a partial week one (its leading Sunday). Works on ints and NumPy
+    arrays alike.
+    """
+    return 2 * (ordinal // 7) + (ordinal % 7 != 0)
+
+
+def count_weekend_days(start: int, end: int) -> int:
+    """Weekend days in the half-open ordinal range ``[start, end)``, in O(1)."""
+    if end <= start:
+        return 0
+    return int(weekend_days_before(end) - weekend_days_before(start))
+
+
+class Day(int):
+    """A calendar day stored as its proleptic Gregorian ordinal.
+
+    Compares, hashes and indexes like the int it is, so it works as a dict
+    key, a NumPy index and an SQL parameter without conversion. The weekday
+    is plain arithmetic on the ordinal - day 1 (0001-01-01) is a Monday.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, value) -> "Day":
+        """Day from an ISO string, date, Day or ordinal."""
+        if type(value) is cls:
+            return value
+        return cls(to_day(value))
+
+    @property
+    def weekday(self) -> int:
+        """Monday is 0 and Sunday is 6."""
+        return (int(self) + 6) % 7
+
+    @property
+    def is_weekend(self) -> bool:
+        """Saturday or Sunday."""
+        return self.weekday >= 5
+
+    def to_date(self) -> date:
+        """The equivalent datetime.date."""
+        return date.fromordinal(self)
+
+    def isoformat(self) -> str:
+        """YYYY-MM-DD."""
+        return date.fromordinal(self).isoformat()
+
+    def __add__(self, days: int) -> "Day":
+        return Day(int(self) + int(days))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        """Day minus int is a Day; Day minus Day is a number of days."""
+        if isinstance(other, Day):
+            return int(self) - int(other)
+        return Day(int(self) - int(other))
+
+    def __str__(self) -> str:
+        return self.isoformat()
+
+    def __repr__(self) -> str:
+        return f"Day({self.isoformat()})"
+
+
+@dataclass(frozen=True)
+class DateRange:
+    """Half-open stay range: the nights ``start .. end - 1``; checkout is ``end``."""
+    start: Day
+    end: Day
+
+    @classmethod
+    def parse(cls, checkin, checkout) -> "DateRange":
+        """Range from checkin/checkout as ISO strings, dates or ordinals."""
+        return cls(Day.parse(checkin), Day.parse(checkout))
+
+    @classmethod
+    def covering(cls, days: Sequence) -> "DateRange":
+        """Smallest range containing a contiguous, sorted sequence of days."""
+        if not days:
+            return cls(Day(1), Day(1))
+        return cls(Day.parse(days[0]), Day.parse(days[-1]) + 1)
+
+    @property
+    def nights(self) -> int:
+        """Number of nights (0 for an empty or inverted range)."""
+        return max(0, self.end - self.start)
+
+    def __len__(self) -> int:
+        return self.nights
+
+    def __iter__(self) -> Iterator[Day]:
+        return map(Day, range(self.start, self.end))
+
+    def __contains__(self, day) -> bool:
+        return self.start <= to_day(day) < self.end
+
+    @property
+    def weekend_nights(self) -> int:
+        """Nights that fall on a Saturday or Sunday."""
+        return count_weekend_days(self.start, self.end)
+
+    def ordinals(self) -> range:
+        """Night ordinals as a plain range - the fastest way to iterate."""
+        return range(self.start, self.end)
+
+    def isoformat(self) -> Tuple[str, ...]:
+        """ISO strings of every night."""
+        first = self.start.to_date()
+        return tuple((first + timedelta(days=i)).isoformat() for i in range(self.nights))
+
+    def overlaps(self, other: "DateRange") -> bool:
+        """True if the two ranges share a night."""
+        return self.start < other.end and other.start < self.end
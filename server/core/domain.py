@@ -1,6 +1,7 @@
 """Immutable domain entities."""
 from dataclasses import dataclass
 from typing import Tuple, Optional
+from core.days import Day, DateRange
 
 
 @dataclass(frozen=True)
@@ -45,6 +46,11 @@ class Price:
     amount: int
     currency: str = "UZS"
 
+    @property
+    def day(self) -> Day:
+        """The price's night as a day ordinal."""
+        return Day.parse(self.date)
+
 
 @dataclass(frozen=True)
 class Availability:
@@ -54,6 +60,11 @@ class Availability:
     date: str
     available: int
 
+    @property
+    def day(self) -> Day:
+        """The night as a day ordinal."""
+        return Day.parse(self.date)
+
 
 @dataclass(frozen=True)
 class Guest:
@@ -74,6 +85,11 @@ class CartItem:
     checkout: str
     guests: int
 
+    @property
+    def stay(self) -> DateRange:
+        """Nights from checkin up to (not including) checkout."""
+        return DateRange.parse(self.checkin, self.checkout)
+
 
 @dataclass(frozen=True)
 class Booking:
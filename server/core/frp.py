@@ -1,42 +1,261 @@
 """Functional Reactive Programming - Event Bus."""
+import re
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, List, Callable
+from typing import Deque, Dict, List, Callable, Iterable, Optional, Tuple
 from core.domain import Event as DomainEvent
 
 
+OVERFLOW_POLICIES = ("block", "drop_oldest", "sample")
+
+
+def _handler_name(handler: Callable) -> str:
+    """Stable label for metrics: module.qualname (or repr for odd callables)."""
+    name = getattr(handler, "__qualname__", None) or getattr(handler, "__name__", None)
+    if name is None:
+        return repr(handler)
+    return f"{getattr(handler, '__module__', '')}.{name}".lstrip(".")
+
+
+class HandlerStats:
+    """Call count, failures and latency of one handler."""
+    __slots__ = ("calls", "failures", "total_seconds", "max_seconds", "last_error")
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_error: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "avg_ms": self.total_seconds / self.calls * 1000 if self.calls else 0.0,
+            "max_ms": self.max_seconds * 1000,
+            "last_error": self.last_error,
+        }
+
+
 class EventBus:
-    """Event bus for functional reactive programming."""
+    """Event bus for functional reactive programming.
+
+    Handlers subscribed with ``background=True`` run off the publishing
+    request once ``start()`` has launched worker threads: ``publish`` only
+    appends the event to a bounded queue. ``overflow`` decides what happens
+    when the queue is full:
+
+    - ``"block"``: the publisher waits for room (a background handler
+      publishing into a full queue runs the event's handlers itself, since
+      its worker would otherwise wait on itself);
+    - ``"drop_oldest"``: the oldest queued event is discarded;
+    - ``"sample"``: only every ``sample_every``-th overflowing event is
+      queued (replacing the oldest), so an overloaded queue still carries
+      an even sample of the stream.
+
+    Other handlers - and every handler while the bus is not started - run
+    inline, as before. Handlers that must see an event before the request
+    returns (cache invalidation, inventory) stay inline.
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        queue_size: int = 10000,
+        overflow: str = "block",
+        sample_every: int = 10
+    ):
         self._subscribers: Dict[str, List[Callable]] = {}
+        self._background: Dict[str, List[Callable]] = {}
+        self.configure(queue_size, overflow, sample_every)
+        self._queue: Deque[DomainEvent] = deque()
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._running = False
+        self._busy = 0
+        self._overflowed = 0
+        self._metrics: Dict[str, HandlerStats] = {}
+        self._metrics_lock = threading.Lock()
+        self._counters = {"published": 0, "queued": 0, "dropped": 0, "inline": 0, "max_depth": 0}
     
-    def subscribe(self, event_name: str, handler: Callable):
-        """Subscribe to an event."""
-        if event_name not in self._subscribers:
-            self._subscribers[event_name] = []
-        self._subscribers[event_name].append(handler)
+    def configure(self, queue_size: int = 10000, overflow: str = "block", sample_every: int = 10):
+        """Set the queue bound and overflow policy."""
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}")
+        self.queue_size = max(1, queue_size)
+        self.overflow = overflow
+        self.sample_every = max(1, sample_every)
+    
+    def subscribe(self, event_name: str, handler: Callable, background: bool = False):
+        """Subscribe to an event (``background`` handlers go through the queue)."""
+        target = self._background if background else self._subscribers
+        if event_name not in target:
+            target[event_name] = []
+        target[event_name].append(handler)
     
     def unsubscribe(self, event_name: str, handler: Callable):
         """Unsubscribe from an event."""
-        if event_name in self._subscribers:
-            self._subscribers[event_name].remove(handler)
+        for target in (self._subscribers, self._background):
+            if handler in target.get(event_name, ()):
+                target[event_name].remove(handler)
+                return
     
     def publish(self, event: DomainEvent):
         """Publish an event to all subscribers."""
-        if event.name in self._subscribers:
-            for handler in self._subscribers[event.name]:
-                try:
-                    handler(event)
-                except Exception as e:
-                    print(f"Error in event handler: {e}")
+        with self._cond:
+            self._counters["published"] += 1
+        for handler in tuple(self._subscribers.get(event.name, ())):
+            self._run(handler, event)
+        if not self._background.get(event.name):
+            return
+        if self._running:
+            self._enqueue(event)
+        else:
+            self._dispatch(event)
+    
+    def _run(self, handler: Callable, event: DomainEvent):
+        """Call one handler, timing it and isolating its failure."""
+        started = time.perf_counter()
+        error = None
+        try:
+            handler(event)
+        except Exception as e:
+            error = e
+            print(f"Error in event handler: {e}")
+        elapsed = time.perf_counter() - started
+        with self._metrics_lock:
+            stats = self._metrics.get(_handler_name(handler))
+            if stats is None:
+                stats = self._metrics[_handler_name(handler)] = HandlerStats()
+            stats.calls += 1
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            if error is not None:
+                stats.failures += 1
+                stats.last_error = repr(error)
+    
+    def _dispatch(self, event: DomainEvent):
+        for handler in tuple(self._background.get(event.name, ())):
+            self._run(handler, event)
+    
+    def _enqueue(self, event: DomainEvent):
+        inline = False
+        with self._cond:
+            if len(self._queue) >= self.queue_size:
+                if self.overflow == "block" and threading.current_thread() in self._workers:
+                    # A worker waiting for room it is meant to make would deadlock
+                    self._counters["inline"] += 1
+                    inline = True
+                elif self.overflow == "block":
+                    while self._running and len(self._queue) >= self.queue_size:
+                        self._cond.wait()
+                    if not self._running:
+                        self._counters["dropped"] += 1
+                        return
+                else:
+                    self._overflowed += 1
+                    if self.overflow == "sample" and self._overflowed % self.sample_every:
+                        self._counters["dropped"] += 1
+                        return
+                    self._queue.popleft()
+                    self._counters["dropped"] += 1
+            if not inline:
+                self._queue.append(event)
+                self._counters["queued"] += 1
+                self._counters["max_depth"] = max(self._counters["max_depth"], len(self._queue))
+                self._cond.notify_all()
+        if inline:
+            self._dispatch(event)
+    
+    def _work(self):
+        while True:
+            with self._cond:
+                while self._running and not self._queue:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                event = self._queue.popleft()
+                self._busy += 1
+                self._cond.notify_all()
+            try:
+                self._dispatch(event)
+            finally:
+                with self._cond:
+                    self._busy -= 1
+                    self._cond.notify_all()
+    
+    def start(self, workers: int = 1):
+        """Launch worker threads; background handlers then run off the publisher."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._workers = [
+            threading.Thread(target=self._work, name=f"event-bus-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued event has been handled; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                if not self._workers or not self._running:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            leftover = list(self._queue)
+            self._queue.clear()
+        # Without workers (stopped bus) the rest is handled here
+        for event in leftover:
+            self._dispatch(event)
+        return True
+    
+    def stop(self, timeout: Optional[float] = 5.0) -> bool:
+        """Drain the queue, then stop the workers; True if nothing was left behind."""
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+        # Events queued after the flush timed out are handled inline
+        return self.flush() and flushed
+    
+    @property
+    def running(self) -> bool:
+        return self._running
+    
+    def stats(self) -> dict:
+        """Queue counters and per-handler latency/failure metrics."""
+        with self._cond:
+            bus = {
+                **self._counters,
+                "depth": len(self._queue),
+                "in_flight": self._busy,
+                "workers": len(self._workers),
+                "queue_size": self.queue_size,
+                "overflow": self.overflow,
+            }
+        with self._metrics_lock:
+            handlers = {name: stats.as_dict() for name, stats in self._metrics.items()}
+        return {**bus, "handlers": handlers}
     
     def clear(self):
         """Clear all subscribers."""
         self._subscribers.clear()
+        self._background.clear()
     
     def get_subscriber_count(self, event_name: str) -> int:
         """Get number of subscribers for an event."""
-        return len(self._subscribers.get(event_name, []))
+        return len(self._subscribers.get(event_name, [])) + len(self._background.get(event_name, []))
 
 
 # Global event bus instance
@@ -50,6 +269,7 @@ EVENT_BOOKED = "BOOKED"
 EVENT_CANCELLED = "CANCELLED"
 EVENT_PAYMENT = "PAYMENT"
 EVENT_PRICE_CHANGED = "PRICE_CHANGED"
+ALL_EVENTS = (EVENT_SEARCH, EVENT_HOLD, EVENT_BOOKED, EVENT_CANCELLED, EVENT_PAYMENT, EVENT_PRICE_CHANGED)
 
 
 # Helper functions for creating events
@@ -65,6 +285,54 @@ def create_event(name: str, **kwargs) -> DomainEvent:
     )
 
 
+def format_stays(stays: Iterable[Tuple[int, str, str, int]]) -> str:
+    """Encode (room_type_id, checkin, checkout, rooms) stays for an event payload."""
+    return ";".join(f"{rt}:{checkin}:{checkout}:{rooms}" for rt, checkin, checkout, rooms in stays)
+
+
+def parse_stays(value: str) -> Tuple[Tuple[int, str, str, int], ...]:
+    """Decode the ``stays`` payload field written by format_stays."""
+    result = []
+    for part in value.split(";"):
+        if part:
+            rt, checkin, checkout, rooms = part.split(":")
+            result.append((int(rt), checkin, checkout, int(rooms)))
+    return tuple(result)
+
+
+# Compact payload encoding: key US value RS key US value ... with the few
+# separator/control characters percent-escaped, so a record is one line
+_UNIT, _RECORD = "\x1f", "\x1e"
+_ESCAPES = str.maketrans({
+    "%": "%25", _UNIT: "%1F", _RECORD: "%1E", "\x1d": "%1D", "\n": "%0A", "\r": "%0D"
+})
+_ESCAPED = re.compile("%(25|1F|1E|1D|0A|0D)")
+
+
+def _unescape(text: str) -> str:
+    if "%" not in text:
+        return text
+    return _ESCAPED.sub(lambda m: chr(int(m.group(1), 16)), text)
+
+
+def encode_payload(payload: Iterable[Tuple[str, str]]) -> str:
+    """Encode key-value pairs as one line of text (no JSON, no quoting)."""
+    return _RECORD.join(
+        f"{str(k).translate(_ESCAPES)}{_UNIT}{str(v).translate(_ESCAPES)}" for k, v in payload
+    )
+
+
+def decode_payload(text: Optional[str]) -> Tuple[Tuple[str, str], ...]:
+    """Inverse of encode_payload."""
+    if not text:
+        return ()
+    pairs = []
+    for field in text.split(_RECORD):
+        key, _, value = field.partition(_UNIT)
+        pairs.append((_unescape(key), _unescape(value)))
+    return tuple(pairs)
+
+
 # Example event handlers
 def log_event(event: DomainEvent):
     """Log event to console."""
@@ -72,6 +340,9 @@ def log_event(event: DomainEvent):
 
 
 def save_event_to_db(event: DomainEvent):
-    """Save event to database."""
-    # This would be implemented in the controller layer
+    """Save event to database.
+
+    Persistence is done by ``database.event_sink.event_sink`` (subscribed at
+    startup), which batches inserts off the request path.
+    """
     pass
@@ -1,5 +1,6 @@
 """Maybe and Either monads for safe error handling."""
 from dataclasses import dataclass
+from datetime import date
 from typing import Optional, TypeVar, Generic, Callable
 import re
 
@@ -125,13 +126,13 @@ def validate_email(email: str) -> Either[str, str]:
 
 
 def validate_date_range(start: str, end: str) -> Either[str, tuple[str, str]]:
-    """Validate date range."""
+    """Validate a range of two YYYY-MM-DD dates."""
     try:
-        from datetime import datetime
-        start_dt = datetime.fromisoformat(start)
-        end_dt = datetime.fromisoformat(end)
-        if start_dt < end_dt:
+        from core.days import to_day
+        if any(date.fromisoformat(value).isoformat() != value for value in (start, end)):
+            return Either.left("Invalid date format")
+        if to_day(start) < to_day(end):
             return Either.right((start, end))
         return Either.left("End date must be after start date")
-    except ValueError:
+    except (TypeError, ValueError):
         return Either.left("Invalid date format")
@@ -0,0 +1,191 @@
+"""Columnar inventory and rate index - dense NumPy arrays aligned to day ordinals."""
+import threading
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+import numpy as np
+from core.domain import Event as DomainEvent
+from core.quotes import PriceTable, to_day
+from core.rmq import RangeMinTree
+
+
+class InventoryIndex:
+    """Availability per (room_type_id, day) and price per (rate_id, day).
+
+    Column ``j`` of ``availability`` holds day ordinal ``origin + j``. Stay
+    ranges are half-open: ``[start, end)`` covers the nights from checkin to
+    checkout. Missing availability counts as zero rooms. Availability sits in
+    a per-room-type ``RangeMinTree`` (O(log n) minimum rooms free over a stay,
+    O(log n) point updates); prices live in a prefix-sum ``PriceTable``, so
+    stay totals are one subtraction.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.origin = 0
+        self.room_rows: Dict[int, int] = {}
+        self.free = RangeMinTree(np.zeros((0, 0), dtype=np.int32))
+        self.rates = PriceTable()
+        self.loaded = False
+
+    @property
+    def availability(self) -> np.ndarray:
+        """Rooms free per (room type row, day column) - a view of the tree leaves."""
+        return self.free.values
+
+    @property
+    def days(self) -> int:
+        """Number of day columns."""
+        return self.free.n
+
+    # Loading
+
+    def load(
+        self,
+        availability_rows: Iterable[Tuple[int, str, int]],
+        price_rows: Iterable[Tuple[int, str, int]]
+    ):
+        """Build the arrays from (room_type_id, date, available) and (rate_id, date, amount) rows."""
+        avail = [(rt, to_day(d), n) for rt, d, n in availability_rows]
+        rates = PriceTable()
+        rates.load(price_rows)
+
+        with self._lock:
+            origin = min(d for _, d, _ in avail) if avail else 0
+            days = (max(d for _, d, _ in avail) - origin + 1) if avail else 0
+            room_rows = {rt: i for i, rt in enumerate(sorted({rt for rt, _, _ in avail}))}
+
+            availability = np.zeros((len(room_rows), days), dtype=np.int32)
+            if avail:
+                rows = np.fromiter((room_rows[rt] for rt, _, _ in avail), dtype=np.intp, count=len(avail))
+                cols = np.fromiter((d - origin for _, d, _ in avail), dtype=np.intp, count=len(avail))
+                availability[rows, cols] = np.fromiter((n for _, _, n in avail), dtype=np.int32, count=len(avail))
+
+            self.origin = origin
+            self.room_rows = room_rows
+            self.free = RangeMinTree(availability)
+            self.rates = rates
+            self.loaded = True
+
+    def clear(self):
+        """Drop all data."""
+        self.__init__()
+
+    # Queries
+
+    def _span(self, start: int, end: int) -> Optional[Tuple[int, int]]:
+        """Column slice for [start, end), or None if the range is not fully covered."""
+        lo, hi = start - self.origin, end - self.origin
+        if lo < 0 or hi > self.days or lo >= hi:
+            return None
+        return lo, hi
+
+    def min_available(self, room_type_id: int, start: int, end: int) -> int:
+        """Minimum rooms free over the nights [start, end)."""
+        with self._lock:
+            span = self._span(start, end)
+            row = self.room_rows.get(room_type_id)
+            if span is None or row is None:
+                return 0
+            return self.free.query(row, span[0], span[1])
+
+    def is_available(self, room_type_id: int, start: int, end: int, rooms: int = 1) -> bool:
+        """Whether at least ``rooms`` rooms are free every night."""
+        return self.min_available(room_type_id, start, end) >= rooms
+
+    def stay_total(self, rate_id: int, start: int, end: int, require_priced: bool = True) -> Optional[int]:
+        """Total price over [start, end), or None if any night is unpriced.
+
+        With ``require_priced=False`` unpriced nights count as zero instead.
+        """
+        return self.rates.quote(rate_id, start, end, require_priced)
+
+    def available_mask(self, room_type_ids: Sequence[int], start: int, end: int, rooms: int = 1) -> np.ndarray:
+        """Vectorized availability check for many room types over the same stay."""
+        with self._lock:
+            span = self._span(start, end)
+            result = np.zeros(len(room_type_ids), dtype=bool)
+            if span is None:
+                return result
+            rows = np.fromiter((self.room_rows.get(rt, -1) for rt in room_type_ids), dtype=np.intp, count=len(room_type_ids))
+            known = rows >= 0
+            if known.any():
+                result[known] = self.free.query_rows(rows[known], span[0], span[1]) >= rooms
+            return result
+
+    def stay_totals(self, rate_ids: Sequence[int], start: int, end: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized stay totals for many rates: (totals, fully_priced_mask)."""
+        count = len(rate_ids)
+        return self.rates.quote_batch(rate_ids, np.full(count, start), np.full(count, end))
+
+    # Updates
+
+    def _ensure_days(self, start: int, end: int):
+        """Grow the day axis so that [start, end) is covered."""
+        if self.days == 0 and not self.room_rows:
+            self.origin = start
+        pad_left = max(0, self.origin - start)
+        pad_right = max(0, end - (self.origin + self.days))
+        if pad_left or pad_right:
+            self.free = RangeMinTree(np.pad(self.availability, ((0, 0), (pad_left, pad_right))))
+            self.origin -= pad_left
+
+    def _room_row(self, room_type_id: int) -> int:
+        """Row of a room type, appending a zero row if unknown."""
+        row = self.room_rows.get(room_type_id)
+        if row is None:
+            row = len(self.room_rows)
+            self.room_rows[room_type_id] = row
+            self.free = RangeMinTree(np.vstack([self.availability, np.zeros((1, self.days), dtype=np.int32)]))
+        return row
+
+    def set_price(self, rate_id: int, day: int, amount: int):
+        """Set the price of one night."""
+        self.rates.set_price(rate_id, day, amount)
+
+    def set_available(self, room_type_id: int, day: int, available: int):
+        """Set the room count of one night."""
+        with self._lock:
+            self._ensure_days(day, day + 1)
+            row = self._room_row(room_type_id)
+            self.free.update(row, day - self.origin, available)
+
+    def adjust_available(self, room_type_id: int, start: int, end: int, delta: int):
+        """Add ``delta`` rooms to every night in [start, end)."""
+        with self._lock:
+            self._ensure_days(start, end)
+            row = self._room_row(room_type_id)
+            self.free.add(row, start - self.origin, end - self.origin, delta)
+
+    # Event bus integration
+
+    def on_price_changed(self, event: DomainEvent):
+        """PRICE_CHANGED(rate_id, date, amount[, date_to]) handler - one night or ``[date, date_to)``."""
+        payload = dict(event.payload)
+        start = to_day(payload["date"])
+        end = to_day(payload["date_to"]) if "date_to" in payload else start + 1
+        for day in range(start, end):
+            self.set_price(int(payload["rate_id"]), day, int(payload["amount"]))
+
+    def on_booked(self, event: DomainEvent):
+        """BOOKED handler - take one room per night for every stay in the payload."""
+        self._apply_stays(event, -1)
+
+    def on_cancelled(self, event: DomainEvent):
+        """CANCELLED handler - give the rooms back."""
+        self._apply_stays(event, 1)
+
+    def _apply_stays(self, event: DomainEvent, sign: int):
+        from core.frp import parse_stays
+        payload = dict(event.payload)
+        for room_type_id, checkin, checkout, rooms in parse_stays(payload.get("stays", "")):
+            self.adjust_available(room_type_id, to_day(checkin), to_day(checkout), sign * rooms)
+
+    def subscribe(self, bus):
+        """Keep the index current through the event bus."""
+        from core.frp import EVENT_PRICE_CHANGED, EVENT_BOOKED, EVENT_CANCELLED
+        bus.subscribe(EVENT_PRICE_CHANGED, self.on_price_changed)
+        bus.subscribe(EVENT_BOOKED, self.on_booked)
+        bus.subscribe(EVENT_CANCELLED, self.on_cancelled)
+
+
+# Global process-resident index
+inventory_index = InventoryIndex()
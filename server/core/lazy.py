@@ -1,37 +1,58 @@
 """Lazy evaluation with generators."""
-from typing import Iterator, Tuple, Any
+from typing import Iterator, Tuple, Any, Optional
 import itertools
 from core.domain import Hotel, RoomType, RatePlan, SearchOffer, Price, Availability
+from core.days import Day, DateRange, to_day
+from core.inventory import InventoryIndex
 
 
 def lazy_search_offers(
     hotels: Tuple[Hotel, ...],
     room_types_map: dict,  # hotel_id -> room_types
     rates_map: dict,  # room_type_id -> rates
-    availability_map: dict,  # (room_type_id, date) -> available
-    prices_map: dict,  # (rate_id, date) -> price
-    checkin: str,
-    checkout: str
+    availability_map: dict,  # (room_type_id, day) -> available
+    prices_map: dict,  # (rate_id, day) -> price
+    checkin,
+    checkout,
+    index: Optional[InventoryIndex] = None,
+    rate_totals: Optional[dict] = None  # rate_id -> stay total
 ) -> Iterator[SearchOffer]:
-    """Lazy generator for search offers."""
+    """Lazy generator for search offers.
+    
+    ``checkin``/``checkout`` may be ISO strings, dates or Day ordinals, and
+    the maps may be keyed on either ISO date strings or day ordinals.
+    ``rate_totals`` prices each rate for the whole stay (a rate missing
+    from it costs 0) instead of summing ``prices_map`` night by night.
+    With an ``index`` the availability and price maps are ignored and every
+    stay is answered by a min/sum over the index's day-aligned arrays.
+    """
+    if index is not None:
+        yield from _lazy_indexed_offers(hotels, room_types_map, rates_map, index, checkin, checkout)
+        return
+    
+    nights = DateRange.parse(checkin, checkout).ordinals()
+    availability_map = _by_day(availability_map)
+    prices_map = _by_day(prices_map)
     for hotel in hotels:
         room_types = room_types_map.get(hotel.id, ())
         for room_type in room_types:
             rates = rates_map.get(room_type.id, ())
             for rate in rates:
                 # Check availability lazily
-                dates = _generate_dates(checkin, checkout)
                 is_available = all(
-                    availability_map.get((room_type.id, date), 0) > 0
-                    for date in dates
+                    availability_map.get((room_type.id, day), 0) > 0
+                    for day in nights
                 )
                 
                 if is_available:
                     # Calculate price lazily
-                    total_price = sum(
-                        prices_map.get((rate.id, date), 0)
-                        for date in dates
-                    )
+                    if rate_totals is not None:
+                        total_price = rate_totals.get(rate.id) or 0
+                    else:
+                        total_price = sum(
+                            prices_map.get((rate.id, day), 0)
+                            for day in nights
+                        )
                     
                     yield SearchOffer(
                         hotel=hotel,
@@ -42,32 +63,49 @@ def lazy_search_offers(
                     )
 
 
-def _generate_dates(start: str, end: str) -> Iterator[str]:
-    """Generate dates between start and end."""
-    from datetime import datetime, timedelta
-    current = datetime.fromisoformat(start)
-    end_dt = datetime.fromisoformat(end)
-    
-    while current < end_dt:
-        yield current.date().isoformat()
-        current += timedelta(days=1)
+def _lazy_indexed_offers(
+    hotels: Tuple[Hotel, ...],
+    room_types_map: dict,
+    rates_map: dict,
+    index: InventoryIndex,
+    checkin,
+    checkout
+) -> Iterator[SearchOffer]:
+    """Offers answered from the inventory index, one room type at a time."""
+    stay = DateRange.parse(checkin, checkout)
+    start, end = stay.start, stay.end
+    for hotel in hotels:
+        for room_type in room_types_map.get(hotel.id, ()):
+            if not index.is_available(room_type.id, start, end):
+                continue
+            for rate in rates_map.get(room_type.id, ()):
+                yield SearchOffer(
+                    hotel=hotel,
+                    room_type=room_type,
+                    rate_plan=rate,
+                    total_price=index.stay_total(rate.id, start, end, require_priced=False),
+                    available=True
+                )
+
+
+def _by_day(mapping: dict) -> dict:
+    """``mapping`` keyed on (id, day ordinal); ISO date keys are converted."""
+    if not any(isinstance(day, str) for _, day in mapping):
+        return mapping
+    return {(key, to_day(day)): value for (key, day), value in mapping.items()}
 
 
 def generate_calendar(
     room_type_id: int,
-    start_date: str,
+    start_date,
     days: int,
-    availability_map: dict
+    availability_map: dict  # (room_type_id, day) -> available
 ) -> Iterator[Tuple[str, int]]:
-    """Generate availability calendar lazily."""
-    from datetime import datetime, timedelta
-    current = datetime.fromisoformat(start_date)
-    
-    for _ in range(days):
-        date_str = current.date().isoformat()
-        available = availability_map.get((room_type_id, date_str), 0)
-        yield (date_str, available)
-        current += timedelta(days=1)
+    """Generate availability calendar lazily, as (ISO date, available) pairs."""
+    availability_map = _by_day(availability_map)
+    start = Day.parse(start_date)
+    for day in range(start, start + days):
+        yield (Day(day).isoformat(), availability_map.get((room_type_id, day), 0))
 
 
 def lazy_filter(predicate, iterable: Iterator) -> Iterator:
@@ -1,7 +1,13 @@
 """Memoization utilities."""
 from functools import lru_cache, wraps
-from typing import Callable, Dict, Tuple, Any
-from core.recursion import split_date_range
+from typing import Callable, Dict, Tuple, Any, Optional, Sequence
+import numpy as np
+from core.cache import BoundedCache, cache_registry
+from core.days import to_day, count_weekend_days, weekend_days_before
+from core.quotes import to_days
+
+_MISSING = object()
+_KWARGS_MARK = object()
 
 
 @lru_cache(maxsize=None)
@@ -12,17 +18,39 @@ def fibonacci_memo(n: int) -> int:
     return fibonacci_memo(n - 1) + fibonacci_memo(n - 2)
 
 
-@lru_cache(maxsize=1000)
-def calculate_date_range_price(start_date: str, end_date: str, base_price: int) -> int:
-    """Calculate price for date range with memoization."""
-    dates = split_date_range(start_date, end_date)
-    # Weekend multiplier
-    total = 0
-    for date_str in dates:
-        date = __import__('datetime').datetime.fromisoformat(date_str)
-        multiplier = 1.2 if date.weekday() >= 5 else 1.0
-        total += int(base_price * multiplier)
-    return total
+WEEKEND_MULTIPLIER = 1.2
+
+
+def calculate_date_range_price(start_date, end_date, base_price: int) -> int:
+    """Price the nights [start_date, end_date), weekend nights at +20%.
+    
+    Closed form: count the weekend days arithmetically instead of walking
+    the range, so the cost is O(1) for any length and needs no cache.
+    """
+    start, end = to_day(start_date), to_day(end_date)
+    if end <= start:
+        return 0
+    weekend = count_weekend_days(start, end)
+    return (end - start - weekend) * int(base_price) + weekend * int(base_price * WEEKEND_MULTIPLIER)
+
+
+def calculate_date_range_prices(
+    start_dates: Sequence,
+    end_dates: Sequence,
+    base_prices: Sequence[int]
+) -> np.ndarray:
+    """calculate_date_range_price for whole arrays of rows in one vectorized pass.
+    
+    Dates may be ISO strings, dates or day ordinals (an integer array skips
+    parsing entirely).
+    """
+    starts = to_days(start_dates)
+    ends = to_days(end_dates)
+    base = np.asarray(base_prices, dtype=np.int64)
+    ends = np.maximum(ends, starts)
+    weekend = weekend_days_before(ends) - weekend_days_before(starts)
+    weekend_price = np.trunc(base * WEEKEND_MULTIPLIER).astype(np.int64)
+    return (ends - starts - weekend) * base + weekend * weekend_price
 
 
 @lru_cache(maxsize=500)
@@ -39,20 +67,42 @@ def calculate_cancellation_penalty(days_before: int, refundable: bool, total_amo
     return int(total_amount * 0.75)
 
 
-def memoize(func: Callable) -> Callable:
-    """Custom memoization decorator."""
-    cache: Dict[Tuple, Any] = {}
+def memoize(
+    func: Optional[Callable] = None,
+    *,
+    maxsize: Optional[int] = 1024,
+    ttl: Optional[float] = None,
+    policy: str = "lru",
+    maxbytes: Optional[int] = None,
+    name: Optional[str] = None
+) -> Callable:
+    """Custom memoization decorator backed by a bounded, thread-safe cache.
     
-    @wraps(func)
-    def memoized(*args, **kwargs):
-        key = (args, tuple(sorted(kwargs.items())))
-        if key not in cache:
-            cache[key] = func(*args, **kwargs)
-        return cache[key]
+    Use as ``@memoize`` or ``@memoize(maxsize=..., ttl=..., policy="lfu",
+    maxbytes=...)``. Positional calls are keyed by the argument tuple
+    itself; keyword arguments are appended in call order. The function is
+    registered in ``cache_registry`` under ``name`` (default: its
+    qualified name).
+    """
+    def decorate(fn: Callable) -> Callable:
+        cache = BoundedCache(maxsize=maxsize, ttl=ttl, policy=policy, maxbytes=maxbytes)
+        
+        @wraps(fn)
+        def memoized(*args, **kwargs):
+            key = args if not kwargs else args + (_KWARGS_MARK,) + tuple(kwargs.items())
+            result = cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = fn(*args, **kwargs)
+                cache.set(key, result)
+            return result
+        
+        memoized.cache = cache
+        memoized.cache_clear = cache.clear
+        memoized.cache_stats = cache.stats
+        cache_registry.register(name or f"{fn.__module__}.{fn.__qualname__}", memoized)
+        return memoized
     
-    memoized.cache = cache
-    memoized.cache_clear = lambda: cache.clear()
-    return memoized
+    return decorate(func) if func is not None else decorate
 
 
 @memoize
@@ -63,3 +113,8 @@ def expensive_calculation(a: int, b: int) -> int:
     for i in range(1000):
         result += (a * b * i) % 1000
     return result
+
+
+# Report the lru_cache functions alongside the memoized ones
+for _fn in (fibonacci_memo, calculate_cancellation_penalty):
+    cache_registry.register(f"{_fn.__module__}.{_fn.__qualname__}", _fn)
@@ -0,0 +1,291 @@
+"""Composable predicates that run on rows, compile to SQL or to NumPy masks.
+
+A predicate names fields, not columns. The same object filters
+
+- a dict row: ``predicate(row)``;
+- a database query: ``query.where(predicate.to_sql(columns))``, with
+  ``columns`` mapping field names to SQLAlchemy column expressions;
+- columnar arrays: ``predicate.mask(arrays)``, with ``arrays`` mapping field
+  names to equal-length NumPy arrays.
+
+Combine with ``&``, ``|`` and ``~``.
+"""
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Mapping, Optional, Tuple
+import numpy as np
+from sqlalchemy import and_, false, not_, or_, true
+
+
+class Predicate(ABC):
+    """Base predicate; subclasses implement the three evaluation forms."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def __call__(self, row: Mapping) -> bool:
+        """True if ``row`` matches."""
+
+    @abstractmethod
+    def to_sql(self, columns: Mapping[str, Any]):
+        """SQLAlchemy boolean clause over the mapped columns."""
+
+    @abstractmethod
+    def mask(self, arrays: Mapping[str, np.ndarray]) -> np.ndarray:
+        """Boolean array selecting the matching positions."""
+
+    @abstractmethod
+    def fields(self) -> Tuple[str, ...]:
+        """Field names this predicate reads."""
+
+    def __and__(self, other: "Predicate") -> "Predicate":
+        return And(self, other)
+
+    def __or__(self, other: "Predicate") -> "Predicate":
+        return Or(self, other)
+
+    def __invert__(self) -> "Predicate":
+        return Not(self)
+
+
+class _Const(Predicate):
+    """Always true or always false."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: bool):
+        self.value = value
+
+    def __call__(self, row: Mapping) -> bool:
+        return self.value
+
+    def to_sql(self, columns: Mapping[str, Any]):
+        return true() if self.value else false()
+
+    def mask(self, arrays: Mapping[str, np.ndarray]) -> np.ndarray:
+        length = len(next(iter(arrays.values()))) if arrays else 0
+        return np.full(length, self.value, dtype=bool)
+
+    def fields(self) -> Tuple[str, ...]:
+        return ()
+
+    def __repr__(self) -> str:
+        return "ALWAYS" if self.value else "NEVER"
+
+
+ALWAYS = _Const(True)
+NEVER = _Const(False)
+
+
+class Eq(Predicate):
+    """``field == value``; a missing or NULL field never matches."""
+
+    __slots__ = ("field", "value")
+
+    def __init__(self, field: str, value: Any):
+        self.field = field
+        self.value = value
+
+    def __call__(self, row: Mapping) -> bool:
+        current = row.get(self.field)
+        return current is not None and current == self.value
+
+    def to_sql(self, columns: Mapping[str, Any]):
+        return columns[self.field] == self.value
+
+    def mask(self, arrays: Mapping[str, np.ndarray]) -> np.ndarray:
+        return np.asarray(arrays[self.field] == self.value, dtype=bool)
+
+    def fields(self) -> Tuple[str, ...]:
+        return (self.field,)
+
+    def __repr__(self) -> str:
+        return f"Eq({self.field!r}, {self.value!r})"
+
+
+class Between(Predicate):
+    """``low <= field <= high``; a ``None`` bound is open."""
+
+    __slots__ = ("field", "low", "high")
+
+    def __init__(self, field: str, low: Any = None, high: Any = None):
+        self.field = field
+        self.low = low
+        self.high = high
+
+    def __call__(self, row: Mapping) -> bool:
+        current = row.get(self.field)
+        if current is None:
+            return False
+        return (self.low is None or current >= self.low) and (self.high is None or current <= self.high)
+
+    def to_sql(self, columns: Mapping[str, Any]):
+        column = columns[self.field]
+        clauses = [column.isnot(None)]
+        if self.low is not None:
+            clauses.append(column >= self.low)
+        if self.high is not None:
+            clauses.append(column <= self.high)
+        return and_(*clauses)
+
+    def mask(self, arrays: Mapping[str, np.ndarray]) -> np.ndarray:
+        values = arrays[self.field]
+        result = np.ones(len(values), dtype=bool)
+        if self.low is not None:
+            result &= values >= self.low
+        if self.high is not None:
+            result &= values <= self.high
+        return result
+
+    def fields(self) -> Tuple[str, ...]:
+        return (self.field,)
+
+    def __repr__(self) -> str:
+        return f"Between({self.field!r}, {self.low!r}, {self.high!r})"
+
+
+def Ge(field: str, value: Any) -> Between:
+    """``field >= value``."""
+    return Between(field, low=value)
+
+
+def Le(field: str, value: Any) -> Between:
+    """``field <= value``."""
+    return Between(field, high=value)
+
+
+class ContainsAll(Predicate):
+    """Every item is in the field's collection.
+
+    Rows hold a list (or a JSON list string); in SQL the column is JSON
+    text and each item is matched as a quoted element; arrays hold one
+    collection per position.
+    """
+
+    __slots__ = ("field", "items")
+
+    def __init__(self, field: str, items: Iterable[str]):
+        self.field = field
+        self.items = tuple(items)
+
+    @staticmethod
+    def _collection(value) -> Iterable:
+        if value is None:
+            return ()
+        if isinstance(value, str):
+            return json.loads(value) if value else ()
+        return value
+
+    def __call__(self, row: Mapping) -> bool:
+        collection = self._collection(row.get(self.field))
+        return all(item in collection for item in self.items)
+
+    def to_sql(self, columns: Mapping[str, Any]):
+        column = columns[self.field]
+        return and_(true(), *(column.contains(json.dumps(item), autoescape=True) for item in self.items))
+
+    def mask(self, arrays: Mapping[str, np.ndarray]) -> np.ndarray:
+        values = arrays[self.field]
+        wanted = set(self.items)
+        return np.fromiter(
+            (wanted.issubset(self._collection(value)) for value in values),
+            dtype=bool,
+            count=len(values)
+        )
+
+    def fields(self) -> Tuple[str, ...]:
+        return (self.field,)
+
+    def __repr__(self) -> str:
+        return f"ContainsAll({self.field!r}, {self.items!r})"
+
+
+class And(Predicate):
+    """All parts match (an empty And is always true)."""
+
+    __slots__ = ("parts",)
+
+    def __init__(self, *parts: Predicate):
+        # Flatten nested Ands so a long chain stays one level deep
+        self.parts = tuple(
+            sub for part in parts for sub in (part.parts if isinstance(part, And) else (part,))
+        )
+
+    def __call__(self, row: Mapping) -> bool:
+        return all(part(row) for part in self.parts)
+
+    def to_sql(self, columns: Mapping[str, Any]):
+        return and_(true(), *(part.to_sql(columns) for part in self.parts))
+
+    def mask(self, arrays: Mapping[str, np.ndarray]) -> np.ndarray:
+        result = ALWAYS.mask(arrays)
+        for part in self.parts:
+            result &= part.mask(arrays)
+        return result
+
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(f for part in self.parts for f in part.fields()))
+
+    def __repr__(self) -> str:
+        return f"And{self.parts!r}"
+
+
+class Or(Predicate):
+    """Any part matches (an empty Or is always false)."""
+
+    __slots__ = ("parts",)
+
+    def __init__(self, *parts: Predicate):
+        self.parts = tuple(
+            sub for part in parts for sub in (part.parts if isinstance(part, Or) else (part,))
+        )
+
+    def __call__(self, row: Mapping) -> bool:
+        return any(part(row) for part in self.parts)
+
+    def to_sql(self, columns: Mapping[str, Any]):
+        return or_(false(), *(part.to_sql(columns) for part in self.parts))
+
+    def mask(self, arrays: Mapping[str, np.ndarray]) -> np.ndarray:
+        result = NEVER.mask(arrays)
+        for part in self.parts:
+            result |= part.mask(arrays)
+        return result
+
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(f for part in self.parts for f in part.fields()))
+
+    def __repr__(self) -> str:
+        return f"Or{self.parts!r}"
+
+
+class Not(Predicate):
+    """The part does not match."""
+
+    __slots__ = ("part",)
+
+    def __init__(self, part: Predicate):
+        self.part = part
+
+    def __call__(self, row: Mapping) -> bool:
+        return not self.part(row)
+
+    def to_sql(self, columns: Mapping[str, Any]):
+        return not_(self.part.to_sql(columns))
+
+    def mask(self, arrays: Mapping[str, np.ndarray]) -> np.ndarray:
+        return ~self.part.mask(arrays)
+
+    def fields(self) -> Tuple[str, ...]:
+        return self.part.fields()
+
+    def __repr__(self) -> str:
+        return f"Not({self.part!r})"
+
+
+def all_of(predicates: Iterable[Optional[Predicate]]) -> Predicate:
+    """AND of the given predicates, skipping ``None``s."""
+    parts = [p for p in predicates if p is not None]
+    if not parts:
+        return ALWAYS
+    return parts[0] if len(parts) == 1 else And(*parts)
@@ -0,0 +1,391 @@
+"""Read models kept up to date from the event stream.
+
+A projection folds events into a small in-memory state as they are
+published, so dashboard reads are dict lookups instead of aggregations over
+bookings and payments. ``ProjectionSet`` snapshots every projection to one
+JSON file together with a checkpoint - the row id of the newest stored
+event the state includes - and after a restart replays only the events
+stored after it.
+
+Per-booking state is only kept while the booking can still change: once
+the calendar day of the events reaches a booking's checkout, its last night
+is in the past and ``compact`` forgets it, so memory and snapshots grow
+with the bookings in progress rather than with the whole history.
+"""
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional, Tuple
+from core.domain import Event as DomainEvent
+from core.days import Day, to_day
+from core.frp import (
+    parse_stays,
+    EVENT_SEARCH, EVENT_BOOKED, EVENT_CANCELLED, EVENT_PAYMENT
+)
+
+
+class Projection:
+    """One named read model; subclasses fold the events in ``handles``."""
+
+    name: str = ""
+    handles: Tuple[str, ...] = ()
+    # Bump when the snapshot layout changes; older snapshots are then rebuilt
+    version: int = 1
+
+    def apply(self, event: DomainEvent):
+        raise NotImplementedError
+
+    def reset(self):
+        raise NotImplementedError
+
+    def compact(self, today: int):
+        """Forget per-booking state that can no longer change (checkout on or before ``today``)."""
+
+    def snapshot(self) -> Any:
+        """JSON-serializable state."""
+        raise NotImplementedError
+
+    def restore(self, state: Any):
+        raise NotImplementedError
+
+
+def _day_of(ts: str) -> Day:
+    """Calendar day of an ISO timestamp."""
+    return Day(to_day(ts))
+
+
+def _checkout(stays) -> Optional[int]:
+    """Day of the last checkout of a booking's stays."""
+    return max((to_day(checkout) for _, _, checkout, _ in stays), default=None)
+
+
+class OccupancyProjection(Projection):
+    """Rooms booked per hotel per night.
+
+    BOOKED events carry ``hotel_stays`` (format_stays with the hotel id in
+    the first slot); the stays are remembered per booking so a CANCELLED
+    event, which only names the booking, can give the nights back - until
+    the stay is over.
+    """
+
+    name = "occupancy"
+    handles = (EVENT_BOOKED, EVENT_CANCELLED)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.rooms: Dict[Tuple[int, int], int] = defaultdict(int)
+        self.bookings: Dict[int, Tuple[Tuple[int, str, str, int], ...]] = {}
+
+    def _add(self, stays, sign: int):
+        for hotel_id, checkin, checkout, rooms in stays:
+            for day in range(to_day(checkin), to_day(checkout)):
+                key = (hotel_id, day)
+                self.rooms[key] += sign * rooms
+                if not self.rooms[key]:
+                    del self.rooms[key]
+
+    def apply(self, event: DomainEvent):
+        payload = dict(event.payload)
+        booking_id = int(payload["booking_id"])
+        if event.name == EVENT_BOOKED:
+            stays = parse_stays(payload.get("hotel_stays", ""))
+            self.bookings[booking_id] = stays
+            self._add(stays, 1)
+        else:
+            self._add(self.bookings.pop(booking_id, ()), -1)
+
+    def compact(self, today: int):
+        # Bookings without stays have nothing to give back either
+        for booking_id in [b for b, stays in self.bookings.items() if (_checkout(stays) or 0) <= today]:
+            del self.bookings[booking_id]
+
+    def rooms_booked(self, hotel_id: int, night) -> int:
+        """Rooms of the hotel booked for the night."""
+        return self.rooms.get((hotel_id, to_day(night)), 0)
+
+    def snapshot(self) -> Any:
+        return {
+            "rooms": [[hotel_id, day, rooms] for (hotel_id, day), rooms in self.rooms.items()],
+            "bookings": [[booking_id, [list(s) for s in stays]] for booking_id, stays in self.bookings.items()],
+        }
+
+    def restore(self, state: Any):
+        self.reset()
+        for hotel_id, day, rooms in state["rooms"]:
+            self.rooms[(hotel_id, day)] = rooms
+        for booking_id, stays in state["bookings"]:
+            self.bookings[booking_id] = tuple(tuple(s) for s in stays)
+
+
+class RevenueProjection(Projection):
+    """Money taken per calendar day.
+
+    A PAYMENT (with ``amount``) counts on the day it was made; cancelling a
+    paid booking refunds the amount minus the ``penalty`` on the day of the
+    cancellation. BOOKED only records the checkout, after which the paid
+    amount is forgotten.
+    """
+
+    name = "revenue"
+    handles = (EVENT_BOOKED, EVENT_PAYMENT, EVENT_CANCELLED)
+    version = 2
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.by_day: Dict[int, int] = defaultdict(int)
+        self.paid: Dict[int, int] = {}
+        self.checkouts: Dict[int, int] = {}
+        self.total = 0
+
+    def _book(self, day: int, amount: int):
+        self.by_day[day] += amount
+        self.total += amount
+
+    def apply(self, event: DomainEvent):
+        payload = dict(event.payload)
+        booking_id = int(payload["booking_id"])
+        day = _day_of(event.ts)
+        if event.name == EVENT_BOOKED:
+            checkout = _checkout(parse_stays(payload.get("hotel_stays", "")))
+            if checkout is not None:
+                self.checkouts[booking_id] = checkout
+        elif event.name == EVENT_PAYMENT:
+            amount = int(payload.get("amount", 0))
+            self.paid[booking_id] = self.paid.get(booking_id, 0) + amount
+            self._book(day, amount)
+        else:
+            self.checkouts.pop(booking_id, None)
+            if booking_id in self.paid:
+                refund = self.paid.pop(booking_id) - int(payload.get("penalty", 0))
+                self._book(day, -max(0, refund))
+
+    def compact(self, today: int):
+        for booking_id in [b for b, checkout in self.checkouts.items() if checkout <= today]:
+            del self.checkouts[booking_id]
+            self.paid.pop(booking_id, None)
+
+    def revenue_on(self, day) -> int:
+        """Net revenue of one calendar day."""
+        return self.by_day.get(to_day(day), 0)
+
+    def snapshot(self) -> Any:
+        return {
+            "by_day": [[day, amount] for day, amount in self.by_day.items()],
+            "paid": [[booking_id, amount] for booking_id, amount in self.paid.items()],
+            "checkouts": [[booking_id, day] for booking_id, day in self.checkouts.items()],
+            "total": self.total,
+        }
+
+    def restore(self, state: Any):
+        self.reset()
+        self.by_day.update((day, amount) for day, amount in state["by_day"])
+        self.paid.update((booking_id, amount) for booking_id, amount in state["paid"])
+        self.checkouts.update((booking_id, day) for booking_id, day in state["checkouts"])
+        self.total = state["total"]
+
+
+class DemandProjection(Projection):
+    """Searches per city, and per city per night searched for.
+
+    Only upcoming nights are counted: stays longer than ``max_nights`` and
+    nights more than ``horizon`` days after the search count towards the
+    city alone, and ``compact`` forgets nights that are over. At most
+    ``max_cities`` cities are tracked, so free-form city names cannot grow
+    the state without bound.
+    """
+
+    name = "demand"
+    handles = (EVENT_SEARCH,)
+    version = 2
+
+    def __init__(self, max_nights: int = 30, horizon: int = 366, max_cities: int = 1000):
+        self.max_nights = max_nights
+        self.horizon = horizon
+        self.max_cities = max_cities
+        self.reset()
+
+    def reset(self):
+        self.by_city: Dict[str, int] = defaultdict(int)
+        self.by_city_night: Dict[Tuple[str, int], int] = defaultdict(int)
+
+    @staticmethod
+    def _city(city: str) -> str:
+        return city.strip().casefold()
+
+    def apply(self, event: DomainEvent):
+        payload = dict(event.payload)
+        city = self._city(payload.get("city", ""))
+        if city not in self.by_city and len(self.by_city) >= self.max_cities:
+            return
+        self.by_city[city] += 1
+        try:
+            start, end = to_day(payload["checkin"]), to_day(payload["checkout"])
+        except (KeyError, ValueError):
+            return
+        if end - start > self.max_nights:
+            return
+        today = _day_of(event.ts)
+        for day in range(max(start, today), min(end, today + self.horizon)):
+            self.by_city_night[(city, day)] += 1
+
+    def compact(self, today: int):
+        for key in [key for key in self.by_city_night if key[1] < today]:
+            del self.by_city_night[key]
+
+    def searches(self, city: str) -> int:
+        """Searches for the city (case-insensitive)."""
+        return self.by_city.get(self._city(city), 0)
+
+    def searches_for_night(self, city: str, night) -> int:
+        """Searches for the city whose stay includes the night."""
+        return self.by_city_night.get((self._city(city), to_day(night)), 0)
+
+    def snapshot(self) -> Any:
+        return {
+            "by_city": dict(self.by_city),
+            "by_city_night": [[city, day, count] for (city, day), count in self.by_city_night.items()],
+        }
+
+    def restore(self, state: Any):
+        self.reset()
+        self.by_city.update(state["by_city"])
+        for city, day, count in state["by_city_night"]:
+            self.by_city_night[(city, day)] = count
+
+
+class ProjectionSet:
+    """Named projections fed from one event bus, snapshotted together.
+
+    ``checkpoint`` is the row id of the newest stored event in the state;
+    replaying skips events at or below it, so a snapshot plus the events
+    table after the checkpoint rebuilds the same state. Row ids only grow,
+    unlike timestamps, which events of one burst can share. Live events are
+    published before the event sink stores them and carry no id, so they
+    leave the checkpoint alone; ``save`` is given the id the state matches
+    once they are stored. Projections are compacted whenever the events
+    reach a new calendar day.
+    """
+
+    def __init__(self, *projections: Projection):
+        self._lock = threading.Lock()
+        self._projections: Dict[str, Projection] = {p.name: p for p in projections}
+        self.checkpoint: Optional[int] = None
+        self.applied = 0
+        self._day: Optional[int] = None
+
+    def __getitem__(self, name: str) -> Projection:
+        return self._projections[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._projections
+
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self._projections)
+
+    def apply(self, event: DomainEvent):
+        """Fold one event into every projection that handles it."""
+        with self._lock:
+            for projection in self._projections.values():
+                if event.name in projection.handles:
+                    try:
+                        projection.apply(event)
+                    except (KeyError, ValueError) as e:
+                        print(f"Error in projection {projection.name}: {e}")
+            day = to_day(event.ts)
+            if self._day is None or day > self._day:
+                self._day = day
+                for projection in self._projections.values():
+                    projection.compact(day)
+            if event.id and (self.checkpoint is None or event.id > self.checkpoint):
+                self.checkpoint = event.id
+            self.applied += 1
+
+    def replay(self, events: Iterable[DomainEvent]) -> int:
+        """Apply stored events after the checkpoint, in row id order; returns the count."""
+        since = self.checkpoint
+        count = 0
+        for event in events:
+            if since is not None and event.id <= since:
+                continue
+            self.apply(event)
+            count += 1
+        return count
+
+    def subscribe(self, bus):
+        """Apply every event the projections handle as it is published."""
+        names = {name for p in self._projections.values() for name in p.handles}
+        for name in sorted(names):
+            bus.subscribe(name, self.apply)
+
+    def reset(self):
+        with self._lock:
+            for projection in self._projections.values():
+                projection.reset()
+            self.checkpoint = None
+            self.applied = 0
+            self._day = None
+
+    def save(self, path: str, checkpoint: Optional[int] = None):
+        """Write an atomic snapshot of every projection and the checkpoint.
+
+        ``checkpoint``, if given, is the newest stored event id the state
+        now includes: every applied event is stored at or below it and none
+        above it was applied.
+        """
+        with self._lock:
+            if checkpoint is not None:
+                self.checkpoint = checkpoint
+            document = {
+                "checkpoint": self.checkpoint,
+                "projections": {
+                    name: {"version": p.version, "state": p.snapshot()}
+                    for name, p in self._projections.items()
+                },
+            }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(document, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def load(self, path: str) -> bool:
+        """Restore from a snapshot; False (state reset) if it is missing or stale."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                document = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.reset()
+            return False
+        stored = document.get("projections", {})
+        checkpoint = document.get("checkpoint")
+        if checkpoint is not None and type(checkpoint) is not int:
+            # Checkpointed on event timestamps by an older release
+            self.reset()
+            return False
+        if any(
+            name not in stored or stored[name].get("version") != p.version
+            for name, p in self._projections.items()
+        ):
+            # A projection is new or changed shape: rebuild everything from events
+            self.reset()
+            return False
+        with self._lock:
+            for name, p in self._projections.items():
+                p.restore(stored[name]["state"])
+            self.checkpoint = checkpoint
+            self._day = None
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"checkpoint": self.checkpoint, "applied": self.applied, "projections": list(self._projections)}
+
+
+# Global read models
+projections = ProjectionSet(OccupancyProjection(), RevenueProjection(), DemandProjection())
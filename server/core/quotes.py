@@ -0,0 +1,167 @@
+"""Prefix-sum price tables - O(1) stay quotes by day ordinal."""
+import threading
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+import numpy as np
+from core.days import to_day
+
+
+def to_days(values: Sequence) -> np.ndarray:
+    """Vector of day ordinals from ISO strings, dates or ordinals."""
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iu":
+        return values.astype(np.int64, copy=False)
+    return np.fromiter((to_day(v) for v in values), dtype=np.int64, count=len(values))
+
+
+class PriceTable:
+    """Per-rate cumulative price arrays.
+
+    ``cumulative[row, j]`` is the sum of the nightly prices of the rate in
+    ``rate_rows`` over days ``origin .. origin + j - 1``, so a stay ``[start, end)``
+    costs ``cumulative[row, end - origin] - cumulative[row, start - origin]``.
+    ``priced`` holds the same prefix count of nights that have a price, which
+    tells a complete quote from one with gaps.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.origin = 0
+        self.rate_rows: Dict[int, int] = {}
+        self.cumulative = np.zeros((0, 1), dtype=np.int64)
+        self.priced = np.zeros((0, 1), dtype=np.int32)
+
+    @property
+    def days(self) -> int:
+        """Number of day columns."""
+        return self.cumulative.shape[1] - 1
+
+    def load(self, price_rows: Iterable[Tuple[int, str, int]]):
+        """Build the table from (rate_id, date, amount) rows."""
+        rows_in = [(rate, to_day(d), amount) for rate, d, amount in price_rows]
+        with self._lock:
+            origin = min(d for _, d, _ in rows_in) if rows_in else 0
+            days = (max(d for _, d, _ in rows_in) - origin + 1) if rows_in else 0
+            rate_rows = {rate: i for i, rate in enumerate(sorted({rate for rate, _, _ in rows_in}))}
+
+            amounts = np.zeros((len(rate_rows), days), dtype=np.int64)
+            present = np.zeros((len(rate_rows), days), dtype=np.int32)
+            if rows_in:
+                n = len(rows_in)
+                rows = np.fromiter((rate_rows[r] for r, _, _ in rows_in), dtype=np.intp, count=n)
+                cols = np.fromiter((d - origin for _, d, _ in rows_in), dtype=np.intp, count=n)
+                amounts[rows, cols] = np.fromiter((a for _, _, a in rows_in), dtype=np.int64, count=n)
+                present[rows, cols] = 1
+
+            self.origin = origin
+            self.rate_rows = rate_rows
+            self.cumulative = self._prefix(amounts)
+            self.priced = self._prefix(present)
+
+    @staticmethod
+    def _prefix(values: np.ndarray) -> np.ndarray:
+        """Row-wise prefix sums with a leading zero column."""
+        result = np.zeros((values.shape[0], values.shape[1] + 1), dtype=values.dtype)
+        np.cumsum(values, axis=1, out=result[:, 1:])
+        return result
+
+    # Quotes
+
+    def quote(self, rate_id: int, start, end, require_priced: bool = True) -> Optional[int]:
+        """Total for the nights [start, end): one subtraction.
+
+        Returns None if the stay has an unpriced night (or with
+        ``require_priced=False``, counts unpriced nights as zero).
+        """
+        start, end = to_day(start), to_day(end)
+        with self._lock:
+            row = self.rate_rows.get(rate_id)
+            lo, hi = start - self.origin, end - self.origin
+            if row is None or lo < 0 or hi > self.days or lo >= hi:
+                return None if require_priced else 0
+            if require_priced and self.priced[row, hi] - self.priced[row, lo] != hi - lo:
+                return None
+            return int(self.cumulative[row, hi] - self.cumulative[row, lo])
+
+    def quote_batch(
+        self,
+        rate_ids: Sequence[int],
+        starts: Sequence,
+        ends: Sequence
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Quote many (rate, checkin, checkout) triples at once: (totals, complete_mask)."""
+        starts, ends = to_days(starts), to_days(ends)
+        with self._lock:
+            rows = np.fromiter(
+                (self.rate_rows.get(r, -1) for r in rate_ids), dtype=np.intp, count=len(rate_ids)
+            )
+            lo = starts - self.origin
+            hi = ends - self.origin
+            valid = (rows >= 0) & (lo >= 0) & (hi <= self.days) & (lo < hi)
+            safe_rows = np.where(valid, rows, 0)
+            safe_lo = np.where(valid, lo, 0)
+            safe_hi = np.where(valid, hi, 0)
+            if len(self.rate_rows) == 0:
+                zeros = np.zeros(len(rows), dtype=np.int64)
+                return zeros, np.zeros(len(rows), dtype=bool)
+            totals = self.cumulative[safe_rows, safe_hi] - self.cumulative[safe_rows, safe_lo]
+            nights = self.priced[safe_rows, safe_hi] - self.priced[safe_rows, safe_lo]
+            totals = np.where(valid, totals, 0)
+            complete = valid & (nights == (hi - lo))
+            return totals, complete
+
+    # Updates
+
+    def _ensure_days(self, start: int, end: int):
+        """Grow the day axis so that [start, end) is covered."""
+        if self.days == 0 and not self.rate_rows:
+            self.origin = start
+        pad_left = max(0, self.origin - start)
+        pad_right = max(0, end - (self.origin + self.days))
+        if pad_left:
+            # Nights before the old origin are unpriced: prefix sums start at zero
+            self.cumulative = np.pad(self.cumulative, ((0, 0), (pad_left, 0)))
+            self.priced = np.pad(self.priced, ((0, 0), (pad_left, 0)))
+            self.origin -= pad_left
+        if pad_right:
+            # Nights after the old end are unpriced: prefix sums stay flat
+            self.cumulative = np.pad(self.cumulative, ((0, 0), (0, pad_right)), mode="edge")
+            self.priced = np.pad(self.priced, ((0, 0), (0, pad_right)), mode="edge")
+
+    def _rate_row(self, rate_id: int) -> int:
+        """Row of a rate, appending an unpriced row if unknown."""
+        row = self.rate_rows.get(rate_id)
+        if row is None:
+            row = len(self.rate_rows)
+            self.rate_rows[rate_id] = row
+            width = self.days + 1
+            self.cumulative = np.vstack([self.cumulative, np.zeros((1, width), dtype=np.int64)])
+            self.priced = np.vstack([self.priced, np.zeros((1, width), dtype=np.int32)])
+        return row
+
+    def price_of(self, rate_id: int, day) -> Optional[int]:
+        """Price of one night, or None if unpriced."""
+        day = to_day(day)
+        with self._lock:
+            row = self.rate_rows.get(rate_id)
+            j = day - self.origin
+            if row is None or j < 0 or j >= self.days:
+                return None
+            if self.priced[row, j + 1] == self.priced[row, j]:
+                return None
+            return int(self.cumulative[row, j + 1] - self.cumulative[row, j])
+
+    def set_price(self, rate_id: int, day, amount: int):
+        """Change one night's price by shifting the suffix of the prefix sums.
+
+        Only ``cumulative[row, j+1:]`` (and ``priced`` if the night was
+        unpriced) is touched - a vectorized add, no rebuild.
+        """
+        day = to_day(day)
+        with self._lock:
+            self._ensure_days(day, day + 1)
+            row = self._rate_row(rate_id)
+            j = day - self.origin
+            old = int(self.cumulative[row, j + 1] - self.cumulative[row, j])
+            was_priced = self.priced[row, j + 1] != self.priced[row, j]
+            self.cumulative[row, j + 1:] += amount - old
+            if not was_priced:
+                self.priced[row, j + 1:] += 1
@@ -0,0 +1,138 @@
+"""Run-length encoded rates - one interval per span of nights at one price.
+
+A rate plan's prices are mostly constant for weeks at a time, so instead of
+one row per night they are stored as half-open intervals ``[start, end)`` of
+day ordinals with one amount. Intervals of one rate never overlap, and
+neighbours with the same amount and currency are always merged, so the
+encoding of a price calendar is unique.
+
+``RateSchedule`` answers nightly and stay lookups with a binary search over
+the sorted interval starts; ``expand_prices`` is the adapter back to the
+per-night ``Price`` shape.
+"""
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from core.domain import Price
+from core.days import Day
+
+
+class RateRun(NamedTuple):
+    """Nights ``start`` (inclusive) to ``end`` (exclusive) at one amount."""
+    start: int
+    end: int
+    amount: int
+    currency: str = "UZS"
+
+    @property
+    def nights(self) -> int:
+        return self.end - self.start
+
+
+def _same_price(a: RateRun, b: RateRun) -> bool:
+    return a.amount == b.amount and a.currency == b.currency
+
+
+def merge_runs(runs: Iterable[RateRun]) -> List[RateRun]:
+    """Sort non-overlapping runs and merge touching ones with the same price."""
+    merged: List[RateRun] = []
+    for run in sorted(runs):
+        if run.end <= run.start:
+            continue
+        if merged and merged[-1].end == run.start and _same_price(merged[-1], run):
+            merged[-1] = merged[-1]._replace(end=run.end)
+        else:
+            merged.append(run)
+    return merged
+
+
+def encode_runs(nights: Iterable[Tuple[int, int, str]]) -> List[RateRun]:
+    """Run-length encode (day, amount, currency) nights; a later night wins a duplicate day."""
+    by_day = {day: (amount, currency) for day, amount, currency in nights}
+    return merge_runs(RateRun(day, day + 1, amount, currency) for day, (amount, currency) in by_day.items())
+
+
+def clear_range(runs: Sequence[RateRun], start: int, end: int) -> List[RateRun]:
+    """Leave nights ``[start, end)`` unpriced, splitting the runs it cuts."""
+    kept: List[RateRun] = []
+    for run in runs:
+        if run.end <= start or run.start >= end:
+            kept.append(run)
+            continue
+        # Keep the parts of an overlapped run that stick out on either side
+        if run.start < start:
+            kept.append(run._replace(end=start))
+        if run.end > end:
+            kept.append(run._replace(start=end))
+    return merge_runs(kept)
+
+
+def set_range(runs: Sequence[RateRun], start: int, end: int, amount: int, currency: str = "UZS") -> List[RateRun]:
+    """Price nights ``[start, end)`` at ``amount``, merging with equal neighbours."""
+    if end <= start:
+        raise ValueError("end must be after start")
+    return merge_runs(clear_range(runs, start, end) + [RateRun(start, end, amount, currency)])
+
+
+class RateSchedule:
+    """Sorted runs of one rate with O(log n) lookups."""
+
+    __slots__ = ("runs", "_starts")
+
+    def __init__(self, runs: Iterable[RateRun] = ()):
+        self.runs: Tuple[RateRun, ...] = tuple(merge_runs(runs))
+        self._starts = [run.start for run in self.runs]
+
+    def __len__(self) -> int:
+        return len(self.runs)
+
+    def _find(self, day: int) -> int:
+        """Position of the run that could contain ``day`` (-1 if none starts by then)."""
+        return bisect_right(self._starts, day) - 1
+
+    def run_at(self, day: int) -> Optional[RateRun]:
+        i = self._find(day)
+        if i >= 0 and day < self.runs[i].end:
+            return self.runs[i]
+        return None
+
+    def amount_on(self, day: int) -> Optional[int]:
+        """Price of one night, or None if it is not priced."""
+        run = self.run_at(day)
+        return run.amount if run is not None else None
+
+    def overlapping(self, start: int, end: int) -> Iterator[RateRun]:
+        """Runs clipped to ``[start, end)``, in order."""
+        i = max(0, self._find(start))
+        while i < len(self.runs) and self.runs[i].start < end:
+            run = self.runs[i]
+            if run.end > start:
+                yield run._replace(start=max(run.start, start), end=min(run.end, end))
+            i += 1
+
+    def stay_total(self, start: int, end: int, require_priced: bool = True) -> Optional[int]:
+        """Sum over the nights ``[start, end)``; None if one is unpriced and ``require_priced``."""
+        total = nights = 0
+        for run in self.overlapping(start, end):
+            total += run.amount * run.nights
+            nights += run.nights
+        if require_priced and nights < end - start:
+            return None
+        return total
+
+    def nights(self, start: int, end: int) -> Iterator[Tuple[int, int, str]]:
+        """(day, amount, currency) of every priced night in ``[start, end)``."""
+        for run in self.overlapping(start, end):
+            for day in range(run.start, run.end):
+                yield day, run.amount, run.currency
+
+
+def expand_prices(rate_id: int, runs: Iterable[RateRun], start: int = None, end: int = None) -> Iterator[Price]:
+    """Per-night ``Price`` entities of a rate's runs, optionally limited to ``[start, end)``.
+
+    Expanded prices have no row of their own; ``id`` is 0.
+    """
+    for run in merge_runs(runs):
+        low = run.start if start is None else max(run.start, start)
+        high = run.end if end is None else min(run.end, end)
+        for day in range(low, high):
+            yield Price(id=0, rate_id=rate_id, date=Day(day).isoformat(), amount=run.amount, currency=run.currency)
@@ -1,87 +1,155 @@
-"""Recursive functions."""
-from datetime import datetime, timedelta
-from typing import Tuple, List, Any, TypeVar
+"""Recursive functions - stack-safe.
+
+Tail-recursive definitions run through ``trampoline``: a step returns
+``tail_call(step, ...)`` instead of calling itself, and the trampoline loops
+until a plain value comes back, so depth costs no stack. Tree walks keep an
+explicit stack of iterators. Every function is linear in its input and has
+an ``iter_*`` generator variant that streams results without building
+intermediate tuples.
+"""
+from functools import wraps
+from typing import Any, Callable, Iterator, List, Tuple, TypeVar
+from core.days import Day, to_day
 
 T = TypeVar('T')
 
 
+class TailCall:
+    """A deferred call returned from a trampolined step."""
+    __slots__ = ("fn", "args", "kwargs")
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+
+def tail_call(fn: Callable, *args, **kwargs) -> TailCall:
+    """Ask the trampoline to call ``fn(*args, **kwargs)`` next."""
+    return TailCall(fn, args, kwargs)
+
+
+def trampoline(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Run ``fn`` and every tail call it returns in a loop, in constant stack.
+
+    Inside the step, recurse with ``tail_call(step, ...)`` on the undecorated
+    function (available as ``decorated.__wrapped__``).
+    """
+    @wraps(fn)
+    def run(*args, **kwargs):
+        result = fn(*args, **kwargs)
+        while isinstance(result, TailCall):
+            result = result.fn(*result.args, **result.kwargs)
+        return result
+    return run
+
+
+def iter_date_range(start_date: str, end_date: str) -> Iterator[str]:
+    """Yield the nights from start_date up to (not including) end_date."""
+    for day in range(to_day(start_date), to_day(end_date)):
+        yield Day(day).isoformat()
+
+
 def split_date_range(start_date: str, end_date: str) -> Tuple[str, ...]:
-    """Recursively split date range into individual dates."""
-    start = datetime.fromisoformat(start_date)
-    end = datetime.fromisoformat(end_date)
-    
-    def _split_helper(current: datetime, end: datetime, acc: List[str]) -> Tuple[str, ...]:
-        if current > end:
+    """Recursively split date range into individual dates.
+
+    The range is half-open: the checkout day is not a night of the stay.
+    """
+    def _split_helper(current: int, end: int, acc: List[str]):
+        if current >= end:
             return tuple(acc)
-        acc.append(current.date().isoformat())
-        return _split_helper(current + timedelta(days=1), end, acc)
-    
-    return _split_helper(start, end, [])
+        acc.append(Day(current).isoformat())
+        return tail_call(_split_helper, current + 1, end, acc)
+
+    return trampoline(_split_helper)(to_day(start_date), to_day(end_date), [])
+
+
+def iter_flatten(nested: Tuple) -> Iterator[Any]:
+    """Yield the leaves of a nested tuple in order."""
+    stack = [iter(nested)]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, tuple):
+                stack.append(iter(item))
+                break
+            yield item
+        else:
+            stack.pop()
 
 
 def flatten_tuple(nested: Tuple) -> Tuple:
     """Recursively flatten nested tuples."""
-    result = []
-    for item in nested:
-        if isinstance(item, tuple):
-            result.extend(flatten_tuple(item))
-        else:
-            result.append(item)
-    return tuple(result)
+    return tuple(iter_flatten(nested))
+
+
+def iter_filter_leaves(predicate, tree: Tuple) -> Iterator[Any]:
+    """Yield the leaves that satisfy predicate, in order."""
+    return (item for item in iter_flatten(tree) if predicate(item))
 
 
 def filter_tree(predicate, tree: Tuple) -> Tuple:
     """Recursively filter tree structure."""
-    result = []
-    for item in tree:
-        if isinstance(item, tuple):
-            filtered = filter_tree(predicate, item)
-            if filtered:
-                result.append(filtered)
-        elif predicate(item):
-            result.append(item)
-    return tuple(result)
+    root: List[Any] = []
+    # Frames: (children still to visit, kept items, parent's kept items)
+    stack = [(iter(tree), root, None)]
+    while stack:
+        children, kept, parent = stack[-1]
+        for item in children:
+            if isinstance(item, tuple):
+                stack.append((iter(item), [], kept))
+                break
+            if predicate(item):
+                kept.append(item)
+        else:
+            stack.pop()
+            if parent is not None and kept:
+                parent.append(tuple(kept))
+    return tuple(root)
+
+
+def iter_subtrees(tree: Tuple) -> Iterator[Tuple[Tuple, int]]:
+    """Yield every tuple node with its nesting level (the root is level 1)."""
+    stack = [(tree, 1)]
+    while stack:
+        node, level = stack.pop()
+        yield node, level
+        stack.extend((item, level + 1) for item in reversed(node) if isinstance(item, tuple))
 
 
 def max_depth(tree: Tuple) -> int:
     """Calculate maximum depth of nested tuple."""
     if not tree:
         return 0
-    
-    def _max_depth_helper(item) -> int:
-        if not isinstance(item, tuple):
-            return 0
-        if not item:
-            return 1
-        return 1 + max(_max_depth_helper(sub) for sub in item)
-    
-    return _max_depth_helper(tree)
+    return max(level for _, level in iter_subtrees(tree))
 
 
 def count_leaves(tree: Tuple) -> int:
     """Count leaf nodes in tree."""
-    if not tree:
-        return 0
-    
-    def _count_helper(item) -> int:
-        if not isinstance(item, tuple):
-            return 1
-        if not item:
-            return 0
-        return sum(_count_helper(sub) for sub in item)
-    
-    return _count_helper(tree)
+    return sum(1 for _ in iter_flatten(tree))
 
 
 def sum_recursive(numbers: Tuple[int, ...]) -> int:
     """Recursive sum of numbers."""
-    if not numbers:
-        return 0
-    return numbers[0] + sum_recursive(numbers[1:])
+    def _sum_helper(i: int, acc: int):
+        if i == len(numbers):
+            return acc
+        return tail_call(_sum_helper, i + 1, acc + numbers[i])
+
+    return trampoline(_sum_helper)(0, 0)
+
+
+def iter_reversed(items: Tuple[T, ...]) -> Iterator[T]:
+    """Yield items from last to first."""
+    for i in range(len(items) - 1, -1, -1):
+        yield items[i]
 
 
 def reverse_recursive(items: Tuple[T, ...]) -> Tuple[T, ...]:
     """Recursively reverse tuple."""
-    if not items:
-        return ()
-    return reverse_recursive(items[1:]) + (items[0],)
+    def _reverse_helper(i: int, acc: List[T]):
+        if i < 0:
+            return tuple(acc)
+        acc.append(items[i])
+        return tail_call(_reverse_helper, i - 1, acc)
+
+    return trampoline(_reverse_helper)(len(items) - 1, [])
@@ -0,0 +1,75 @@
+"""Range-minimum queries - row-wise segment trees over NumPy arrays."""
+import numpy as np
+
+
+class RangeMinTree:
+    """Iterative segment trees for the minimum of every row of a 2-D array.
+
+    All rows share one layout: leaves live at ``tree[:, size + i]`` and node
+    ``k`` covers its children ``2k`` and ``2k + 1``. A query walks the same
+    O(log n) nodes for every row, so answering many rows over the same range
+    costs O(log n) vectorized steps.
+    """
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values)
+        self.rows, self.n = values.shape
+        self.size = 1
+        while self.size < max(self.n, 1):
+            self.size *= 2
+        self.tree = np.zeros((self.rows, 2 * self.size), dtype=values.dtype)
+        self.tree[:, self.size:self.size + self.n] = values
+        self._rebuild(self.size, self.size + self.n)
+
+    @property
+    def values(self) -> np.ndarray:
+        """Leaf values (a view)."""
+        return self.tree[:, self.size:self.size + self.n]
+
+    def _rebuild(self, lo: int, hi: int, row=slice(None)):
+        """Recompute the ancestors of tree positions [lo, hi), level by level."""
+        while lo > 1:
+            lo, hi = lo // 2, (hi + 1) // 2
+            self.tree[row, lo:hi] = np.minimum(
+                self.tree[row, 2 * lo:2 * hi:2],
+                self.tree[row, 2 * lo + 1:2 * hi:2]
+            )
+
+    def _collect(self, lo: int, hi: int):
+        """Tree nodes that exactly cover the leaves [lo, hi)."""
+        nodes = []
+        lo += self.size
+        hi += self.size
+        while lo < hi:
+            if lo & 1:
+                nodes.append(lo)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                nodes.append(hi)
+            lo //= 2
+            hi //= 2
+        return nodes
+
+    def query(self, row: int, lo: int, hi: int) -> int:
+        """Minimum of row over leaves [lo, hi) in O(log n)."""
+        return int(self.tree[row, self._collect(lo, hi)].min())
+
+    def query_rows(self, rows: np.ndarray, lo: int, hi: int) -> np.ndarray:
+        """Minimum over leaves [lo, hi) for many rows at once."""
+        nodes = self._collect(lo, hi)
+        return self.tree[np.asarray(rows)[:, None], nodes].min(axis=1)
+
+    def update(self, row: int, i: int, value):
+        """Set one leaf and fix its O(log n) ancestors."""
+        k = self.size + i
+        self.tree[row, k] = value
+        k //= 2
+        while k >= 1:
+            self.tree[row, k] = min(self.tree[row, 2 * k], self.tree[row, 2 * k + 1])
+            k //= 2
+
+    def add(self, row: int, lo: int, hi: int, delta):
+        """Add ``delta`` to leaves [lo, hi) and fix the ancestors of that span."""
+        self.tree[row, self.size + lo:self.size + hi] += delta
+        self._rebuild(self.size + lo, self.size + hi, row)
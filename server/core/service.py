@@ -1,15 +1,17 @@
 """Service facades - composition of pure functions."""
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional, Sequence
+import numpy as np
 from core.domain import Hotel, SearchOffer
+from core.days import DateRange
+from core.quotes import PriceTable
 from core.transforms import (
     filter_hotels_by_city,
     filter_hotels_by_stars,
-    sort_by_price,
-    filter_available_offers,
     take
 )
-from core.compose import compose, pipe
+from core.compose import compose, pipe, fuse, filter_stage, sort_stage
 from core.lazy import lazy_search_offers
+from core.topk import top_k, search_offer_key
 import itertools
 
 
@@ -72,16 +74,38 @@ class QuoteService:
         rate_id: int,
         checkin: str,
         checkout: str,
-        prices_map: dict
+        prices_map: dict,
+        table: Optional[PriceTable] = None
     ) -> int:
-        """Calculate quote for a rate and date range."""
-        from core.recursion import split_date_range
+        """Calculate quote for a rate and date range.
+        
+        With a prefix-sum ``table`` the quote is one subtraction over the
+        nights [checkin, checkout); unpriced nights count as zero, as with
+        ``prices_map`` ((rate_id, day ordinal) -> amount).
+        """
+        if table is not None:
+            return table.quote(rate_id, checkin, checkout, require_priced=False)
+        
         from core.transforms import fold_left
         
-        dates = split_date_range(checkin, checkout)
-        prices = tuple(prices_map.get((rate_id, date), 0) for date in dates)
+        nights = DateRange.parse(checkin, checkout).ordinals()
+        prices = tuple(prices_map.get((rate_id, day), 0) for day in nights)
         return fold_left(lambda acc, price: acc + price, 0, prices)
     
+    @staticmethod
+    def quote_batch(
+        table: PriceTable,
+        rate_ids: Sequence[int],
+        checkins: Sequence,
+        checkouts: Sequence
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Quote many (rate, checkin, checkout) triples at once.
+        
+        Returns (totals, complete) arrays; ``complete`` is False where a
+        stay has an unpriced night or falls outside the table.
+        """
+        return table.quote_batch(rate_ids, checkins, checkouts)
+    
     @staticmethod
     def compare_offers(offers: Tuple[SearchOffer, ...]) -> Dict[str, Any]:
         """Compare offers and return statistics."""
@@ -140,16 +164,28 @@ class FilterService:
         min_price: int = 0,
         max_price: int = float('inf'),
         min_stars: int = 0,
-        sort_by: str = "price"
+        sort_by: str = "price",
+        limit: Optional[int] = None,
+        after: Optional[Tuple] = None,
+        nights: int = 1
     ) -> Tuple[SearchOffer, ...]:
-        """Apply multiple filters to offers."""
-        # Compose filter pipeline
-        pipeline = pipe(
-            lambda offers: tuple(o for o in offers if o.total_price >= min_price),
-            lambda offers: tuple(o for o in offers if o.total_price <= max_price),
-            lambda offers: tuple(o for o in offers if o.hotel.stars >= min_stars),
-            lambda offers: filter_available_offers(offers),
-            lambda offers: sort_by_price(offers) if sort_by == "price" else offers
+        """Apply multiple filters to offers.
+        
+        With ``limit`` only the best ``limit`` offers by ``sort_by`` ("price",
+        "stars" or "price_per_night") are kept in a bounded heap instead of
+        sorting everything; ``after`` is the key of the last offer of the
+        previous page.
+        """
+        stages = (
+            filter_stage(lambda o: min_price <= o.total_price <= max_price),
+            filter_stage(lambda o: o.hotel.stars >= min_stars),
+            filter_stage(lambda o: o.available),
         )
+        if limit is not None:
+            candidates = fuse(*stages)(offers)
+            return tuple(top_k(candidates, limit, search_offer_key(sort_by, nights), after))
         
-        return pipeline(offers)
+        # Filters and the sort run as one fused pass with a single result tuple
+        if sort_by == "price":
+            stages += (sort_stage(key=lambda o: o.total_price),)
+        return pipe(*stages)(offers)
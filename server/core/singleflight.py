@@ -0,0 +1,109 @@
+"""Single-flight request coalescing - one computation per key at a time."""
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    """One in-flight computation that other threads can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait and receive the same result or exception.
+    Nothing is cached: once the leader finishes the next call runs again.
+
+    ``do`` coalesces threads, ``do_async`` coalesces coroutines of one event
+    loop. Do not call ``do`` from code running on the event loop (e.g. under
+    ``AsyncSession.run_sync``) - a waiting follower would block the loop the
+    leader needs.
+    """
+
+    def __init__(self, name: str = "", max_keys: int = 1024):
+        self.name = name
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self._counters: "OrderedDict[Hashable, Dict[str, int]]" = OrderedDict()
+        self._totals = {"executions": 0, "coalesced": 0}
+
+    def _count(self, key: Hashable, field: str):
+        """Bump a per-key counter; the least recently used keys are forgotten."""
+        with self._lock:
+            self._totals[field] += 1
+            counters = self._counters.get(key)
+            if counters is None:
+                counters = self._counters[key] = {"executions": 0, "coalesced": 0}
+                while len(self._counters) > self.max_keys:
+                    self._counters.popitem(last=False)
+            else:
+                self._counters.move_to_end(key)
+            counters[field] += 1
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn`` for ``key`` or wait for the run already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            self._count(key, "coalesced")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        self._count(key, "executions")
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Await ``fn`` for ``key`` or join the task already in flight.
+
+        The computation runs as its own task and callers await it through
+        ``asyncio.shield``, so a leader whose request is cancelled does not
+        cancel the result the followers are waiting for.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            self._count(key, "executions")
+            task = self._tasks[key] = asyncio.ensure_future(fn(*args, **kwargs))
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        else:
+            self._count(key, "coalesced")
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """Executions and coalesced calls, in total and per key."""
+        with self._lock:
+            return {
+                "name": self.name,
+                **self._totals,
+                "in_flight": len(self._calls) + len(self._tasks),
+                "keys": {repr(key): dict(counters) for key, counters in self._counters.items()},
+            }
+
+    def reset(self):
+        """Forget the counters (in-flight calls are unaffected)."""
+        with self._lock:
+            self._counters.clear()
+            self._totals = {"executions": 0, "coalesced": 0}
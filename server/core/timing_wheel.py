@@ -0,0 +1,80 @@
+"""Hashed timing wheel for large numbers of deadlines."""
+import math
+import threading
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+
+class TimingWheel:
+    """Thread-safe timer set with O(1) schedule and cancel.
+
+    Time is cut into ticks of ``tick`` seconds and deadlines are hashed into
+    ``slots`` buckets by the tick they fall in, so a deadline further away
+    than one turn of the wheel shares its bucket with nearer ones and simply
+    stays put until the turn it is due. ``advance(now)`` visits only the
+    buckets of the ticks that passed (at most one full turn) and returns
+    the keys whose deadline has come. A key fires at the first tick
+    boundary at or after its deadline - never early, at most ``tick`` late.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 512, start: float = 0.0):
+        if tick <= 0 or slots < 1:
+            raise ValueError("tick must be positive and slots at least 1")
+        self.tick = tick
+        self._slots: List[Set[Hashable]] = [set() for _ in range(slots)]
+        # key -> (deadline, tick it fires at)
+        self._entries: Dict[Hashable, Tuple[float, int]] = {}
+        self._current = math.floor(start / tick)
+        self._lock = threading.Lock()
+
+    def _slot(self, tick: int) -> Set[Hashable]:
+        return self._slots[tick % len(self._slots)]
+
+    def schedule(self, key: Hashable, deadline: float):
+        """Fire ``key`` at ``deadline``, replacing any earlier deadline of the key."""
+        with self._lock:
+            self._remove(key)
+            # Deadlines already passed fire on the next advance
+            tick = max(math.ceil(deadline / self.tick), self._current + 1)
+            self._entries[key] = (deadline, tick)
+            self._slot(tick).add(key)
+
+    def _remove(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._slot(entry[1]).discard(key)
+        return True
+
+    def cancel(self, key: Hashable) -> bool:
+        """Forget ``key``; False if it was not scheduled."""
+        with self._lock:
+            return self._remove(key)
+
+    def advance(self, now: float) -> List[Tuple[Hashable, float]]:
+        """Move the wheel to ``now``; returns the due (key, deadline) pairs, earliest first."""
+        with self._lock:
+            target = math.floor(now / self.tick)
+            if target <= self._current:
+                return []
+            due = []
+            # A jump of a whole turn or more visits every bucket once
+            for tick in range(self._current + 1, self._current + 1 + min(target - self._current, len(self._slots))):
+                slot = self._slot(tick)
+                for key in [key for key in slot if self._entries[key][1] <= target]:
+                    slot.discard(key)
+                    due.append((key, self._entries.pop(key)[0]))
+            self._current = target
+        due.sort(key=lambda item: item[1])
+        return due
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        """When ``key`` is due, or None if it is not scheduled."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,67 @@
+"""Bounded top-k selection and opaque pagination cursors."""
+import base64
+import binascii
+import heapq
+import json
+from typing import Any, Callable, Iterable, List, Optional, Tuple, TypeVar
+from core.domain import SearchOffer
+from core.ftypes import Either
+
+T = TypeVar('T')
+
+SORT_KEYS = ("price", "stars", "price_per_night")
+# Values in the sort key of each order (see search_offer_key)
+KEY_LENGTHS = {"price": 2, "stars": 3, "price_per_night": 2}
+
+
+def top_k(
+    items: Iterable[T],
+    k: int,
+    key: Callable[[T], Tuple],
+    after: Optional[Tuple] = None
+) -> List[T]:
+    """Best ``k`` items in key order, consuming ``items`` lazily.
+
+    heapq.nsmallest keeps a bounded heap of k items, so memory is O(k) and
+    time O(n log k) however many items stream in. With ``after`` only items
+    whose key sorts strictly after it are considered - the next page.
+    """
+    if k <= 0:
+        return []
+    if after is not None:
+        after = tuple(after)
+        items = (item for item in items if key(item) > after)
+    return heapq.nsmallest(k, items, key=key)
+
+
+def search_offer_key(sort_by: str, nights: int = 1) -> Callable[[SearchOffer], Tuple]:
+    """Sort key for domain offers; the rate plan id makes every key unique."""
+    if sort_by == "stars":
+        return lambda o: (-o.hotel.stars, o.total_price, o.rate_plan.id)
+    if sort_by == "price_per_night":
+        return lambda o: (o.total_price / max(nights, 1), o.rate_plan.id)
+    return lambda o: (o.total_price, o.rate_plan.id)
+
+
+def encode_cursor(sort_by: str, key: Tuple) -> str:
+    """Opaque cursor pointing just after ``key``."""
+    raw = json.dumps([sort_by, list(key)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str) -> Either[str, Tuple[Any, ...]]:
+    """Decode a cursor made by encode_cursor for the same sort order."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, key = json.loads(base64.urlsafe_b64decode(padded))
+        if cursor_sort != sort_by:
+            return Either.left("Cursor was issued for a different sort order")
+        if (
+            not isinstance(key, list)
+            or len(key) != KEY_LENGTHS.get(sort_by)
+            or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in key)
+        ):
+            return Either.left("Invalid cursor")
+    except (ValueError, TypeError, binascii.Error):
+        return Either.left("Invalid cursor")
+    return Either.right(tuple(key))
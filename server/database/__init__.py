@@ -1,4 +1,8 @@
 from .base import Base
 from .session import engine, get_db, init_db, SessionLocal
+from .async_session import async_engine, get_async_db, AsyncSessionLocal
 
-__all__ = ["Base", "engine", "get_db", "init_db", "SessionLocal"]
+__all__ = [
+    "Base", "engine", "get_db", "init_db", "SessionLocal",
+    "async_engine", "get_async_db", "AsyncSessionLocal",
+]
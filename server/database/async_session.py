@@ -0,0 +1,41 @@
+"""Async database engine and session dependency (SQLAlchemy asyncio + aiosqlite)."""
+from typing import AsyncIterator
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from config.settings import settings
+from database.session import apply_sqlite_profile, engine_options
+
+
+def async_database_url(url: str) -> str:
+    """Async driver URL for a sync one: sqlite:// becomes sqlite+aiosqlite://."""
+    parsed = make_url(url)
+    if parsed.drivername == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+def enable_sqlite_foreign_keys(async_engine):
+    """Turn on foreign keys for every connection of an aiosqlite engine."""
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _set_sqlite_pragma(dbapi_connection, connection_record):
+        if async_engine.dialect.name == "sqlite":
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON;")
+            cursor.close()
+
+
+# Create async engine
+_async_url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(_async_url, **engine_options(_async_url))
+enable_sqlite_foreign_keys(async_engine)
+apply_sqlite_profile(async_engine.sync_engine)
+
+# Objects stay usable after commit: route handlers serialize them outside the session
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency for getting an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,277 @@
+"""Write-behind event persistence - batched inserts into the events table."""
+import logging
+import os
+import threading
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from core.domain import Event as DomainEvent
+from core.frp import encode_payload
+from models.Event import Event as EventModel
+from config.settings import settings
+from database.session import engine
+
+logger = logging.getLogger(__name__)
+
+# ts, name, encoded payload
+Row = Tuple[str, str, str]
+
+_SPILL_SEPARATOR = "\x1d"
+
+# Rows per INSERT statement (3 bound parameters each)
+_ROWS_PER_STATEMENT = 300
+
+
+class EventSink:
+    """Buffer events in memory and insert them in batches.
+
+    ``write`` is an event bus handler that only appends to a list. A flusher
+    thread inserts the buffer with multi-row INSERTs once ``batch_size``
+    events are waiting or every ``flush_interval`` seconds. If the database
+    fails, or falls so far behind that ``max_buffer`` events are waiting,
+    events are appended to the ``spill_path`` file instead (fsynced, one
+    event per line) and replayed before the next successful batch - and by
+    ``recover()`` after a crash. Spilled lines that do not hold an event
+    are moved to a ``.malformed`` file beside it and counted in ``stats()``
+    rather than replayed. Without a spill file the buffer still
+    holds at most ``max_buffer`` events: the oldest are dropped and counted
+    in ``stats()``. ``close()`` writes out everything left,
+    spilling whatever the database will not take. Delivery is at least
+    once: a crash between an insert and removing its replay file inserts
+    those events again.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffer: int = 50000,
+        spill_path: Optional[str] = None
+    ):
+        self.engine = engine
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_buffer = max(self.batch_size, max_buffer)
+        self.spill_path = spill_path
+        self._buffer: List[Row] = []
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._counters = {"written": 0, "batches": 0, "spilled": 0, "replayed": 0, "failures": 0, "dropped": 0, "malformed": 0}
+
+    # Writing
+
+    def write(self, event: DomainEvent):
+        """Queue one event for insertion (event bus handler)."""
+        row = (event.ts, event.name, encode_payload(event.payload))
+        with self._cond:
+            if len(self._buffer) < self.max_buffer or self.spill_path is None:
+                self._buffer.append(row)
+                self._trim()
+                if len(self._buffer) >= self.batch_size:
+                    self._cond.notify()
+                return
+        # The database is not keeping up; park the event on disk
+        self._spill([row])
+
+    def _trim(self):
+        """Drop the oldest events beyond ``max_buffer`` (callers hold the lock)."""
+        excess = len(self._buffer) - self.max_buffer
+        if excess > 0:
+            del self._buffer[:excess]
+            self._counters["dropped"] += excess
+
+    __call__ = write
+
+    def subscribe(self, event_bus, event_names: Iterable[str]):
+        """Persist every event of the given names published on ``event_bus``."""
+        for name in event_names:
+            event_bus.subscribe(name, self.write)
+
+    # Flushing
+
+    def _insert(self, rows: List[Row]):
+        """Insert rows in one transaction, a few hundred per statement."""
+        with self.engine.begin() as conn:
+            for i in range(0, len(rows), _ROWS_PER_STATEMENT):
+                chunk = rows[i:i + _ROWS_PER_STATEMENT]
+                conn.execute(insert(EventModel).values([
+                    {"ts": ts, "name": name, "payload": payload} for ts, name, payload in chunk
+                ]))
+
+    def flush(self) -> int:
+        """Insert spilled and buffered events now; returns how many were written."""
+        with self._flush_lock:
+            with self._cond:
+                rows, self._buffer = self._buffer, []
+            spilled = self._read_spill()
+            if not rows and not spilled:
+                return 0
+            try:
+                # Spilled and buffered events interleave; restore time order
+                self._insert(sorted(spilled + rows, key=lambda row: row[0]))
+            except Exception as e:
+                logger.exception("Error writing %d events: %s", len(spilled) + len(rows), e)
+                self._counters["failures"] += 1
+                if self.spill_path is None:
+                    with self._cond:
+                        self._buffer[:0] = rows
+                        self._trim()
+                else:
+                    self._spill(rows)
+                return 0
+            if spilled:
+                self._truncate_spill()
+                self._counters["replayed"] += len(spilled)
+            self._counters["written"] += len(spilled) + len(rows)
+            self._counters["batches"] += 1
+            return len(spilled) + len(rows)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._running and len(self._buffer) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                running = self._running
+            self.flush()
+            if not running:
+                return
+
+    def start(self):
+        """Start the background flusher."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="event-sink", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: Optional[float] = 10.0) -> bool:
+        """Stop the flusher and write out everything; True if nothing is left in memory."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+        with self._cond:
+            rows, self._buffer = self._buffer, []
+        if rows and self.spill_path is not None:
+            self._spill(rows)
+            rows = []
+        return not rows
+
+    def persisted(self) -> bool:
+        """True if every event written so far is in the database (none buffered or spilled)."""
+        with self._cond:
+            if self._buffer:
+                return False
+        if self.spill_path is None:
+            return True
+        return not (os.path.exists(self.spill_path) or os.path.exists(self._replay_path))
+
+    def recover(self) -> int:
+        """Insert events spilled before a crash; call once at startup."""
+        return self.flush()
+
+    # Spill file
+
+    def _spill(self, rows: List[Row]):
+        with self._spill_lock:
+            with open(self.spill_path, "a", encoding="utf-8") as spill:
+                for ts, name, payload in rows:
+                    spill.write(f"{ts}{_SPILL_SEPARATOR}{name}{_SPILL_SEPARATOR}{payload}\n")
+                spill.flush()
+                os.fsync(spill.fileno())
+            self._counters["spilled"] += len(rows)
+
+    @property
+    def _replay_path(self) -> str:
+        return f"{self.spill_path}.replay"
+
+    @property
+    def _malformed_path(self) -> str:
+        return f"{self.spill_path}.malformed"
+
+    def _read_spill(self) -> List[Row]:
+        """Move the spill file's complete lines to the replay file and read them.
+
+        New spills go to a fresh file meanwhile, so deleting the replay file
+        after a successful insert cannot lose them.
+        """
+        if self.spill_path is None:
+            return []
+        with self._spill_lock:
+            try:
+                with open(self.spill_path, encoding="utf-8") as spill:
+                    pending = spill.read()
+            except FileNotFoundError:
+                pending = None
+            if pending is not None:
+                # A crash mid-write can leave a torn last line without its newline
+                pending = pending[:pending.rfind("\n") + 1]
+                with open(self._replay_path, "a", encoding="utf-8") as replay:
+                    replay.write(pending)
+                    replay.flush()
+                    os.fsync(replay.fileno())
+                os.remove(self.spill_path)
+            try:
+                with open(self._replay_path, encoding="utf-8") as replay:
+                    lines = replay.read().split("\n")
+            except FileNotFoundError:
+                return []
+            rows, malformed = [], []
+            for line in lines:
+                fields = tuple(line.split(_SPILL_SEPARATOR, 2))
+                if len(fields) == 3:
+                    rows.append(fields)
+                elif line:
+                    malformed.append(line)
+            if malformed:
+                self._quarantine(malformed, rows)
+        return rows
+
+    def _quarantine(self, malformed: List[str], rows: List[Row]):
+        """Move lines that are not events out of the replay file (callers hold the spill lock).
+
+        Left in place they would fail every later flush, since the replay
+        file is kept until an insert succeeds.
+        """
+        with open(self._malformed_path, "a", encoding="utf-8") as quarantine:
+            quarantine.writelines(f"{line}\n" for line in malformed)
+            quarantine.flush()
+            os.fsync(quarantine.fileno())
+        rewritten = f"{self._replay_path}.tmp"
+        with open(rewritten, "w", encoding="utf-8") as replay:
+            replay.writelines(f"{_SPILL_SEPARATOR.join(row)}\n" for row in rows)
+            replay.flush()
+            os.fsync(replay.fileno())
+        os.replace(rewritten, self._replay_path)
+        self._counters["malformed"] += len(malformed)
+        logger.warning("Moved %d malformed spilled events to %s", len(malformed), self._malformed_path)
+
+    def _truncate_spill(self):
+        """Forget the replayed events (they are in the database now)."""
+        with self._spill_lock:
+            if os.path.exists(self._replay_path):
+                os.remove(self._replay_path)
+
+    def stats(self) -> dict:
+        """Written, spilled, replayed and malformed counts plus the current backlog."""
+        with self._cond:
+            buffered = len(self._buffer)
+        return {**self._counters, "buffered": buffered}
+
+
+# Global sink on the application database
+event_sink = EventSink(
+    engine,
+    batch_size=settings.EVENT_SINK_BATCH_SIZE,
+    flush_interval=settings.EVENT_SINK_FLUSH_INTERVAL,
+    max_buffer=settings.EVENT_SINK_MAX_BUFFER,
+    spill_path=settings.EVENT_SINK_SPILL_PATH
+)
@@ -0,0 +1,191 @@
+"""Versioned schema migrations for databases created by older releases.
+
+``create_all`` only creates missing tables; it never changes a table that
+already exists. Each migration here brings an existing table up to the
+current models. Applied versions are recorded in ``schema_migrations``;
+every migration runs in its own transaction and is recorded in it, so a
+later start resumes at the first version that was not recorded.
+
+Migrations must be idempotent: SQLite's driver commits some DDL on its own,
+so an interrupted migration may be run again over its partial work, and on
+a fresh database ``create_all`` has already built the current schema.
+Append new migrations at the end and never renumber or edit applied ones.
+"""
+from datetime import datetime, timezone
+from typing import Callable, Iterable, List, NamedTuple
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+
+class Migration(NamedTuple):
+    """One schema step: ``upgrade`` runs inside the migration's transaction."""
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _columns(conn: Connection, table: str) -> set:
+    return {column["name"] for column in inspect(conn).get_columns(table)}
+
+
+def _has_table(conn: Connection, table: str) -> bool:
+    return inspect(conn).has_table(table)
+
+
+# julianday('0001-01-01') - 1: julianday(date) minus this is Python's date ordinal
+_JULIAN_ORDINAL_OFFSET = 1721424.5
+
+
+def add_day_columns(conn: Connection):
+    """Add and fill the integer ``day`` column on prices and availabilities."""
+    for table in ("prices", "availabilities"):
+        if not _has_table(conn, table) or "day" in _columns(conn, table):
+            continue
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN day INTEGER"))
+        conn.execute(text(
+            f"UPDATE {table} SET day = CAST(julianday(date) - {_JULIAN_ORDINAL_OFFSET} AS INTEGER)"
+        ))
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_day ON {table} (day)"))
+
+
+def add_mask_columns(conn: Connection):
+    """Add and fill the amenity bitmask columns on hotels and room types."""
+    from core.amenities import AMENITIES, BED_TYPES
+    masks = (
+        ("hotels", "features", AMENITIES),
+        ("room_types", "features", AMENITIES),
+        ("room_types", "beds", BED_TYPES),
+    )
+    for table, source, dictionary in masks:
+        column = f"{source}_mask"
+        if not _has_table(conn, table) or column in _columns(conn, table):
+            continue
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"))
+        rows = conn.execute(text(f"SELECT id, {source} FROM {table}")).all()
+        if rows:
+            conn.execute(
+                text(f"UPDATE {table} SET {column} = :mask WHERE id = :id"),
+                [{"id": row_id, "mask": dictionary.encode_json(value)} for row_id, value in rows]
+            )
+
+
+# table, index name, columns, unique - kept in step with the models' __table_args__
+_LOOKUP_INDEXES = (
+    ("prices", "ux_prices_rate_day", ("rate_id", "day"), True),
+    ("availabilities", "ux_availabilities_room_type_day", ("room_type_id", "day"), True),
+    ("room_types", "ix_room_types_hotel_capacity", ("hotel_id", "capacity"), False),
+)
+
+
+def add_lookup_indexes(conn: Connection):
+    """Composite indexes for the per-night price and availability lookups.
+
+    Older databases could hold several rows for one key; the newest (highest
+    id) wins - it is the one the last import or update wrote - and the rest
+    are deleted before the unique index is built.
+    """
+    for table, name, columns, unique in _LOOKUP_INDEXES:
+        if not _has_table(conn, table):
+            continue
+        key = ", ".join(columns)
+        if unique:
+            conn.execute(text(
+                f"DELETE FROM {table} WHERE id NOT IN (SELECT MAX(id) FROM {table} GROUP BY {key})"
+            ))
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        conn.execute(text(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({key})"))
+
+
+def compact_prices(conn: Connection):
+    """Move the nightly ``prices`` rows into run-length ``rate_intervals``.
+
+    Nights already covered by an interval take the price row's amount; the
+    ``prices`` table is left empty.
+    """
+    from core.days import Day
+    from core.rates import RateRun, encode_runs, set_range
+    if not _has_table(conn, "prices") or not _has_table(conn, "rate_intervals"):
+        return
+    rows = conn.execute(text("SELECT rate_id, day, amount, currency FROM prices ORDER BY rate_id, day")).all()
+    nights_by_rate = {}
+    for rate_id, day, amount, currency in rows:
+        nights_by_rate.setdefault(rate_id, []).append((day, amount, currency or "UZS"))
+    for rate_id, nights in nights_by_rate.items():
+        runs = [
+            RateRun(*row) for row in conn.execute(
+                text("SELECT day_from, day_to, amount, currency FROM rate_intervals WHERE rate_id = :rate_id"),
+                {"rate_id": rate_id}
+            )
+        ]
+        for run in encode_runs(nights):
+            runs = set_range(runs, run.start, run.end, run.amount, run.currency)
+        conn.execute(text("DELETE FROM rate_intervals WHERE rate_id = :rate_id"), {"rate_id": rate_id})
+        conn.execute(
+            text(
+                "INSERT INTO rate_intervals (rate_id, date_from, date_to, day_from, day_to, amount, currency) "
+                "VALUES (:rate_id, :date_from, :date_to, :day_from, :day_to, :amount, :currency)"
+            ),
+            [
+                {
+                    "rate_id": rate_id,
+                    "date_from": Day(run.start).isoformat(), "date_to": Day(run.end).isoformat(),
+                    "day_from": run.start, "day_to": run.end,
+                    "amount": run.amount, "currency": run.currency,
+                }
+                for run in runs
+            ]
+        )
+    if rows:
+        conn.execute(text("DELETE FROM prices"))
+
+
+def add_booking_expiry(conn: Connection):
+    """Add ``expires_at`` to bookings; existing held bookings keep their rooms until cancelled."""
+    if not _has_table(conn, "bookings"):
+        return
+    if "expires_at" not in _columns(conn, "bookings"):
+        conn.execute(text("ALTER TABLE bookings ADD COLUMN expires_at VARCHAR"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_bookings_status_expires ON bookings (status, expires_at)"
+    ))
+
+
+MIGRATIONS = (
+    Migration(1, "day columns", add_day_columns),
+    Migration(2, "amenity mask columns", add_mask_columns),
+    Migration(3, "composite lookup indexes", add_lookup_indexes),
+    Migration(4, "run-length rate intervals", compact_prices),
+    Migration(5, "booking hold expiry", add_booking_expiry),
+)
+
+
+def _ensure_version_table(bind: Engine):
+    with bind.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, name TEXT NOT NULL, applied_at TEXT NOT NULL)"
+        ))
+
+
+def applied_versions(bind: Engine) -> List[int]:
+    """Versions already recorded in ``schema_migrations``, ascending."""
+    _ensure_version_table(bind)
+    with bind.connect() as conn:
+        return list(conn.execute(text("SELECT version FROM schema_migrations ORDER BY version")).scalars())
+
+
+def migrate(bind: Engine, migrations: Iterable[Migration] = MIGRATIONS) -> List[int]:
+    """Apply the pending migrations in version order; returns the versions applied."""
+    done = set(applied_versions(bind))
+    applied = []
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if migration.version in done:
+            continue
+        with bind.begin() as conn:
+            migration.upgrade(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, name, applied_at) VALUES (:version, :name, :at)"),
+                {"version": migration.version, "name": migration.name, "at": datetime.now(timezone.utc).isoformat()}
+            )
+        applied.append(migration.version)
+    return applied
@@ -8,6 +8,9 @@ from models.Hotel import Hotel
 from models.room_type import RoomType
 from models.rate_plan import RatePlan
 from models.Price import Price
+from models.rate_interval import RateInterval
+from core.days import Day
+from core.rates import encode_runs
 from models.Availability import Availability
 from models.Guest import Guest
 from models.Rule import Rule
@@ -35,6 +38,7 @@ def generate_test_data():
         print("Clearing existing data...")
         db.query(User).delete()
         db.query(Price).delete()
+        db.query(RateInterval).delete()
         db.query(Availability).delete()
         db.query(RatePlan).delete()
         db.query(RoomType).delete()
@@ -107,24 +111,27 @@ def generate_test_data():
         
         db.commit()
         
-        # Create prices for next 90 days
+        # Create prices for next 90 days, stored as runs of equal nightly prices
         print("Creating prices...")
         prices = []
         start_date = datetime.now().date()
         
         for rate_plan in rate_plans:
             base_price = random.randint(50000, 500000)  # in tiyin
+            nights = []
             for day_offset in range(90):
                 date = start_date + timedelta(days=day_offset)
                 # Weekend prices +20%
                 multiplier = 1.2 if date.weekday() >= 5 else 1.0
-                price = Price(
+                nights.append((Day.parse(date), int(base_price * multiplier), "UZS"))
+            for run in encode_runs(nights):
+                prices.append(RateInterval(
                     rate_id=rate_plan.id,
-                    date=date.isoformat(),
-                    amount=int(base_price * multiplier),
-                    currency="UZS"
-                )
-                prices.append(price)
+                    date_from=Day(run.start).isoformat(),
+                    date_to=Day(run.end).isoformat(),
+                    amount=run.amount,
+                    currency=run.currency
+                ))
         
         db.bulk_save_objects(prices)
         db.commit()
@@ -173,7 +180,7 @@ def generate_test_data():
         print(f"  - {len(hotels)} hotels")
         print(f"  - {len(room_types)} room types")
         print(f"  - {len(rate_plans)} rate plans")
-        print(f"  - {len(prices)} prices")
+        print(f"  - {len(prices)} rate intervals ({len(rate_plans) * 90} priced nights)")
         print(f"  - {len(availabilities)} availability records")
         print(f"  - {len(guests)} guests")
         
@@ -1,16 +1,96 @@
-"""Database session management with SQLite foreign keys enabled."""
+"""Database session management with SQLite foreign keys and a performance profile."""
+from typing import Optional, Tuple
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
 from sqlite3 import Connection as SQLite3Connection
 from config.settings import settings
 
+# PRAGMA values per profile, applied to every new connection:
+# - "legacy": SQLite's own defaults (rollback journal, full sync), for comparison
+# - "durable": WAL, and every commit is synced to disk
+# - "balanced": WAL, synced at checkpoints; a power cut can lose the last
+#   commits but never corrupts the file
+# - "fast": no syncing at all; for throwaway databases (tests, benchmarks)
+SQLITE_PROFILES = {
+    "legacy": {},
+    "durable": {
+        "journal_mode": "WAL", "synchronous": "FULL", "cache_size": -65536,
+        "temp_store": "DEFAULT", "busy_timeout": 5000,
+    },
+    "balanced": {
+        "journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -65536,
+        "mmap_size": 268435456, "temp_store": "MEMORY", "busy_timeout": 5000,
+    },
+    "fast": {
+        "journal_mode": "WAL", "synchronous": "OFF", "cache_size": -262144,
+        "mmap_size": 1073741824, "temp_store": "MEMORY", "busy_timeout": 5000,
+    },
+}
+
+# Applied in this order: journal_mode must be set before anything touches the file
+_PRAGMA_ORDER = ("busy_timeout", "journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store")
+
+
+def sqlite_pragmas(profile: Optional[str] = None) -> Tuple[Tuple[str, object], ...]:
+    """(name, value) pragmas of a profile, with the DB_* settings overriding it."""
+    profile = profile or settings.DB_PROFILE
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"unknown database profile {profile!r}; expected one of {', '.join(SQLITE_PROFILES)}")
+    values = dict(SQLITE_PROFILES[profile])
+    overrides = {
+        "journal_mode": settings.DB_JOURNAL_MODE,
+        "synchronous": settings.DB_SYNCHRONOUS,
+        "cache_size": settings.DB_CACHE_SIZE,
+        "mmap_size": settings.DB_MMAP_SIZE,
+        "temp_store": settings.DB_TEMP_STORE,
+        "busy_timeout": settings.DB_BUSY_TIMEOUT,
+    }
+    values.update({name: value for name, value in overrides.items() if value is not None})
+    return tuple((name, values[name]) for name in _PRAGMA_ORDER if name in values)
+
+
+def apply_sqlite_profile(engine: Engine, profile: Optional[str] = None) -> Tuple[Tuple[str, object], ...]:
+    """Run the profile's pragmas on every new connection of ``engine``.
+
+    Works for sync and aiosqlite engines (pass ``async_engine.sync_engine``);
+    other databases are left alone.
+    """
+    pragmas = sqlite_pragmas(profile)
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return pragmas
+
+    @event.listens_for(engine, "connect")
+    def _set_profile_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value};")
+        cursor.close()
+
+    return pragmas
+
+
+def engine_options(url: str) -> dict:
+    """Pool, statement cache and logging options for ``create_engine``."""
+    options = {"echo": settings.SQL_ECHO}
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return {**options, "pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW,
+                "pool_timeout": settings.DB_POOL_TIMEOUT}
+    options["connect_args"] = {"check_same_thread": False, "cached_statements": settings.DB_STATEMENT_CACHE_SIZE}
+    if parsed.database and parsed.database != ":memory:":
+        # File databases get a queue pool; in-memory ones keep one connection per thread
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
+
+
 # Create engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    echo=settings.DEBUG
-)
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+apply_sqlite_profile(engine)
 
 # Enable foreign keys for SQLite
 @event.listens_for(Engine, "connect")
@@ -35,7 +115,11 @@ def get_db():
 
 
 def init_db():
-    """Initialize database tables."""
+    """Create missing tables and apply pending schema migrations."""
     from database.base import Base
     import models  # Import all models
+    from database.migrations import migrate
     Base.metadata.create_all(bind=engine)
+    # Bring tables created by older releases up to the current models
+    migrate(engine)
+
@@ -1,12 +1,17 @@
 """Availability model."""
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 from database.base import Base
+from models.mixins import DayMixin
 
 
-class Availability(Base):
+class Availability(DayMixin, Base):
     """Availability model for room inventory."""
     __tablename__ = "availabilities"
+    __table_args__ = (
+        # One inventory row per room type and night; the stay lookup path
+        Index("ux_availabilities_room_type_day", "room_type_id", "day", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     room_type_id = Column(Integer, ForeignKey("room_types.id", ondelete="CASCADE"), nullable=False)
@@ -1,17 +1,27 @@
 """Booking model."""
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 from database.base import Base
 
 
 class Booking(Base):
-    """Booking model."""
+    """Booking model.
+
+    A ``held`` booking keeps its rooms until ``expires_at`` (ISO timestamp,
+    UTC); if it has not been paid by then it is cancelled and the rooms are
+    given back. Bookings without ``expires_at`` are held until cancelled.
+    """
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index("ix_bookings_status_expires", "status", "expires_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     guest_id = Column(Integer, ForeignKey("guests.id"), nullable=False)
     total = Column(Integer, nullable=False)
     status = Column(String, nullable=False, default="held")  # held, confirmed, cancelled
+    expires_at = Column(String, nullable=True)  # ISO format, UTC
     
     # Relationships
-    payments = relationship("Payment", back_populates="booking", cascade="all, delete-orphan")
\ No newline at end of file
+    payments = relationship("Payment", back_populates="booking", cascade="all, delete-orphan")
+    holds = relationship("Hold", back_populates="booking", cascade="all, delete-orphan")
\ No newline at end of file
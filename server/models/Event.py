@@ -10,4 +10,4 @@ class Event(Base):
     id = Column(Integer, primary_key=True, index=True)
     ts = Column(String, nullable=False)  # ISO format timestamp
     name = Column(String, nullable=False, index=True)  # SEARCH, HOLD, BOOKED, etc.
-    payload = Column(Text)  # JSON string
\ No newline at end of file
+    payload = Column(Text)  # core.frp.encode_payload text
\ No newline at end of file
@@ -2,9 +2,10 @@
 from sqlalchemy import Column, Integer, String, Text
 from sqlalchemy.orm import relationship
 from database.base import Base
+from models.mixins import FeaturesMaskMixin
 
 
-class Hotel(Base):
+class Hotel(FeaturesMaskMixin, Base):
     """Hotel model."""
     __tablename__ = "hotels"
     
@@ -1,12 +1,21 @@
 """Price model."""
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 from database.base import Base
+from models.mixins import DayMixin
 
 
-class Price(Base):
-    """Price model for daily rates."""
+class Price(DayMixin, Base):
+    """Legacy price model, one row per rate per night.
+
+    Prices now live in ``rate_intervals``; migration 4 compacts these rows
+    into intervals and readers go through ``RateController``.
+    """
     __tablename__ = "prices"
+    __table_args__ = (
+        # One price per rate and night; the stay lookup path
+        Index("ux_prices_rate_day", "rate_id", "day", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     rate_id = Column(Integer, ForeignKey("rate_plans.id", ondelete="CASCADE"), nullable=False)
@@ -4,10 +4,12 @@ from .Hotel import Hotel
 from .room_type import RoomType
 from .rate_plan import RatePlan
 from .Price import Price
+from .rate_interval import RateInterval
 from .Availability import Availability
 from .Guest import Guest
 from .cart import CartItem
 from .Booking import Booking
+from .hold import Hold
 from .Payment import Payment
 from .Event import Event
 from .Rule import Rule
@@ -18,10 +20,12 @@ __all__ = [
     "RoomType",
     "RatePlan",
     "Price",
+    "RateInterval",
     "Availability",
     "Guest",
     "CartItem",
     "Booking",
+    "Hold",
     "Payment",
     "Event",
     "Rule",
@@ -0,0 +1,29 @@
+"""Hold model."""
+from sqlalchemy import Column, Index, Integer, String, ForeignKey
+from sqlalchemy.orm import relationship
+from database.base import Base
+from models.mixins import DayRangeMixin
+
+
+class Hold(DayRangeMixin, Base):
+    """Rooms of one room type taken from inventory for a booking's stay.
+
+    ``date_from``/``date_to`` are the checkin and checkout dates. A hold is
+    ``active`` while its rooms are subtracted from ``availabilities`` and
+    ``released`` once they have been given back.
+    """
+    __tablename__ = "holds"
+    __table_args__ = (
+        Index("ix_holds_booking_status", "booking_id", "status"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    booking_id = Column(Integer, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False)
+    room_type_id = Column(Integer, ForeignKey("room_types.id", ondelete="CASCADE"), nullable=False)
+    date_from = Column(String, nullable=False)  # ISO format, checkin
+    date_to = Column(String, nullable=False)  # ISO format, checkout
+    rooms = Column(Integer, nullable=False, default=1)
+    status = Column(String, nullable=False, default="active")  # active, released
+    
+    # Relationships
+    booking = relationship("Booking", back_populates="holds")
@@ -0,0 +1,61 @@
+"""Shared model columns."""
+from sqlalchemy import Column, Integer
+from sqlalchemy.orm import validates
+from core.days import to_day
+from core.amenities import AMENITIES
+
+
+def _day_from(column: str):
+    """Column default: the ordinal of the row's ISO ``column``."""
+    def default(context) -> int:
+        return to_day(context.get_current_parameters()[column])
+    return default
+
+
+class DayMixin:
+    """Integer ``day`` ordinal kept in step with the ISO ``date`` column.
+
+    Range filters and joins compare ``day`` (an indexed integer) instead of
+    date strings; ``date`` stays for display and backwards compatibility.
+    """
+    day = Column(Integer, nullable=False, index=True, default=_day_from("date"))
+
+    @validates("date")
+    def _sync_day(self, key, value):
+        self.day = to_day(value)
+        return value
+
+
+class DayRangeMixin:
+    """Integer ``day_from``/``day_to`` ordinals kept in step with ``date_from``/``date_to``.
+
+    The range is half-open, like a stay: ``date_to`` is the first day not
+    covered.
+    """
+    day_from = Column(Integer, nullable=False, default=_day_from("date_from"))
+    day_to = Column(Integer, nullable=False, default=_day_from("date_to"))
+
+    @validates("date_from", "date_to")
+    def _sync_day_range(self, key, value):
+        setattr(self, key.replace("date", "day"), to_day(value))
+        return value
+
+
+def mask_default(source: str, dictionary):
+    """Column default: the bitmask of the row's JSON ``source`` column."""
+    def default(context) -> int:
+        return dictionary.encode_json(context.get_current_parameters().get(source))
+    return default
+
+
+class FeaturesMaskMixin:
+    """Integer ``features_mask`` kept in step with the JSON ``features`` column.
+
+    Amenity filters test bits of the mask instead of parsing the JSON.
+    """
+    features_mask = Column(Integer, nullable=False, default=mask_default("features", AMENITIES))
+
+    @validates("features")
+    def _sync_features_mask(self, key, value):
+        self.features_mask = AMENITIES.encode_json(value)
+        return value
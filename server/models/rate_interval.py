@@ -0,0 +1,24 @@
+"""Rate interval model."""
+from sqlalchemy import Column, Index, Integer, String, ForeignKey
+from sqlalchemy.orm import relationship
+from database.base import Base
+from models.mixins import DayRangeMixin
+
+
+class RateInterval(DayRangeMixin, Base):
+    """One price for a span of nights of a rate plan (see core/rates.py)."""
+    __tablename__ = "rate_intervals"
+    __table_args__ = (
+        # Intervals of a rate never overlap, so the start identifies one
+        Index("ux_rate_intervals_rate_day_from", "rate_id", "day_from", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    rate_id = Column(Integer, ForeignKey("rate_plans.id", ondelete="CASCADE"), nullable=False)
+    date_from = Column(String, nullable=False)  # ISO format, first night
+    date_to = Column(String, nullable=False)  # ISO format, first night after the interval
+    amount = Column(Integer, nullable=False)  # in kopecks/tiyin, per night
+    currency = Column(String, default="UZS")
+    
+    # Relationships
+    rate_plan = relationship("RatePlan", back_populates="intervals")
@@ -20,3 +20,4 @@ class RatePlan(Base):
     hotel = relationship("Hotel", back_populates="rate_plans")
     room_type = relationship("RoomType", back_populates="rate_plans")
     prices = relationship("Price", back_populates="rate_plan", cascade="all, delete-orphan")
+    intervals = relationship("RateInterval", back_populates="rate_plan", cascade="all, delete-orphan")
@@ -1,12 +1,18 @@
 """Room type model."""
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Index, Integer, String, Text, ForeignKey
+from sqlalchemy.orm import relationship, validates
 from database.base import Base
+from models.mixins import FeaturesMaskMixin, mask_default
+from core.amenities import BED_TYPES
 
 
-class RoomType(Base):
+class RoomType(FeaturesMaskMixin, Base):
     """Room type model."""
     __tablename__ = "room_types"
+    __table_args__ = (
+        # Searches pick a hotel's room types by capacity
+        Index("ix_room_types_hotel_capacity", "hotel_id", "capacity"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     hotel_id = Column(Integer, ForeignKey("hotels.id", ondelete="CASCADE"), nullable=False)
@@ -14,8 +20,14 @@ class RoomType(Base):
     capacity = Column(Integer, nullable=False)
     beds = Column(Text)  # JSON string
     features = Column(Text)  # JSON string
+    beds_mask = Column(Integer, nullable=False, default=mask_default("beds", BED_TYPES))
     
     # Relationships
     hotel = relationship("Hotel", back_populates="room_types")
     rate_plans = relationship("RatePlan", back_populates="room_type", cascade="all, delete-orphan")
     availabilities = relationship("Availability", back_populates="room_type", cascade="all, delete-orphan")
+
+    @validates("beds")
+    def _sync_beds_mask(self, key, value):
+        self.beds_mask = BED_TYPES.encode_json(value)
+        return value
@@ -5,6 +5,9 @@ from .search import router as search_router
 from .cart import router as cart_router
 from .booking import router as booking_router
 from .payment import router as payment_router
+from .filter import router as filter_router
+from .projections import router as projections_router
+from .rates import router as rates_router
 
 __all__ = [
     "auth_router",
@@ -13,4 +16,7 @@ __all__ = [
     "cart_router",
     "booking_router",
     "payment_router",
+    "filter_router",
+    "projections_router",
+    "rates_router",
 ]
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 from database import get_db
 from controllers.auth_controller import AuthController
+from controllers.async_controller import AsyncAuthController
 from middleware.auth import get_current_active_user
 from models.user import User
 
@@ -35,7 +36,7 @@ class UserResponse(BaseModel):
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user_data: UserRegister, db: Session = Depends(get_db)):
     """Register a new user."""
-    user = AuthController.register_user(
+    user = await AsyncAuthController.register_user(
         db=db,
         username=user_data.username,
         email=user_data.email,
@@ -50,7 +51,7 @@ async def login(
     db: Session = Depends(get_db)
 ):
     """Login and get access token."""
-    user = AuthController.authenticate_user(
+    user = await AsyncAuthController.authenticate_user(
         db=db,
         username=form_data.username,
         password=form_data.password
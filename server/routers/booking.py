@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List
 from database import get_db
-from controllers.booking_controller import BookingController
+from controllers.async_controller import AsyncBookingController
 
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
@@ -21,7 +21,7 @@ async def create_booking(
     db: Session = Depends(get_db)
 ):
     """Create a new booking."""
-    return BookingController.create_booking(
+    return await AsyncBookingController.create_booking(
         db=db,
         guest_id=booking_data.guest_id,
         cart_item_ids=booking_data.cart_item_ids
@@ -31,10 +31,10 @@ async def create_booking(
 @router.get("/{booking_id}")
 async def get_booking(booking_id: int, db: Session = Depends(get_db)):
     """Get booking details."""
-    return BookingController.get_booking(db, booking_id)
+    return await AsyncBookingController.get_booking(db, booking_id)
 
 
 @router.post("/{booking_id}/cancel")
 async def cancel_booking(booking_id: int, db: Session = Depends(get_db)):
     """Cancel a booking."""
-    return BookingController.cancel_booking(db, booking_id)
+    return await AsyncBookingController.cancel_booking(db, booking_id)
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from database import get_db
-from controllers.cart_controller import CartController
+from controllers.async_controller import AsyncCartController
 
 
 router = APIRouter(prefix="/cart", tags=["Cart"])
@@ -21,7 +21,7 @@ class AddToCartRequest(BaseModel):
 @router.get("/")
 async def get_cart(db: Session = Depends(get_db)):
     """Get all cart items."""
-    return CartController.get_cart_items(db)
+    return await AsyncCartController.get_cart_items(db)
 
 
 @router.post("/add", status_code=status.HTTP_201_CREATED)
@@ -30,7 +30,7 @@ async def add_to_cart(
     db: Session = Depends(get_db)
 ):
     """Add item to cart."""
-    return CartController.add_to_cart(
+    return await AsyncCartController.add_to_cart(
         db=db,
         hotel_id=item.hotel_id,
         room_type_id=item.room_type_id,
@@ -44,12 +44,12 @@ async def add_to_cart(
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_from_cart(item_id: int, db: Session = Depends(get_db)):
     """Remove item from cart."""
-    CartController.remove_from_cart(db, item_id)
+    await AsyncCartController.remove_from_cart(db, item_id)
     return None
 
 
 @router.delete("/", status_code=status.HTTP_204_NO_CONTENT)
 async def clear_cart(db: Session = Depends(get_db)):
     """Clear all cart items."""
-    CartController.clear_cart(db)
+    await AsyncCartController.clear_cart(db)
     return None
@@ -0,0 +1,31 @@
+"""Filter routers."""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from database import get_db
+from controllers.filter_controller import FilterController
+from controllers.async_controller import AsyncFilterController
+
+
+router = APIRouter(prefix="/filter", tags=["Filter"])
+
+
+@router.get("/")
+async def filter_offers(
+    date: str,
+    city: Optional[str] = None,
+    min_guests: Optional[int] = Query(None, ge=1),
+    features: List[str] = Query([]),
+    min_price: Optional[int] = Query(None, ge=0),
+    max_price: Optional[int] = Query(None, ge=0),
+    currency: Optional[str] = None,
+    room_features: List[str] = Query([]),
+    beds: List[str] = Query([]),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """Offers priced on ``date`` matching every given filter, cheapest first."""
+    predicate = FilterController.build_predicate(
+        city, min_guests, features, min_price, max_price, currency, room_features, beds
+    )
+    return await AsyncFilterController.filter_offers(db, date, predicate, limit)
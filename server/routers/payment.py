@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from database import get_db
-from controllers.payment_controller import PaymentController
+from controllers.async_controller import AsyncPaymentController
 
 
 router = APIRouter(prefix="/payments", tags=["Payments"])
@@ -20,7 +20,7 @@ async def create_payment(
     db: Session = Depends(get_db)
 ):
     """Create a payment for a booking."""
-    return PaymentController.create_payment(
+    return await AsyncPaymentController.create_payment(
         db=db,
         booking_id=payment_data.booking_id,
         method=payment_data.method
@@ -30,4 +30,4 @@ async def create_payment(
 @router.get("/{payment_id}")
 async def get_payment(payment_id: int, db: Session = Depends(get_db)):
     """Get payment details."""
-    return PaymentController.get_payment(db, payment_id)
+    return await AsyncPaymentController.get_payment(db, payment_id)
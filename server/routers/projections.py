@@ -0,0 +1,32 @@
+"""Projection routers - dashboard numbers from the event-fed read models."""
+from fastapi import APIRouter
+from typing import Optional
+from core.projections import projections
+from controllers.projection_controller import ProjectionController
+
+
+router = APIRouter(prefix="/projections", tags=["Projections"])
+
+
+@router.get("/")
+async def projection_status():
+    """Checkpoint and applied-event count of the read models."""
+    return projections.stats()
+
+
+@router.get("/occupancy/{hotel_id}")
+async def occupancy(hotel_id: int, date: str):
+    """Rooms booked at a hotel for one night."""
+    return ProjectionController.occupancy(projections, hotel_id, date)
+
+
+@router.get("/revenue")
+async def revenue(date: Optional[str] = None):
+    """Net revenue of one day, or in total without ``date``."""
+    return ProjectionController.revenue(projections, date)
+
+
+@router.get("/demand/{city}")
+async def demand(city: str, date: Optional[str] = None):
+    """Searches for a city, optionally only those covering ``date``."""
+    return ProjectionController.demand(projections, city, date)
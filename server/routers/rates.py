@@ -0,0 +1,36 @@
+"""Rate routers - interval prices of a rate plan."""
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from database import get_db
+from controllers.async_controller import AsyncRateController
+
+
+router = APIRouter(prefix="/rates", tags=["Rates"])
+
+
+class SetRateRequest(BaseModel):
+    date_from: str
+    date_to: str  # first night not priced, like a checkout date
+    amount: int
+    currency: str = "UZS"
+
+
+@router.get("/{rate_id}/intervals")
+async def get_intervals(rate_id: int, db: Session = Depends(get_db)):
+    """Stored price intervals of a rate plan."""
+    return await AsyncRateController.get_intervals(db, rate_id)
+
+
+@router.get("/{rate_id}/prices")
+async def get_prices(rate_id: int, date_from: str, date_to: str, db: Session = Depends(get_db)):
+    """Per-night prices of a rate plan."""
+    return await AsyncRateController.get_prices(db, rate_id, date_from, date_to)
+
+
+@router.put("/{rate_id}/prices")
+async def set_rate(rate_id: int, rate_data: SetRateRequest, db: Session = Depends(get_db)):
+    """Price a range of nights; returns the rate plan's intervals."""
+    return await AsyncRateController.set_rate(
+        db, rate_id, rate_data.date_from, rate_data.date_to, rate_data.amount, rate_data.currency
+    )
@@ -1,10 +1,15 @@
 """Search routers."""
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from database import get_db
-from controllers.search_controller import SearchController
+from controllers.search_controller import SearchController, search_flight
+from controllers.hotel_controller import hotel_flight
+from controllers.async_controller import AsyncSearchController
+from controllers.search_cache import search_cache
 
 
 router = APIRouter(prefix="/search", tags=["Search"])
@@ -15,36 +20,108 @@ class SearchRequest(BaseModel):
     checkin: str
     checkout: str
     guests: int = 1
+    sort_by: str = "price"
+    limit: int = 50
+    cursor: Optional[str] = None
+
+
+def _page_response(page: dict, response: Response) -> list:
+    """Return the offers; the next-page cursor travels in X-Next-Cursor."""
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["results"]
 
 
 @router.post("/")
 async def search_hotels(
     search_data: SearchRequest,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """Search for available hotels."""
-    return SearchController.search_hotels(
+    page = await AsyncSearchController.search_page(
         db=db,
         city=search_data.city,
         checkin=search_data.checkin,
         checkout=search_data.checkout,
-        guests=search_data.guests
+        guests=search_data.guests,
+        sort_by=search_data.sort_by,
+        limit=min(max(search_data.limit, 1), 200),
+        cursor=search_data.cursor
     )
+    return _page_response(page, response)
 
 
 @router.get("/")
 async def search_hotels_get(
+    response: Response,
     city: str = Query(...),
     checkin: str = Query(...),
     checkout: str = Query(...),
     guests: int = Query(1),
+    sort_by: str = Query("price"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db)
 ):
     """Search for available hotels (GET method)."""
-    return SearchController.search_hotels(
+    page = await AsyncSearchController.search_page(
+        db=db,
+        city=city,
+        checkin=checkin,
+        checkout=checkout,
+        guests=guests,
+        sort_by=sort_by,
+        limit=limit,
+        cursor=cursor
+    )
+    return _page_response(page, response)
+
+
+@router.get("/cache/stats")
+async def search_cache_stats():
+    """Search result cache counters."""
+    return search_cache.stats()
+
+
+@router.get("/coalescing/stats")
+async def search_coalescing_stats():
+    """How many identical concurrent requests shared one computation."""
+    return {"search": search_flight.stats(), "hotel": hotel_flight.stats()}
+
+
+@router.get("/stream")
+async def search_hotels_stream(
+    request: Request,
+    city: str = Query(...),
+    checkin: str = Query(...),
+    checkout: str = Query(...),
+    guests: int = Query(1),
+    chunk_size: int = Query(20, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Stream offers as newline-delimited JSON while the search runs."""
+    # Reject a bad stay with a 400 before the response starts
+    SearchController.parse_stay(checkin, checkout)
+    offers = SearchController.stream_offers(
         db=db,
         city=city,
         checkin=checkin,
         checkout=checkout,
         guests=guests
     )
+    chunks = SearchController.stream_ndjson(offers, chunk_size)
+    
+    async def body():
+        try:
+            # The generator queries a sync session: advance it in the threadpool
+            async for piece in iterate_in_threadpool(chunks):
+                # Stop producing offers as soon as the client goes away
+                if await request.is_disconnected():
+                    break
+                yield piece
+        finally:
+            chunks.close()
+            offers.close()
+    
+    return StreamingResponse(body(), media_type="application/x-ndjson")
@@ -1,70 +1,28 @@
 from models import *
+from core.predicates import Eq, Ge, Between
+from core.amenities import has_amenities
 
-# фильтр по городу - возвращает функцию, которая проверяет, находится ли отель в нужном городе
-def filter_city(city_name: str):
-    # внутренняя функция (замыкание) - проверяет каждый отель
-    def in_city(h):
-        city = h.get("city")
-        # если у отеля нет города - сразу False
-        if city is None:
-            return False
-        # если город совпадает с нужным - True
-        if city == city_name:
-            return True
-        else:
-            return False
+# Фильтры - это объекты-предикаты из core.predicates. Их можно вызывать на
+# словаре, как раньше (filter_city("Tashkent")(hotel)), объединять через & и |,
+# превращать в условие WHERE (predicate.to_sql(columns)) или в маску NumPy
+# (predicate.mask(arrays)) - тогда фильтрация идёт в базе или векторно.
 
-    # возвращаем саму функцию - она будет использовать city_name из замыкания
-    return in_city
+# фильтр по городу - отель находится в нужном городе (без города - не подходит)
+def filter_city(city_name: str):
+    return Eq("city", city_name)
 
 
-# фильтр по вместимости - проверяет, влезает ли нужное количество гостей
+# фильтр по вместимости - в номере мест >= нужного количества
 def filter_capacity(min_guests: int):
-    def enough_space(h):
-        cap = h.get("capacity")
-        # если в номере мест >= нужного количества - подходит
-        if cap >= min_guests:
-            return True
-        else:
-            return False
-
-    return enough_space
+    return Ge("capacity", min_guests)
 
 
-# фильтр по удобствам - проверяет, есть ли все нужные фичи
+# фильтр по удобствам - в отеле есть все нужные фичи; если есть features_mask,
+# это одно побитовое И, иначе проверка по списку
 def filter_features(required):
-    def check_features(hotel):
-        features = hotel.get("features")
-        # идём по списку нужных удобств и проверяем, что каждое есть в отеле
-        for item in required:
-            if item not in features:
-                return False
-        # если все нашли - True
-        return True
+    return has_amenities(required)
 
-    return check_features
 
-
-# фильтр по цене - проверяет входит ли цена в нужный диапазон и совпадает ли валюта
+# фильтр по цене - цена в диапазоне и валюта совпадает
 def filter_price(min_price, max_price, currency):
-    def check_price(hotel):
-        hotel_currency = hotel.get("currency")
-        price = hotel.get("price")
-
-        # если валюта не совпадает - не подходит
-        if hotel_currency != currency:
-            return False
-
-        # если цена меньше минимума - не подходит
-        if price < min_price:
-            return False
-
-        # если цена больше максимума - не подходит
-        if price > max_price:
-            return False
-
-        # если все проверки прошли - отель ок
-        return True
-
-    return check_price
-
+    return Eq("currency", currency) & Between("price", min_price, max_price)
@@ -1,20 +1,59 @@
 from models import *
-from typing import Iterator, Tuple, Callable
+from typing import Iterator, Tuple, Callable, Optional
 
-def iter_available_days(avail: tuple[tuple[str, int], ...], room_type_id: str) -> Iterator[tuple[str, int]]:
-    """Лениво перебирает дни доступности для данного типа номера"""
+def index_available_days(avail: tuple[tuple[str, int], ...]) -> dict:
+    """Хеш-индекс доступности: room_type_id -> дни этого типа номера в исходном порядке"""
+    index = {}
+    for day, available_room_id in avail:
+        index.setdefault(available_room_id, []).append((day, available_room_id))
+    return index
+
+def iter_available_days(avail: tuple[tuple[str, int], ...], room_type_id: str, index: Optional[dict] = None) -> Iterator[tuple[str, int]]:
+    """Лениво перебирает дни доступности для данного типа номера
+
+    С готовым индексом (index_available_days) отдаёт только дни этого типа
+    номера, не просматривая весь кортеж avail.
+    """
+    if index is not None:
+        yield from index.get(room_type_id, ())
+        return
     for day, available_room_id in avail:
         if available_room_id == room_type_id:
             yield (day, available_room_id)
 
+def _group_by(items, key: Callable) -> dict:
+    """Группирует элементы по ключу, сохраняя их порядок"""
+    groups = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+    return groups
+
 def lazy_offers(hotels, room_types, rates, prices, avail, predicate: Callable) -> Iterator[tuple]:
+    """Лениво генерирует предложения (отель, номер, тариф, цена), прошедшие predicate
+
+    Сначала строятся хеш-индексы номеров по hotel_id, цен по (hotel_id, room_id)
+    и тарифов по id, поэтому работа пропорциональна числу цен, а не
+    отели × номера × тарифы × цены. Порядок тот же, что у вложенных циклов:
+    отель, номер, тариф (по позиции в rates), цена (по позиции в prices).
+    """
+    rooms_by_hotel = _group_by(room_types, lambda r: r['hotel_id'])
+    prices_by_room = _group_by(prices, lambda p: (p['hotel_id'], p['room_id']))
+    rates_by_id = {}
+    for position, rt in enumerate(rates):
+        rates_by_id.setdefault(rt['id'], []).append((position, rt))
+
     for h in hotels:
-        for r in room_types:
-            if r['hotel_id'] != h['id']:
+        for r in rooms_by_hotel.get(h['id'], ()):
+            room_prices = prices_by_room.get((h['id'], r['id']))
+            if not room_prices:
                 continue
-            for rt in rates:
-                for p in prices:
-                    if p['hotel_id'] == h['id'] and p['room_id'] == r['id'] and p['tariff_id'] == rt['id']:
-                        offer = (h, r, rt, p['price'])
-                        if predicate(offer):
-                            yield offer
\ No newline at end of file
+            by_tariff = _group_by(room_prices, lambda p: p['tariff_id'])
+            matched = sorted(
+                (entry for tariff_id in by_tariff for entry in rates_by_id.get(tariff_id, ())),
+                key=lambda entry: entry[0]
+            )
+            for _, rt in matched:
+                for p in by_tariff[rt['id']]:
+                    offer = (h, r, rt, p['price'])
+                    if predicate(offer):
+                        yield offer
@@ -0,0 +1,101 @@
+"""Shared fixtures - in-memory SQLite database, event bus, clock and inventory seed."""
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database.base import Base
+from core.frp import EventBus
+import models
+from models import Hotel, RoomType, RatePlan, Availability, Guest, CartItem
+
+
+@pytest.fixture(autouse=True)
+def clear_search_cache():
+    """Cached pages must not leak between tests."""
+    from controllers.search_cache import search_cache
+    search_cache.clear()
+    yield
+    search_cache.clear()
+
+
+@pytest.fixture
+def db_engine():
+    """Fresh in-memory database with all tables."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(db_engine):
+    """Session bound to the in-memory database."""
+    session = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self):
+        self.now = datetime.now(timezone.utc).timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Fake clock for anything that takes a ``clock`` callable."""
+    return FakeClock()
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    """Private event bus for the booking and payment controllers."""
+    bus = EventBus()
+    monkeypatch.setattr("controllers.booking_controller.event_bus", bus)
+    monkeypatch.setattr("controllers.payment_controller.event_bus", bus)
+    return bus
+
+
+def _seed_hotel(session, nights, rooms: int, stays):
+    """One room type with ``rooms`` free on each of ``nights``, a guest and a cart item per (checkin, checkout)."""
+    session.add_all([
+        Hotel(id=1, name="A", stars=4, city="Tashkent"),
+        RoomType(id=10, hotel_id=1, name="Std", capacity=2),
+        RatePlan(id=100, hotel_id=1, room_type_id=10, title="BB", meal="BB"),
+        Guest(id=1, name="G", email="g@example.com"),
+    ])
+    session.flush()
+    session.add_all(
+        CartItem(id=i, hotel_id=1, room_type_id=10, rate_id=100, checkin=checkin, checkout=checkout, guests=2)
+        for i, (checkin, checkout) in enumerate(stays, 1)
+    )
+    session.add_all(Availability(room_type_id=10, date=night, available=rooms) for night in nights)
+    session.commit()
+
+
+def _available(session):
+    session.expire_all()
+    return [a.available for a in session.query(Availability).order_by(Availability.day)]
+
+
+@pytest.fixture
+def seed_hotel():
+    """``seed_hotel(session, nights, rooms, stays)`` - a bookable hotel for reservation tests."""
+    return _seed_hotel
+
+
+@pytest.fixture
+def available():
+    """``available(session)`` - rooms left on each night, in date order."""
+    return _available
@@ -0,0 +1,78 @@
+"""Tests for amenity bitmasks and the has-all filter."""
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.pool import StaticPool
+from models import Hotel, RoomType
+from core.amenities import AMENITIES, BED_TYPES, BitDictionary, HasAll, has_amenities, has_beds
+from database.migrations import add_mask_columns
+
+
+def test_bit_dictionary():
+    """Names map to distinct bits; unknown names are skipped or reported."""
+    mask = AMENITIES.encode(["WiFi", "Spa", "Nonexistent"])
+    assert mask == AMENITIES.bit("WiFi") | AMENITIES.bit("Spa")
+    assert AMENITIES.decode(mask) == ("WiFi", "Spa")
+    assert AMENITIES.encode_json(None) == 0
+    assert AMENITIES.require(["WiFi", "Spa"]) == mask
+    assert AMENITIES.require(["WiFi", "Nonexistent"]) is None
+    with pytest.raises(ValueError):
+        BitDictionary(str(i) for i in range(64))
+
+
+def test_masks_maintained_on_write(db):
+    """ORM writes and plain inserts both fill the mask columns."""
+    hotel = Hotel(id=1, name="A", stars=5, city="Tashkent", features='["WiFi", "Pool"]')
+    db.add(hotel)
+    db.commit()
+    assert hotel.features_mask == AMENITIES.encode(["WiFi", "Pool"])
+    hotel.features = '["Spa"]'
+    db.commit()
+    assert db.get(Hotel, 1).features_mask == AMENITIES.bit("Spa")
+
+    db.execute(insert(RoomType), [{"id": 7, "hotel_id": 1, "name": "Std", "capacity": 2,
+                                   "beds": '["King"]', "features": '["TV", "Safe"]'}])
+    room = db.get(RoomType, 7)
+    assert room.beds_mask == BED_TYPES.bit("King")
+    assert room.features_mask == AMENITIES.encode(["TV", "Safe"])
+
+
+def test_has_all_forms_agree(db):
+    """Rows, SQL and arrays give the same answer, with or without the mask."""
+    features = ['["WiFi", "Pool", "Spa"]', '["WiFi", "Pool"]', '["WiFi", "Sunbeds"]', None]
+    db.add_all(Hotel(id=i, name=str(i), stars=3, city="X", features=f) for i, f in enumerate(features))
+    db.commit()
+    hotels = db.query(Hotel).order_by(Hotel.id).all()
+    rows = [{"features": h.features, "features_mask": h.features_mask} for h in hotels]
+    arrays = {"features_mask": np.array([h.features_mask for h in hotels])}
+    columns = {"features": Hotel.features, "features_mask": Hotel.features_mask}
+
+    for names, expected in ((["WiFi", "Pool"], [0, 1]), (["Sunbeds"], [2]), ([], [0, 1, 2, 3])):
+        predicate = has_amenities(names)
+        assert [i for i, row in enumerate(rows) if predicate(row)] == expected
+        assert [i for i, row in enumerate(rows) if predicate({"features": row["features"]})] == expected
+        sql = db.scalars(select(Hotel.id).where(predicate.to_sql(columns)).order_by(Hotel.id)).all()
+        assert sql == expected
+        if predicate.bits is not None:
+            assert np.flatnonzero(predicate.mask(arrays)).tolist() == expected
+
+
+def test_has_beds():
+    """Bed types use their own dictionary."""
+    predicate = has_beds(["Double"])
+    assert isinstance(predicate, HasAll)
+    assert predicate({"beds_mask": BED_TYPES.encode(["Double", "Single"])})
+    assert not predicate({"beds": ["Single"]})
+
+
+def test_backfill_mask_columns():
+    """A database created before the mask columns gets them filled in."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE hotels (id INTEGER PRIMARY KEY, features TEXT)"))
+        conn.execute(text("""INSERT INTO hotels VALUES (1, '["Pool", "Gym"]'), (2, NULL)"""))
+    with engine.begin() as conn:
+        add_mask_columns(conn)
+    with engine.connect() as conn:
+        masks = conn.execute(text("SELECT features_mask FROM hotels ORDER BY id")).scalars().all()
+    assert masks == [AMENITIES.encode(["Pool", "Gym"]), 0]
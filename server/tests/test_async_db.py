@@ -0,0 +1,152 @@
+"""Tests for the async controllers and the async session layer."""
+import asyncio
+import threading
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database import get_db
+from database.async_session import async_database_url
+from database.base import Base
+from models import Hotel, RoomType, RatePlan, RateInterval, Availability
+from controllers.async_controller import AsyncHotelController, AsyncSearchController, AsyncCartController
+
+DATES = ("2024-01-01", "2024-01-02")
+
+
+def seed(session):
+    """One Tashkent hotel with a single bookable rate."""
+    session.add_all([
+        Hotel(id=1, name="A", stars=5, city="Tashkent"),
+        RoomType(id=10, hotel_id=1, name="Std", capacity=2),
+        RatePlan(id=100, hotel_id=1, room_type_id=10, title="BB", meal="BB"),
+        RateInterval(rate_id=100, date_from=DATES[0], date_to="2024-01-03", amount=1000),
+    ])
+    for date in DATES:
+        session.add(Availability(room_type_id=10, date=date, available=3))
+    session.commit()
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Seeded file database shared by the request sessions and the threadpool."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'async.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as session:
+        seed(session)
+    yield factory
+    engine.dispose()
+
+
+def test_async_database_url():
+    """The sqlite driver is swapped for aiosqlite; other URLs pass through."""
+    assert async_database_url("sqlite:///./hotel_booking.db") == "sqlite+aiosqlite:///./hotel_booking.db"
+    assert async_database_url("sqlite+aiosqlite://") == "sqlite+aiosqlite://"
+
+
+@pytest.mark.asyncio
+async def test_async_search_and_cart(session_factory):
+    """Async controllers return what the sync ones would."""
+    with session_factory() as db:
+        offers = await AsyncSearchController.search_hotels(db, "Tashkent", DATES[0], DATES[-1])
+        assert [o["rate_plan"]["id"] for o in offers] == [100]
+
+        item = await AsyncCartController.add_to_cart(db, 1, 10, 100, DATES[0], DATES[-1], 2)
+        assert (await AsyncCartController.get_cart_items(db))[0]["id"] == item["id"]
+
+
+@pytest.mark.asyncio
+async def test_controllers_run_off_the_event_loop(session_factory, monkeypatch):
+    """The sync controller runs on a worker thread, not the loop's."""
+    from controllers.cart_controller import CartController
+
+    get_cart_items = CartController.get_cart_items
+    threads = []
+
+    def spy(db):
+        threads.append(threading.get_ident())
+        return get_cart_items(db)
+
+    monkeypatch.setattr(CartController, "get_cart_items", staticmethod(spy))
+    with session_factory() as db:
+        assert await AsyncCartController.get_cart_items(db) == []
+    assert threads and threads[0] != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_coalesced_async_searches_publish_each(session_factory, monkeypatch):
+    """Every caller of a shared search publishes its own SEARCH event."""
+    from core.frp import EventBus, EVENT_SEARCH
+    from controllers.search_controller import search_flight
+
+    bus = EventBus()
+    events = []
+    bus.subscribe(EVENT_SEARCH, events.append)
+    monkeypatch.setattr("controllers.search_controller.event_bus", bus)
+    coalesced = search_flight.stats()["coalesced"]
+    with session_factory() as db:
+        pages = await asyncio.gather(*(
+            AsyncSearchController.search_page(db, "Tashkent", DATES[0], DATES[-1]) for _ in range(2)
+        ))
+    assert pages[0] is pages[1]
+    assert search_flight.stats()["coalesced"] == coalesced + 1
+    assert len(events) == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesced_lookup_runs_on_its_own_session(session_factory, monkeypatch):
+    """The shared body never touches a caller's session and outlives a cancelled leader."""
+    from controllers.hotel_controller import HotelController
+
+    get_hotel_by_id = HotelController.get_hotel_by_id
+    used = []
+
+    def spy(db, hotel_id):
+        used.append(db)
+        return get_hotel_by_id(db, hotel_id)
+
+    monkeypatch.setattr(HotelController, "get_hotel_by_id", staticmethod(spy))
+    with session_factory() as first, session_factory() as second:
+        leader = asyncio.ensure_future(AsyncHotelController.get_hotel_by_id(first, 1))
+        follower = asyncio.ensure_future(AsyncHotelController.get_hotel_by_id(second, 1))
+        await asyncio.sleep(0)
+        leader.cancel()
+        first.close()
+        hotel = await follower
+    assert hotel["name"] == "A"
+    assert len(used) == 1
+    assert used[0] is not first and used[0] is not second
+
+
+@pytest.mark.asyncio
+async def test_routes_serve_concurrent_requests(session_factory):
+    """Routers run the controllers in the threadpool, many requests at a time."""
+    from app.main import app
+
+    def override():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(*(
+                client.get("/search/", params={"city": "Tashkent", "checkin": DATES[0], "checkout": DATES[-1]})
+                for _ in range(8)
+            ))
+            hotel = await client.get("/hotels/1")
+            filtered = await client.get("/filter/", params={"date": DATES[0], "city": "Tashkent", "max_price": 1000})
+            rejected = await client.get("/filter/", params={"date": DATES[0], "min_guests": 3})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert all(r.status_code == 200 for r in responses)
+    assert all(r.json()[0]["rate_plan"]["id"] == 100 for r in responses)
+    assert hotel.json()["name"] == "A"
+    assert [o["rate_id"] for o in filtered.json()] == [100]
+    assert rejected.json() == []
@@ -0,0 +1,195 @@
+"""Tests for the TTL cache and search result invalidation."""
+import random
+from concurrent.futures import ThreadPoolExecutor
+from core.cache import TTLCache, BoundedCache, CacheRegistry, cache_registry
+from core.memo import memoize, fibonacci_memo
+from core.domain import Event
+from core.frp import EventBus, EVENT_BOOKED, EVENT_PRICE_CHANGED, format_stays
+from controllers.search_cache import SearchResultCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """The oldest untouched entry goes first."""
+    cache = TTLCache(maxsize=2, ttl=None)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expires_entries(clock):
+    """Entries vanish after ttl seconds and count as expirations."""
+    start = clock.now
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+    clock.now = start + 4.9
+    assert cache.get("a") == 1
+    clock.now = start + 5.0
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+
+
+
+def test_lfu_evicts_least_frequently_used():
+    """LFU keeps the hot key even when it is the oldest."""
+    cache = BoundedCache(maxsize=2, policy="lfu")
+    cache.set("hot", 1)
+    cache.set("cold", 2)
+    for _ in range(3):
+        cache.get("hot")
+    cache.set("new", 3)
+    assert "hot" in cache and "new" in cache and "cold" not in cache
+    cache.set("newer", 4)
+    assert "hot" in cache and "new" not in cache
+
+
+def test_lfu_evicts_fewest_uses_after_removals():
+    """Popping and bumping the fewest-used keys still evicts the right victim."""
+    cache = BoundedCache(maxsize=3, policy="lfu")
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    for _ in range(2):
+        cache.get("b")
+    for _ in range(4):
+        cache.get("c")
+    cache.pop("a")
+    cache.set("b", 4)  # four uses now, c has five
+    cache.set("d", 5)
+    cache.set("e", 6)
+    assert sorted(k for k, _ in cache.items()) == ["b", "c", "e"]
+
+
+def test_lfu_matches_reference_model():
+    """Random gets, sets and pops evict what a sorted scan would."""
+    rnd = random.Random(7)
+    cache = BoundedCache(maxsize=8, policy="lfu")
+    uses, order, clock = {}, {}, 0
+    for _ in range(5000):
+        key = rnd.randrange(20)
+        action = rnd.random()
+        clock += 1
+        if action < 0.5:
+            hit = cache.get(key) is not None
+            assert hit == (key in uses)
+            if hit:
+                uses[key] += 1
+                order[key] = clock
+        elif action < 0.9:
+            if key not in uses and len(uses) == 8:
+                uses[key], order[key] = 1, clock
+                victim = min(uses, key=lambda k: (uses[k], order[k]))
+                del uses[victim], order[victim]
+            else:
+                uses[key], order[key] = uses.get(key, 0) + 1, clock
+            cache.set(key, key + 1)
+        else:
+            assert cache.pop(key) == (uses.pop(key, None) is not None)
+            order.pop(key, None)
+        assert sorted(k for k, _ in cache.items()) == sorted(uses)
+
+def test_byte_bound_evicts_until_it_fits():
+    """maxbytes evicts by accumulated size; oversized values are not kept."""
+    cache = BoundedCache(maxsize=None, maxbytes=10, sizeof=len)
+    cache.set("a", "xxxx")
+    cache.set("b", "xxxx")
+    cache.set("c", "xxxx")
+    assert "a" not in cache and cache.bytes == 8
+    cache.set("huge", "x" * 11)
+    assert "huge" not in cache and cache.stats()["evictions"] == 1
+
+
+def test_memoize_is_bounded_and_instrumented():
+    """memoize options bound the cache; the registry reports it with lru_cache functions."""
+    calls = []
+
+    @memoize(maxsize=2, name="test.square")
+    def square(x, scale=1):
+        calls.append(x)
+        return x * x * scale
+
+    assert [square(i) for i in (1, 2, 1, 3, 1)] == [1, 4, 1, 9, 1]
+    assert calls == [1, 2, 3]
+    assert square(2, scale=2) == 8
+    stats = cache_registry.stats()
+    assert stats["test.square"]["hits"] == 2 and stats["test.square"]["size"] == 2
+    fibonacci_memo(5)
+    assert cache_registry.stats()["core.memo.fibonacci_memo"]["size"] > 0
+    cache_registry.unregister("test.square")
+
+
+def test_memoize_is_safe_from_threads():
+    """Concurrent callers from a threadpool keep the bounds and counters consistent."""
+    @memoize(maxsize=50, policy="lfu", name="test.threads")
+    def ident(x):
+        return x
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(lambda i: ident(i % 100), range(5000))) == [i % 100 for i in range(5000)]
+    stats = ident.cache_stats()
+    assert stats["size"] <= 50
+    assert stats["hits"] + stats["misses"] == 5000
+    cache_registry.unregister("test.threads")
+
+
+def test_registry_reports_lru_cache_functions():
+    """functools.lru_cache functions are reported through cache_info."""
+    registry = CacheRegistry()
+    registry.register("fib", fibonacci_memo)
+    fibonacci_memo.cache_clear()
+    fibonacci_memo(3)
+    assert registry.stats()["fib"]["misses"] == 4
+    registry.clear_all()
+    assert registry.stats()["fib"]["size"] == 0
+
+def make_page(hotel_id: int, room_type_id: int) -> dict:
+    """Search page with one offer."""
+    return {
+        "results": [{"hotel": {"id": hotel_id}, "room_type": {"id": room_type_id}}],
+        "next_cursor": None,
+    }
+
+
+def test_booking_evicts_only_pages_showing_the_room_type():
+    """BOOKED without a city leaves unrelated and non-overlapping pages alone."""
+    cache = SearchResultCache(maxsize=10, ttl=None)
+    bus = EventBus()
+    cache.subscribe(bus)
+    shown = SearchResultCache.make_key("Tashkent", "2024-01-01", "2024-01-03", 1)
+    other = SearchResultCache.make_key("Samarkand", "2024-01-01", "2024-01-03", 1)
+    later = SearchResultCache.make_key("Tashkent", "2024-02-01", "2024-02-03", 1)
+    cache.put(shown, make_page(1, 10))
+    cache.put(other, make_page(2, 20))
+    cache.put(later, make_page(1, 10))
+
+    bus.publish(Event(1, "2024-01-01T00:00:00", EVENT_BOOKED, (
+        ("stays", format_stays([(10, "2024-01-02", "2024-01-04", 1)])),
+    )))
+
+    assert cache.get(shown) is None
+    assert cache.get(other) is not None
+    assert cache.get(later) is not None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_price_change_evicts_the_city_on_that_date():
+    """A city-scoped price change evicts overlapping pages of that city only."""
+    cache = SearchResultCache(maxsize=10, ttl=None)
+    bus = EventBus()
+    cache.subscribe(bus)
+    tashkent = SearchResultCache.make_key("tash", "2024-01-01", "2024-01-03", 1)
+    samarkand = SearchResultCache.make_key("Samarkand", "2024-01-01", "2024-01-03", 1)
+    cache.put(tashkent, make_page(1, 10))
+    cache.put(samarkand, make_page(2, 20))
+
+    bus.publish(Event(2, "2024-01-01T00:00:00", EVENT_PRICE_CHANGED, (
+        ("rate_id", 100), ("date", "2024-01-02"), ("amount", 1), ("city", "Tashkent"),
+    )))
+
+    assert cache.get(tashkent) is None
+    assert cache.get(samarkand) is not None
+
@@ -1,6 +1,9 @@
 """Tests for Lab 6 & 7: Composition and Services."""
 import pytest
-from core.compose import compose, pipe, partial, curry, identity, const
+from core.compose import (
+    compose, pipe, partial, curry, identity, const,
+    filter_stage, map_stage, sort_stage, fuse
+)
 
 
 def test_compose():
@@ -66,3 +69,36 @@ def test_compose_multiple():
     result = compose(subtract_three, multiply_two, add_one)(10)
     # 10 + 1 = 11, 11 * 2 = 22, 22 - 3 = 19
     assert result == 19
+
+
+def test_pipe_fuses_adjacent_stages():
+    """Adjacent filter/map stages run as one pass; plain functions split runs."""
+    seen = []
+    piped = pipe(
+        filter_stage(lambda x: seen.append(("f", x)) or x % 2 == 0),
+        map_stage(lambda x: seen.append(("m", x)) or x * 10),
+        len,
+        lambda n: (n, n + 1),
+        map_stage(lambda x: -x),
+    )
+    assert piped((1, 2, 3, 4)) == (-2, -3)
+    assert len(piped.steps) == 4
+    # Each item passes every stage before the next one is read
+    assert seen == [("f", 1), ("f", 2), ("m", 2), ("f", 3), ("f", 4), ("m", 4)]
+
+
+def test_fused_sort_and_standalone_stages():
+    """A sort stage closes the run; stages also work on their own."""
+    words = ("pear", "fig", "banana", "kiwi")
+    piped = pipe(
+        filter_stage(lambda w: len(w) > 3),
+        sort_stage(key=len, reverse=True),
+        map_stage(str.upper),
+    )
+    assert piped(words) == ("BANANA", "PEAR", "KIWI")
+    assert len(piped.steps) == 2
+    assert compose(map_stage(str.upper), filter_stage(lambda w: "i" in w))(words) == ("FIG", "KIWI")
+    assert filter_stage(lambda w: "a" in w)(words) == ("pear", "banana")
+    assert list(fuse(map_stage(len))(iter(words))) == [4, 3, 6, 4]
+    with pytest.raises(ValueError):
+        fuse(sort_stage())
@@ -0,0 +1,44 @@
+"""Tests for integer day ordinals."""
+from datetime import date
+from core.days import Day, DateRange, to_day
+from core.domain import CartItem, Price
+
+
+def test_day_round_trips_iso():
+    """Day parses ISO strings, dates and ordinals to the same ordinal."""
+    day = Day.parse("2024-02-29")
+    assert day == date(2024, 2, 29).toordinal()
+    assert Day.parse(date(2024, 2, 29)) == day == Day.parse(int(day))
+    assert day.isoformat() == str(day) == "2024-02-29"
+    assert to_day("2024-02-29T12:30:00") == day
+
+
+def test_day_weekday_matches_datetime():
+    """Weekday arithmetic agrees with datetime across a few weeks."""
+    start = Day.parse("2024-01-01")
+    for offset in range(30):
+        day = start + offset
+        assert isinstance(day, Day)
+        assert day.weekday == day.to_date().weekday()
+        assert day.is_weekend == (day.to_date().weekday() >= 5)
+    assert Day.parse("2024-01-08") - start == 7
+
+
+def test_date_range_is_half_open():
+    """A stay covers checkin up to, not including, checkout."""
+    stay = DateRange.parse("2024-01-30", "2024-02-02")
+    assert stay.nights == len(stay) == 3
+    assert stay.isoformat() == ("2024-01-30", "2024-01-31", "2024-02-01")
+    assert [d.isoformat() for d in stay] == list(stay.isoformat())
+    assert "2024-02-01" in stay and "2024-02-02" not in stay
+    assert stay.overlaps(DateRange.parse("2024-02-01", "2024-02-05"))
+    assert not stay.overlaps(DateRange.parse("2024-02-02", "2024-02-05"))
+    assert DateRange.covering(stay.isoformat()) == stay
+    assert DateRange.parse("2024-01-02", "2024-01-01").nights == 0
+
+
+def test_domain_entities_expose_days():
+    """Domain dates are available as ordinals without string handling."""
+    assert Price(1, 1, "2024-01-01", 100).day == Day.parse("2024-01-01")
+    item = CartItem(1, 1, 1, 1, "2024-01-01", "2024-01-04", 2)
+    assert item.stay.nights == 3
@@ -0,0 +1,139 @@
+"""Tests for the queue-backed EventBus."""
+import threading
+import pytest
+from core.frp import EventBus, create_event, EVENT_SEARCH, EVENT_HOLD
+
+
+def search(i: int):
+    return create_event(EVENT_SEARCH, i=i)
+
+
+def test_not_started_runs_inline():
+    """Without workers background handlers run in the publisher, as before."""
+    bus = EventBus()
+    seen = []
+    bus.subscribe(EVENT_SEARCH, lambda e: seen.append(threading.get_ident()), background=True)
+    bus.publish(search(1))
+    assert seen == [threading.get_ident()]
+    assert bus.get_subscriber_count(EVENT_SEARCH) == 1
+
+
+def test_background_handlers_run_on_workers():
+    """Inline handlers finish before publish returns; background ones on a worker."""
+    bus = EventBus()
+    release = threading.Event()
+    inline, background = [], []
+    bus.subscribe(EVENT_SEARCH, lambda e: inline.append(e))
+    bus.subscribe(EVENT_SEARCH, lambda e: release.wait(5) and background.append(threading.get_ident()), background=True)
+    bus.start(workers=2)
+    try:
+        bus.publish(search(1))
+        assert len(inline) == 1 and background == []
+        release.set()
+        assert bus.flush(timeout=5)
+        assert background and background[0] != threading.get_ident()
+    finally:
+        bus.stop()
+
+
+def blocked_bus(overflow: str, **kwargs):
+    """A started bus whose single worker is stuck on the first event."""
+    bus = EventBus(queue_size=2, overflow=overflow, **kwargs)
+    gate, started, handled = threading.Event(), threading.Event(), []
+
+    def handler(event):
+        started.set()
+        gate.wait(5)
+        handled.append(dict(event.payload)["i"])
+
+    bus.subscribe(EVENT_SEARCH, handler, background=True)
+    bus.start(workers=1)
+    bus.publish(search(0))
+    assert started.wait(5)
+    return bus, gate, handled
+
+
+def test_drop_oldest():
+    """A full queue discards its oldest events."""
+    bus, gate, handled = blocked_bus("drop_oldest")
+    for i in range(1, 6):
+        bus.publish(search(i))
+    gate.set()
+    bus.stop()
+    assert handled == ["0", "4", "5"]
+    assert bus.stats()["dropped"] == 3
+
+
+def test_sample():
+    """Only every n-th overflowing event makes it into a full queue."""
+    bus, gate, handled = blocked_bus("sample", sample_every=3)
+    for i in range(1, 10):
+        bus.publish(search(i))
+    gate.set()
+    bus.stop()
+    # 1, 2 fill the queue; of the 7 overflowing events 5 and 8 are kept
+    assert handled == ["0", "5", "8"]
+    assert bus.stats()["dropped"] == 7
+
+
+def test_block_waits_for_room():
+    """A full queue blocks the publisher until a worker takes an event."""
+    bus, gate, handled = blocked_bus("block")
+    bus.publish(search(1))
+    bus.publish(search(2))
+    publisher = threading.Thread(target=bus.publish, args=(search(3),))
+    publisher.start()
+    publisher.join(0.2)
+    assert publisher.is_alive()
+    gate.set()
+    publisher.join(5)
+    bus.stop()
+    assert handled == ["0", "1", "2", "3"]
+    assert bus.stats()["dropped"] == 0
+
+
+def test_block_worker_publishing_into_full_queue_runs_inline():
+    """A background handler that publishes into a full queue does not deadlock."""
+    bus = EventBus(queue_size=1, overflow="block")
+    holds = []
+
+    def on_search(event):
+        for i in range(3):
+            bus.publish(create_event(EVENT_HOLD, i=i))
+
+    bus.subscribe(EVENT_SEARCH, on_search, background=True)
+    bus.subscribe(EVENT_HOLD, lambda e: holds.append(dict(e.payload)["i"]), background=True)
+    bus.start(workers=1)
+    try:
+        bus.publish(search(0))
+        assert bus.flush(timeout=5)
+    finally:
+        bus.stop(timeout=1)
+    assert sorted(holds) == ["0", "1", "2"]
+    stats = bus.stats()
+    assert stats["inline"] == 2 and stats["dropped"] == 0
+
+def test_handler_metrics_and_failures():
+    """Failures are isolated and counted per handler, with latency."""
+    bus = EventBus()
+
+    def broken(event):
+        raise RuntimeError("boom")
+
+    bus.subscribe(EVENT_SEARCH, broken, background=True)
+    bus.subscribe(EVENT_SEARCH, lambda e: None)
+    bus.start()
+    for i in range(3):
+        bus.publish(search(i))
+    assert bus.stop()
+    stats = bus.stats()
+    assert stats["published"] == 3 and stats["queued"] == 3
+    failing = next(v for k, v in stats["handlers"].items() if k.endswith("broken"))
+    assert failing["calls"] == 3 and failing["failures"] == 3
+    assert "boom" in failing["last_error"]
+    assert all(v["avg_ms"] >= 0 for v in stats["handlers"].values())
+
+
+def test_invalid_overflow():
+    with pytest.raises(ValueError):
+        EventBus(overflow="spill")
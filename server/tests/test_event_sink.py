@@ -0,0 +1,127 @@
+"""Tests for write-behind event persistence."""
+import time
+import pytest
+from sqlalchemy import create_engine, event, select
+from models import Event as EventModel
+from core.domain import Event
+from core.frp import EventBus, create_event, encode_payload, decode_payload, EVENT_SEARCH, EVENT_BOOKED
+from database.event_sink import EventSink
+
+
+def stored(db_engine):
+    with db_engine.connect() as conn:
+        return [(name, decode_payload(payload)) for name, payload in conn.execute(
+            select(EventModel.name, EventModel.payload).order_by(EventModel.id)
+        )]
+
+
+def search(i: int) -> Event:
+    return create_event(EVENT_SEARCH, city="Tashkent", i=i)
+
+
+def test_payload_codec_round_trip():
+    """Separators, newlines and percent signs survive; the text is one line."""
+    payload = (("city", "Tash;kent"), ("note", "50% off\nnow\x1fx"), ("empty", ""))
+    text = encode_payload(payload)
+    assert "\n" not in text
+    assert decode_payload(text) == payload
+    assert decode_payload(encode_payload(())) == ()
+
+
+def test_batched_multi_row_inserts(db_engine):
+    """Buffered events go out in one transaction of multi-row INSERTs."""
+    statements = []
+    event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    sink = EventSink(db_engine, batch_size=100)
+    bus = EventBus()
+    sink.subscribe(bus, [EVENT_SEARCH])
+    for i in range(5):
+        bus.publish(search(i))
+    assert stored(db_engine) == []
+    assert sink.flush() == 5
+    inserts = [s for s in statements if s.startswith("INSERT")]
+    assert len(inserts) == 1 and inserts[0].count("?") == 15
+    assert [dict(p)["i"] for _, p in stored(db_engine)] == ["0", "1", "2", "3", "4"]
+
+
+def test_background_flush_by_size(db_engine):
+    """The flusher writes as soon as a batch is full."""
+    sink = EventSink(db_engine, batch_size=3, flush_interval=60)
+    sink.start()
+    try:
+        for i in range(3):
+            sink.write(search(i))
+        deadline = time.monotonic() + 5
+        while sink.stats()["written"] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(stored(db_engine)) == 3
+    finally:
+        assert sink.close()
+
+
+def test_failed_database_spills_and_recovers(db_engine, tmp_path):
+    """Events survive a dead database on disk and are replayed in order."""
+    spill = tmp_path / "events.spill"
+    broken = create_engine(f"sqlite:///{tmp_path}/missing/dir/db.sqlite")
+    sink = EventSink(broken, spill_path=str(spill))
+    sink.write(search(0))
+    assert sink.flush() == 0
+    sink.write(create_event(EVENT_BOOKED, booking_id=7))
+    assert sink.close()
+    assert sink.stats()["spilled"] == 2
+    assert not sink.persisted()
+    # A crash mid-write leaves a torn line, which is ignored
+    with open(spill, "a", encoding="utf-8") as f:
+        f.write("2024-01-01T00:00:00\x1dSEARCH")
+
+    restarted = EventSink(db_engine, spill_path=str(spill))
+    assert restarted.recover() == 2
+    assert restarted.persisted()
+    assert [name for name, _ in stored(db_engine)] == [EVENT_SEARCH, EVENT_BOOKED]
+    assert not spill.exists() and not (tmp_path / "events.spill.replay").exists()
+
+
+def test_overflow_spills_to_disk(db_engine, tmp_path):
+    """Past max_buffer, new events go straight to the spill file."""
+    sink = EventSink(db_engine, batch_size=2, max_buffer=2, spill_path=str(tmp_path / "events.spill"))
+    for i in range(5):
+        sink.write(search(i))
+    assert sink.stats() == {**sink.stats(), "buffered": 2, "spilled": 3}
+    # Spilled and buffered events are inserted in time order
+    sink.flush()
+    assert [dict(p)["i"] for _, p in stored(db_engine)] == ["0", "1", "2", "3", "4"]
+
+
+def test_failing_database_without_spill_keeps_buffer_bounded(tmp_path):
+    """With nowhere to spill, the oldest events are dropped at max_buffer."""
+    broken = create_engine(f"sqlite:///{tmp_path}/missing/dir/db.sqlite")
+    sink = EventSink(broken, batch_size=2, max_buffer=3)
+    for i in range(10):
+        sink.write(search(i))
+        sink.flush()
+    stats = sink.stats()
+    assert stats["buffered"] == 3
+    assert stats["dropped"] == 7
+    assert stats["failures"] == 10
+    # The newest events are the ones kept
+    assert [dict(decode_payload(payload))["i"] for _, _, payload in sink._buffer] == ["7", "8", "9"]
+
+
+def test_malformed_spilled_lines_are_quarantined(db_engine, tmp_path):
+    """A complete line that is not an event is set aside, not replayed forever."""
+    spill = tmp_path / "events.spill"
+    with open(spill, "w", encoding="utf-8") as f:
+        f.write(f"2024-01-01T00:00:00\x1d{EVENT_SEARCH}\x1d{encode_payload((('i', '0'),))}\n")
+        f.write("2024-01-01T00:00:01\n")
+        f.write("2024-01-01T00:00:02\x1dSEARCH\n")
+
+    sink = EventSink(db_engine, spill_path=str(spill))
+    assert sink.recover() == 1
+    assert sink.stats()["malformed"] == 2
+    assert sink.persisted()
+    assert stored(db_engine) == [(EVENT_SEARCH, (("i", "0"),))]
+    malformed = (tmp_path / "events.spill.malformed").read_text(encoding="utf-8")
+    assert malformed == "2024-01-01T00:00:01\n2024-01-01T00:00:02\x1dSEARCH\n"
+    # Later flushes are unaffected
+    sink.write(search(1))
+    assert sink.flush() == 1
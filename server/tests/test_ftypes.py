@@ -119,6 +119,10 @@ def test_validate_date_range():
     result2 = validate_date_range("2024-01-05", "2024-01-01")
     assert result2.is_left()
 
+    # Only plain YYYY-MM-DD dates
+    assert validate_date_range("2024-01-01T14:00", "2024-01-05").is_left()
+    assert validate_date_range("2024-01-01", "20240105").is_left()
+
 
 def test_either_chaining():
     """Test chaining Either operations."""
@@ -0,0 +1,135 @@
+"""Tests for expiring unpaid holds."""
+from datetime import datetime, timezone
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import sessionmaker
+from models import Booking, Hold
+from controllers.booking_controller import BookingController
+from controllers.payment_controller import PaymentController
+from controllers.hold_expiry import HoldExpiryScheduler
+from core.frp import EVENT_CANCELLED, parse_stays
+from config.settings import settings
+
+
+NIGHTS = ("2025-05-01", "2025-05-02")
+
+
+@pytest.fixture(autouse=True)
+def hold_ttl(monkeypatch, clock):
+    """Holds last a minute from the fake clock's now."""
+
+    class ClockDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(clock(), tz)
+
+    monkeypatch.setattr(settings, "HOLD_TTL", 60.0)
+    monkeypatch.setattr("controllers.booking_controller.datetime", ClockDatetime)
+
+
+@pytest.fixture
+def hotel(db, seed_hotel):
+    """Ten rooms for two nights and a cart item covering both."""
+    seed_hotel(db, NIGHTS, rooms=10, stays=[(NIGHTS[0], "2025-05-03")])
+    return db
+
+
+@pytest.fixture
+def scheduler(db_engine, bus, clock):
+    scheduler = HoldExpiryScheduler(sessionmaker(bind=db_engine), tick=1.0, slots=64, batch_size=2, clock=clock)
+    scheduler.subscribe(bus)
+    return scheduler
+
+
+def test_unpaid_booking_expires(hotel, bus, scheduler, clock, available):
+    events = []
+    bus.subscribe(EVENT_CANCELLED, events.append)
+    booking = BookingController.create_booking(hotel, 1, [1])
+    assert booking["expires_at"] is not None
+    assert scheduler.stats()["pending"] == 1
+    assert available(hotel) == [9, 9]
+
+    clock.now += 59
+    assert scheduler.expire_due() == []
+    clock.now += 2
+    assert scheduler.expire_due() == [booking["id"]]
+    assert available(hotel) == [10, 10]
+    assert BookingController.get_booking(hotel, booking["id"])["status"] == "cancelled"
+    payload = dict(events[0].payload)
+    assert payload["reason"] == "expired" and payload["penalty"] == "0"
+    assert parse_stays(payload["stays"]) == ((10, "2025-05-01", "2025-05-03", 1),)
+    assert scheduler.stats()["pending"] == 0
+
+
+def test_paid_and_cancelled_bookings_do_not_expire(hotel, bus, scheduler, clock, available):
+    paid = BookingController.create_booking(hotel, 1, [1])
+    cancelled = BookingController.create_booking(hotel, 1, [1])
+    PaymentController.create_payment(hotel, paid["id"])
+    BookingController.cancel_booking(hotel, cancelled["id"])
+    assert scheduler.stats()["pending"] == 0
+    clock.now += 120
+    assert scheduler.expire_due() == []
+    assert available(hotel) == [9, 9]
+
+
+def test_expiry_skips_bookings_settled_meanwhile(hotel, bus, available):
+    """A booking paid after its deadline came up is left alone."""
+    booking = BookingController.create_booking(hotel, 1, [1])
+    PaymentController.create_payment(hotel, booking["id"])
+    assert BookingController.expire_bookings(hotel, [booking["id"]]) == []
+    assert available(hotel) == [9, 9]
+
+
+def test_cannot_pay_expired_booking(hotel, bus, scheduler, clock):
+    booking = BookingController.create_booking(hotel, 1, [1])
+    clock.now += 61
+    scheduler.expire_due()
+    with pytest.raises(HTTPException) as e:
+        PaymentController.create_payment(hotel, booking["id"])
+    assert e.value.status_code == 400
+
+
+def test_expires_in_batches(hotel, bus, scheduler, clock, available):
+    ids = [BookingController.create_booking(hotel, 1, [1])["id"] for _ in range(5)]
+    assert available(hotel) == [5, 5]
+    clock.now += 61
+    assert scheduler.expire_due() == ids
+    assert scheduler.stats()["batches"] == 3
+    assert available(hotel) == [10, 10]
+    assert hotel.query(Hold).filter(Hold.status == "active").count() == 0
+
+
+def test_recover_after_restart(hotel, db_engine, bus, clock, available):
+    """A fresh scheduler picks up held bookings; those overdue expire first."""
+    overdue = BookingController.create_booking(hotel, 1, [1])
+    pending = BookingController.create_booking(hotel, 1, [1])
+    paid = BookingController.create_booking(hotel, 1, [1])
+    PaymentController.create_payment(hotel, paid["id"])
+    hotel.query(Booking).filter(Booking.id == overdue["id"]).update(
+        {"expires_at": datetime.fromtimestamp(clock.now - 600, timezone.utc).isoformat()}
+    )
+    hotel.add(Booking(guest_id=1, total=1, status="held"))  # held before expiry existed
+    hotel.commit()
+
+    clock.now += 30
+    restarted = HoldExpiryScheduler(sessionmaker(bind=db_engine), tick=1.0, slots=64, clock=clock)
+    assert restarted.recover() == 2
+    assert restarted.expire_due(clock.now + 1) == [overdue["id"]]
+    assert restarted.expire_due(clock.now + 31) == [pending["id"]]
+    assert available(hotel) == [9, 9]
+
+
+def test_failed_batch_is_retried(hotel, bus, scheduler, clock, monkeypatch):
+    booking = BookingController.create_booking(hotel, 1, [1])
+    clock.now += 61
+
+    def broken(db, booking_ids):
+        raise RuntimeError("database is locked")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(BookingController, "expire_bookings", staticmethod(broken))
+        assert scheduler.expire_due() == []
+    assert scheduler.stats()["failures"] == 1
+    assert scheduler.stats()["pending"] == 1
+    clock.now += 1
+    assert scheduler.expire_due() == [booking["id"]]
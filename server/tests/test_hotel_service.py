@@ -0,0 +1,53 @@
+"""Tests for the indexed offer generation in service.hotel_service."""
+import random
+from service.hotel_service import lazy_offers, iter_available_days, index_available_days
+
+
+def nested_offers(hotels, room_types, rates, prices, predicate):
+    """The former four-deep loop, as a reference."""
+    for h in hotels:
+        for r in room_types:
+            if r['hotel_id'] != h['id']:
+                continue
+            for rt in rates:
+                for p in prices:
+                    if p['hotel_id'] == h['id'] and p['room_id'] == r['id'] and p['tariff_id'] == rt['id']:
+                        offer = (h, r, rt, p['price'])
+                        if predicate(offer):
+                            yield offer
+
+
+def test_lazy_offers_matches_nested_loops():
+    """Same offers in the same order, including duplicate rate ids and orphan prices."""
+    rng = random.Random(3)
+    hotels = [{'id': i} for i in range(5)]
+    room_types = [{'id': i, 'hotel_id': rng.randrange(6)} for i in range(12)]
+    rates = [{'id': rng.randrange(6), 'name': f"T{i}"} for i in range(8)]
+    prices = [
+        {'hotel_id': rng.randrange(6), 'room_id': rng.randrange(13), 'tariff_id': rng.randrange(7), 'price': i}
+        for i in range(600)
+    ]
+    predicate = lambda offer: offer[3] % 3 != 0
+    expected = list(nested_offers(hotels, room_types, rates, prices, predicate))
+    assert expected
+    assert list(lazy_offers(hotels, room_types, rates, prices, (), predicate)) == expected
+
+
+def test_lazy_offers_is_lazy():
+    """The predicate only sees offers as they are pulled."""
+    seen = []
+    hotels = [{'id': 1}]
+    room_types = [{'id': 1, 'hotel_id': 1}]
+    rates = [{'id': 1}]
+    prices = [{'hotel_id': 1, 'room_id': 1, 'tariff_id': 1, 'price': p} for p in (10, 20, 30)]
+    offers = lazy_offers(hotels, room_types, rates, prices, (), lambda o: seen.append(o[3]) or True)
+    assert next(offers)[3] == 10
+    assert seen == [10]
+
+
+def test_iter_available_days_indexed():
+    """The indexed path yields the same days as the scan."""
+    avail = (("2024-01-01", 1), ("2024-01-01", 2), ("2024-01-02", 1), ("2024-01-03", 3))
+    index = index_available_days(avail)
+    for room_type_id in (1, 2, 3, 4):
+        assert list(iter_available_days(avail, room_type_id, index)) == list(iter_available_days(avail, room_type_id))
@@ -0,0 +1,86 @@
+"""Tests for the columnar inventory index."""
+import pytest
+from core.inventory import InventoryIndex, to_day
+from core.frp import EventBus, create_event, format_stays, EVENT_PRICE_CHANGED, EVENT_BOOKED, EVENT_CANCELLED
+from core.lazy import lazy_search_offers
+from core.domain import Hotel, RoomType, RatePlan
+
+D1, D2, D3, D4 = (to_day(d) for d in ("2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"))
+
+
+@pytest.fixture
+def index():
+    """Two room types and two rates over three nights."""
+    idx = InventoryIndex()
+    idx.load(
+        [(1, "2024-01-01", 2), (1, "2024-01-02", 1), (1, "2024-01-03", 3),
+         (2, "2024-01-01", 5), (2, "2024-01-02", 0), (2, "2024-01-03", 5)],
+        [(10, "2024-01-01", 100), (10, "2024-01-02", 200), (10, "2024-01-03", 300),
+         (20, "2024-01-01", 50), (20, "2024-01-03", 50)]
+    )
+    return idx
+
+
+def test_min_available(index):
+    """Minimum over the nights of a stay."""
+    assert index.min_available(1, D1, D4) == 1
+    assert index.is_available(1, D1, D4)
+    assert not index.is_available(1, D1, D4, rooms=2)
+    assert not index.is_available(2, D1, D3)
+    assert index.is_available(2, D3, D4)
+
+
+def test_out_of_range_is_unavailable(index):
+    """Nights outside the loaded window or unknown rooms are not available."""
+    assert not index.is_available(1, D1 - 1, D2)
+    assert not index.is_available(99, D1, D2)
+
+
+def test_stay_total(index):
+    """Sum over the nights; unpriced nights block the quote."""
+    assert index.stay_total(10, D1, D4) == 600
+    assert index.stay_total(20, D1, D4) is None
+    assert index.stay_total(20, D1, D4, require_priced=False) == 100
+
+
+def test_vectorized_batch(index):
+    """Batch methods agree with the scalar ones."""
+    assert list(index.available_mask([1, 2, 99], D1, D4)) == [True, False, False]
+    totals, complete = index.stay_totals([10, 20], D1, D4)
+    assert list(totals) == [600, 100]
+    assert list(complete) == [True, False]
+
+
+def test_updates_grow_index(index):
+    """Point updates outside the window extend the day axis."""
+    index.set_price(30, D4, 70)
+    index.set_available(3, D4, 4)
+    assert index.stay_total(30, D4, D4 + 1) == 70
+    assert index.is_available(3, D4, D4 + 1)
+    assert index.stay_total(10, D1, D4) == 600
+
+
+def test_event_updates(index):
+    """PRICE_CHANGED, BOOKED and CANCELLED keep the index current."""
+    bus = EventBus()
+    index.subscribe(bus)
+    bus.publish(create_event(EVENT_PRICE_CHANGED, rate_id=10, date="2024-01-02", amount=250))
+    assert index.stay_total(10, D1, D4) == 650
+
+    stays = format_stays([(1, "2024-01-01", "2024-01-03", 1)])
+    bus.publish(create_event(EVENT_BOOKED, booking_id=1, stays=stays))
+    assert index.min_available(1, D1, D3) == 0
+    bus.publish(create_event(EVENT_CANCELLED, booking_id=1, stays=stays))
+    assert index.min_available(1, D1, D3) == 1
+
+
+def test_lazy_search_offers_with_index(index):
+    """The lazy generator answers availability and totals from the index."""
+    hotel = Hotel(1, "A", 5, "Tashkent")
+    rooms = {1: (RoomType(1, 1, "Std", 2), RoomType(2, 1, "Lux", 2))}
+    rates = {
+        1: (RatePlan(10, 1, 1, "BB", "BB", True, 1),),
+        2: (RatePlan(20, 1, 2, "BB", "BB", True, 1),),
+    }
+    offers = list(lazy_search_offers((hotel,), rooms, rates, {}, {}, "2024-01-01", "2024-01-04", index=index))
+    assert [(o.rate_plan.id, o.total_price) for o in offers] == [(10, 600)]
@@ -1,6 +1,10 @@
 """Tests for Lab 5: Lazy evaluation."""
 import pytest
+from core.days import to_day
+from core.domain import Hotel, RoomType, RatePlan
 from core.lazy import (
+    lazy_search_offers,
+    generate_calendar,
     lazy_filter,
     lazy_map,
     take_while,
@@ -57,3 +61,28 @@ def test_lazy_evaluation_efficiency():
     
     assert len(result) == 5
     assert result == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("key", [str, to_day])
+def test_lazy_search_offers_accepts_iso_and_ordinal_keys(key):
+    """Maps keyed on ISO dates or day ordinals give the same offers."""
+    hotel = Hotel(1, "A", 5, "Tashkent")
+    rooms = {1: (RoomType(1, 1, "Std", 2), RoomType(2, 1, "Lux", 2))}
+    rates = {
+        1: (RatePlan(10, 1, 1, "BB", "BB", True, 1),),
+        2: (RatePlan(20, 1, 2, "BB", "BB", True, 1),),
+    }
+    nights = ("2024-01-01", "2024-01-02")
+    availability = {(1, key(d)): 2 for d in nights}
+    availability[(2, key("2024-01-01"))] = 1
+    prices = {(10, key(d)): 100 for d in nights}
+    offers = list(lazy_search_offers((hotel,), rooms, rates, availability, prices, "2024-01-01", "2024-01-03"))
+    assert [(o.rate_plan.id, o.total_price) for o in offers] == [(10, 200)]
+
+
+@pytest.mark.parametrize("key", [str, to_day])
+def test_generate_calendar_yields_iso_dates(key):
+    availability = {(1, key("2024-01-02")): 3}
+    assert list(generate_calendar(1, "2024-01-01", 3, availability)) == [
+        ("2024-01-01", 0), ("2024-01-02", 3), ("2024-01-03", 0)
+    ]
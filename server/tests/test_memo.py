@@ -3,10 +3,13 @@ import pytest
 from core.memo import (
     fibonacci_memo,
     calculate_date_range_price,
+    calculate_date_range_prices,
     calculate_cancellation_penalty,
     memoize,
     expensive_calculation
 )
+from core.days import Day
+from core.recursion import split_date_range
 
 
 def test_fibonacci_memo():
@@ -45,6 +48,29 @@ def test_calculate_date_range_price():
     assert price1 > 0
 
 
+def test_calculate_date_range_price_closed_form():
+    """Closed form matches pricing every day of the range one by one."""
+    for start in range(Day.parse("2024-01-01"), Day.parse("2024-01-15")):
+        for length in range(0, 20):
+            first, last = Day(start).isoformat(), Day(start + length).isoformat()
+            expected = sum(
+                12000 if Day.parse(d).is_weekend else 10000
+                for d in split_date_range(first, last)
+            )
+            assert calculate_date_range_price(first, last, 10000) == expected
+
+
+def test_calculate_date_range_prices_batch():
+    """The vectorized variant agrees with the scalar one row by row."""
+    starts = ["2024-01-01", "2024-01-05", "2024-02-28"]
+    ends = ["2024-01-05", "2024-01-05", "2024-03-03"]
+    prices = [10000, 333, 7777]
+    batch = calculate_date_range_prices(starts, ends, prices)
+    assert batch.tolist() == [
+        calculate_date_range_price(s, e, p) for s, e, p in zip(starts, ends, prices)
+    ]
+
+
 def test_calculate_cancellation_penalty():
     """Test memoized cancellation penalty."""
     # No penalty for cancellation 7+ days before
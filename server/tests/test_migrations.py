@@ -0,0 +1,151 @@
+"""Tests for versioned schema migrations and the composite lookup indexes."""
+import pytest
+from sqlalchemy import create_engine, insert, inspect, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import StaticPool
+from database.migrations import MIGRATIONS, Migration, applied_versions, migrate
+from models import Availability, Price
+from core.days import to_day
+
+
+def _legacy_engine():
+    """Database as created before the day, mask and index changes."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE room_types (id INTEGER PRIMARY KEY, hotel_id INTEGER, name TEXT, "
+            "capacity INTEGER, features TEXT, beds TEXT)"
+        ))
+        conn.execute(text(
+            "CREATE TABLE prices (id INTEGER PRIMARY KEY, rate_id INTEGER, date TEXT, amount INTEGER, currency TEXT)"
+        ))
+        conn.execute(text(
+            "CREATE TABLE availabilities (id INTEGER PRIMARY KEY, room_type_id INTEGER, date TEXT, available INTEGER)"
+        ))
+        conn.execute(text(
+            "CREATE TABLE bookings (id INTEGER PRIMARY KEY, guest_id INTEGER, total INTEGER, status TEXT)"
+        ))
+        conn.execute(text("INSERT INTO bookings VALUES (1, 1, 100, 'held')"))
+        conn.execute(text("""INSERT INTO room_types VALUES (1, 1, 'Double', 2, '["WiFi"]', '["Double"]')"""))
+        conn.execute(text(
+            "INSERT INTO prices VALUES "
+            "(1, 7, '2025-01-01', 100, 'UZS'), (2, 7, '2025-01-02', 110, 'UZS'), (3, 7, '2025-01-01', 120, 'UZS')"
+        ))
+        conn.execute(text("INSERT INTO availabilities VALUES (1, 1, '2025-01-01', 3), (2, 1, '2025-01-01', 2)"))
+    return engine
+
+
+def _plan(conn, statement) -> str:
+    """SQLite's query plan for a compiled statement, one line per step."""
+    compiled = statement.compile(conn, compile_kwargs={"literal_binds": True})
+    rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_migrate_legacy_database():
+    """Old tables get their columns, deduplicated keys and indexes."""
+    engine = _legacy_engine()
+    assert migrate(engine) == [m.version for m in MIGRATIONS]
+    with engine.connect() as conn:
+        prices = conn.execute(text("SELECT id, amount FROM prices ORDER BY id")).all()
+        available = conn.execute(text("SELECT available FROM availabilities")).scalars().all()
+        mask = conn.execute(text("SELECT beds_mask FROM room_types")).scalar()
+        expires_at = conn.execute(text("SELECT expires_at FROM bookings")).one()
+    # The newest row of a duplicated key survives
+    assert prices == [(2, 110), (3, 120)]
+    assert available == [2]
+    assert mask == 2
+    # Held bookings from before expiry never expire
+    assert expires_at == (None,)
+    indexes = {ix["name"]: ix for table in ("prices", "availabilities", "room_types", "bookings")
+               for ix in inspect(engine).get_indexes(table)}
+    assert indexes["ux_prices_rate_day"]["unique"]
+    assert indexes["ux_availabilities_room_type_day"]["column_names"] == ["room_type_id", "day"]
+    assert indexes["ix_room_types_hotel_capacity"]["column_names"] == ["hotel_id", "capacity"]
+    assert indexes["ix_bookings_status_expires"]["column_names"] == ["status", "expires_at"]
+
+
+def test_migrate_is_idempotent():
+    """A second run applies nothing; versions are recorded once."""
+    engine = _legacy_engine()
+    migrate(engine)
+    assert migrate(engine) == []
+    assert applied_versions(engine) == [m.version for m in MIGRATIONS]
+
+
+def test_migrate_fresh_database(db_engine):
+    """On tables built by create_all the migrations only record themselves."""
+    assert migrate(db_engine) == [m.version for m in MIGRATIONS]
+    with db_engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM prices")).scalar() == 0
+
+
+def test_compact_prices(db_engine):
+    """Nightly price rows become one interval per run of equal prices."""
+    with db_engine.begin() as conn:
+        conn.execute(text("PRAGMA foreign_keys=OFF"))
+        conn.execute(insert(Price.__table__), [
+            {"rate_id": 1, "date": f"2025-01-{d:02d}", "day": to_day(f"2025-01-{d:02d}"),
+             "amount": 200 if d in (4, 5) else 100, "currency": "UZS"}
+            for d in range(1, 11)
+        ])
+    migrate(db_engine)
+    with db_engine.connect() as conn:
+        intervals = conn.execute(text(
+            "SELECT date_from, date_to, amount FROM rate_intervals ORDER BY day_from"
+        )).all()
+        assert conn.execute(text("SELECT COUNT(*) FROM prices")).scalar() == 0
+    assert intervals == [
+        ("2025-01-01", "2025-01-04", 100),
+        ("2025-01-04", "2025-01-06", 200),
+        ("2025-01-06", "2025-01-11", 100),
+    ]
+
+
+def test_migrate_resumes_after_failure():
+    """A failing migration is not recorded; the next run retries from it."""
+    engine = _legacy_engine()
+    calls = []
+
+    def broken(conn):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    migrations = MIGRATIONS + (Migration(99, "broken", broken),)
+    with pytest.raises(RuntimeError):
+        migrate(engine, migrations)
+    assert applied_versions(engine) == [m.version for m in MIGRATIONS]
+    assert migrate(engine, migrations) == [99]
+
+
+def test_unique_price_per_rate_and_night(db):
+    """The unique index rejects a second price for the same night."""
+    db.execute(text("PRAGMA foreign_keys=OFF"))
+    db.add(Price(rate_id=1, date="2025-01-01", amount=100))
+    db.commit()
+    db.add(Price(rate_id=1, date="2025-01-01", amount=200))
+    with pytest.raises(IntegrityError):
+        db.commit()
+
+
+def test_price_lookup_uses_composite_index(db_engine):
+    """The stay price query seeks on (rate_id, day) instead of scanning."""
+    query = select(Price.rate_id, Price.day, Price.amount).where(
+        Price.rate_id.in_([1, 2, 3]), Price.day >= 739252, Price.day < 739255
+    )
+    with db_engine.connect() as conn:
+        plan = _plan(conn, query)
+    assert "USING INDEX ux_prices_rate_day (rate_id=? AND day>? AND day<?)" in plan
+    assert "SCAN prices" not in plan
+
+
+def test_availability_lookup_uses_composite_index(db_engine):
+    """The stay availability query seeks on (room_type_id, day)."""
+    query = select(Availability.room_type_id, Availability.day, Availability.available).where(
+        Availability.room_type_id.in_([1, 2]), Availability.day >= 739252, Availability.day < 739255
+    )
+    with db_engine.connect() as conn:
+        plan = _plan(conn, query)
+    assert "USING INDEX ux_availabilities_room_type_day (room_type_id=? AND day>? AND day<?)" in plan
+    assert "SCAN availabilities" not in plan
@@ -0,0 +1,106 @@
+"""Tests for predicate objects: rows, SQL pushdown and NumPy masks agree."""
+import numpy as np
+import pytest
+from sqlalchemy import event
+from models import Hotel, RoomType, RatePlan, RateInterval
+from core.predicates import Predicate, Eq, Between, ContainsAll, ALWAYS
+from service.filter_service import filter_city, filter_capacity, filter_features, filter_price
+from controllers.filter_controller import FilterController
+
+ROWS = [
+    {"city": "Tashkent", "capacity": 2, "features": ["WiFi", "Pool"], "price": 700, "currency": "UZS"},
+    {"city": "Tashkent", "capacity": 4, "features": ["WiFi"], "price": 1500, "currency": "UZS"},
+    {"city": "Samarkand", "capacity": 3, "features": ["WiFi", "Pool", "Spa"], "price": 900, "currency": "USD"},
+    {"city": None, "capacity": 1, "features": [], "price": 100, "currency": "UZS"},
+]
+
+PREDICATES = [
+    filter_city("Tashkent"),
+    filter_capacity(3),
+    filter_features(["WiFi", "Pool"]),
+    filter_price(500, 1000, "UZS"),
+    filter_city("Tashkent") & filter_features(["Pool"]),
+    filter_city("Samarkand") | ~filter_capacity(2),
+    ALWAYS,
+]
+
+
+def object_array(values) -> np.ndarray:
+    """1-D object array, even when the elements are tuples."""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def test_legacy_closure_behaviour():
+    """The filter_* helpers still work as plain callables on dicts."""
+    assert [filter_city("Tashkent")(r) for r in ROWS] == [True, True, False, False]
+    assert [filter_price(500, 1000, "UZS")(r) for r in ROWS] == [True, False, False, False]
+
+
+@pytest.mark.parametrize("predicate", PREDICATES, ids=repr)
+def test_mask_matches_rows(predicate):
+    """The vectorized mask selects the same rows as calling the predicate."""
+    arrays = {
+        "city": np.array([r["city"] for r in ROWS], dtype=object),
+        "capacity": np.array([r["capacity"] for r in ROWS]),
+        "features": object_array([tuple(r["features"]) for r in ROWS]),
+        "price": np.array([r["price"] for r in ROWS]),
+        "currency": np.array([r["currency"] for r in ROWS], dtype=object),
+    }
+    assert predicate.mask(arrays).tolist() == [predicate(r) for r in ROWS]
+
+
+@pytest.fixture
+def priced(db):
+    """One rate plan per row of ROWS (except the cityless one), priced on one day."""
+    for i, row in enumerate(ROWS[:3], start=1):
+        features = '["' + '", "'.join(row["features"]) + '"]'
+        db.add_all([
+            Hotel(id=i, name=f"H{i}", stars=4, city=row["city"], features=features),
+            RoomType(id=i, hotel_id=i, name="Std", capacity=row["capacity"]),
+            RatePlan(id=i, hotel_id=i, room_type_id=i, title="BB", meal="BB"),
+            RateInterval(rate_id=i, date_from="2024-01-01", date_to="2024-01-02",
+                         amount=row["price"], currency=row["currency"]),
+            RateInterval(rate_id=i, date_from="2024-01-02", date_to="2024-01-03", amount=1, currency=row["currency"]),
+        ])
+    db.commit()
+    return db
+
+
+@pytest.mark.parametrize("predicate", PREDICATES[:5], ids=repr)
+def test_sql_pushdown_matches_rows(priced, predicate):
+    """The WHERE clause keeps exactly the rows the predicate accepts."""
+    offers = FilterController.filter_offers(priced, "2024-01-01", predicate)
+    expected = [i for i, row in enumerate(ROWS[:3], start=1) if predicate(row)]
+    assert sorted(o["rate_id"] for o in offers) == expected
+
+
+def test_filter_offers_single_query(priced, db_engine):
+    """Filtering is one query that fetches only the matching rows."""
+    statements = []
+    event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    predicate = FilterController.build_predicate(city="Tashkent", features=["Pool"], max_price=1000)
+    offers = FilterController.filter_offers(priced, "2024-01-01", predicate)
+    assert [(o["hotel_id"], o["price"], o["features"]) for o in offers] == [(1, 700, ["WiFi", "Pool"])]
+    assert len(statements) == 1
+    assert "hotels.features_mask &" in statements[0]
+
+
+def test_build_predicate_skips_missing_filters():
+    """Unset query parameters add no condition."""
+    assert FilterController.build_predicate() is ALWAYS
+    predicate = FilterController.build_predicate(min_price=800)
+    assert isinstance(predicate, Between)
+    assert [predicate(r) for r in ROWS] == [False, True, True, False]
+
+
+def test_incomplete_predicate_fails_at_construction():
+    """A subclass missing an evaluation form cannot be instantiated."""
+
+    class RowsOnly(Predicate):
+        def __call__(self, row):
+            return True
+
+    with pytest.raises(TypeError):
+        RowsOnly()
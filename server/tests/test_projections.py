@@ -0,0 +1,182 @@
+"""Tests for event-fed read models."""
+from dataclasses import replace
+import pytest
+from core.domain import Event
+from core.frp import EventBus, format_stays, EVENT_SEARCH, EVENT_BOOKED, EVENT_CANCELLED, EVENT_PAYMENT
+from core.projections import ProjectionSet, OccupancyProjection, RevenueProjection, DemandProjection
+from database.event_sink import EventSink
+from controllers.projection_controller import ProjectionController
+
+
+def make_set() -> ProjectionSet:
+    return ProjectionSet(OccupancyProjection(), RevenueProjection(), DemandProjection())
+
+
+def ev(ts: str, name: str, id: int = 0, **payload) -> Event:
+    return Event(id, ts, name, tuple((k, str(v)) for k, v in payload.items()))
+
+
+def stored(events):
+    """The events with the row ids the events table gives them."""
+    return tuple(replace(event, id=i) for i, event in enumerate(events, 1))
+
+
+EVENTS = stored((
+    ev("2024-01-01T09:00:00", EVENT_SEARCH, city="Tashkent", checkin="2024-02-01", checkout="2024-02-03"),
+    ev("2024-01-01T09:05:00", EVENT_SEARCH, city="tashkent ", checkin="2024-02-02", checkout="2024-02-03"),
+    ev("2024-01-01T10:00:00", EVENT_BOOKED, booking_id=1, total=300,
+       hotel_stays=format_stays([(7, "2024-02-01", "2024-02-03", 1), (7, "2024-02-02", "2024-02-04", 1)])),
+    ev("2024-01-01T10:30:00", EVENT_BOOKED, booking_id=2, total=100,
+       hotel_stays=format_stays([(8, "2024-02-02", "2024-02-03", 2)])),
+    ev("2024-01-01T11:00:00", EVENT_PAYMENT, booking_id=1, payment_id=1, amount=300),
+    ev("2024-01-02T08:00:00", EVENT_PAYMENT, booking_id=2, payment_id=2, amount=100),
+    ev("2024-01-02T12:00:00", EVENT_CANCELLED, booking_id=1, penalty=50),
+))
+
+
+def test_projections_fold_events():
+    """Each read model answers with a lookup after the events are applied."""
+    bus, models = EventBus(), make_set()
+    models.subscribe(bus)
+    for event in EVENTS:
+        bus.publish(event)
+
+    occupancy = models["occupancy"]
+    # Booking 1 was cancelled, so only booking 2's rooms remain
+    assert occupancy.rooms_booked(7, "2024-02-02") == 0
+    assert occupancy.rooms_booked(8, "2024-02-02") == 2
+    revenue = models["revenue"]
+    assert revenue.revenue_on("2024-01-01") == 300
+    assert revenue.revenue_on("2024-01-02") == 100 - 250
+    assert revenue.total == 150
+    demand = models["demand"]
+    assert demand.searches("TASHKENT") == 2
+    assert demand.searches_for_night("Tashkent", "2024-02-02") == 2
+    assert demand.searches_for_night("Tashkent", "2024-02-03") == 0
+    assert models.checkpoint == EVENTS[-1].id
+
+
+def test_occupancy_before_cancel():
+    """Overlapping stays of one booking add up per night."""
+    models = make_set()
+    for event in EVENTS[2:4]:
+        models.apply(event)
+    occupancy = models["occupancy"]
+    assert [occupancy.rooms_booked(7, f"2024-02-0{d}") for d in range(1, 5)] == [1, 2, 1, 0]
+
+
+def test_snapshot_and_replay_match_full_rebuild(db, db_engine, tmp_path):
+    """Snapshot + events after its checkpoint gives the same state as a full replay."""
+    sink = EventSink(db_engine)
+    for event in EVENTS:
+        sink.write(event)
+    sink.flush()
+    path = str(tmp_path / "projections.json")
+
+    partial = make_set()
+    partial.replay(EVENTS[:4])
+    partial.save(path)
+
+    restored = make_set()
+    result = ProjectionController.rebuild(db, restored, path)
+    assert result == {"restored": True, "replayed": 3, "checkpoint": EVENTS[-1].id}
+
+    full = make_set()
+    assert ProjectionController.rebuild(db, full)["replayed"] == len(EVENTS)
+    for name in full.names():
+        assert restored[name].snapshot() == full[name].snapshot()
+
+
+def test_events_sharing_the_checkpoint_timestamp_are_replayed(db, db_engine, tmp_path):
+    """A snapshot taken between two events of one instant still replays the second."""
+    ts = "2024-01-01T10:00:00"
+    burst = (
+        ev(ts, EVENT_SEARCH, city="Tashkent"),
+        ev(ts, EVENT_SEARCH, city="Tashkent"),
+    )
+    sink = EventSink(db_engine)
+    sink.write(burst[0])
+    sink.flush()
+    path = str(tmp_path / "projections.json")
+
+    live = make_set()
+    live.apply(burst[0])
+    assert ProjectionController.save(db, live, path) == 1
+
+    sink.write(burst[1])
+    sink.flush()
+    restored = make_set()
+    assert ProjectionController.rebuild(db, restored, path) == {"restored": True, "replayed": 1, "checkpoint": 2}
+    assert restored["demand"].searches("Tashkent") == 2
+
+
+def test_timestamp_checkpoint_is_rebuilt(tmp_path):
+    """Snapshots checkpointed on timestamps by older releases are rebuilt from events."""
+    path = str(tmp_path / "projections.json")
+    models = make_set()
+    models.apply(EVENTS[0])
+    models.save(path, 1)
+    with open(path) as f:
+        document = f.read().replace('"checkpoint":1', '"checkpoint":"2024-01-01T09:00:00"')
+    with open(path, "w") as f:
+        f.write(document)
+    assert not make_set().load(path)
+
+
+def test_stale_snapshot_is_rebuilt(tmp_path):
+    """A snapshot from another projection version is ignored."""
+    path = str(tmp_path / "projections.json")
+    models = make_set()
+    models.apply(EVENTS[0])
+    models.save(path)
+
+    class DemandV2(DemandProjection):
+        version = DemandProjection.version + 1
+
+    newer = ProjectionSet(OccupancyProjection(), RevenueProjection(), DemandV2())
+    assert not newer.load(path)
+    assert newer.checkpoint is None and newer["demand"].searches("Tashkent") == 0
+    assert make_set().load(path)
+
+
+def test_demand_counts_only_bounded_upcoming_nights():
+    """Long or far-off stays count towards the city only; past nights are forgotten."""
+    models = ProjectionSet(DemandProjection(max_nights=30, horizon=60, max_cities=2))
+    models.apply(ev("2024-01-01T09:00:00", EVENT_SEARCH, city="Tashkent", checkin="1000-01-01", checkout="2999-12-31"))
+    models.apply(ev("2024-01-01T09:01:00", EVENT_SEARCH, city="Tashkent", checkin="2024-02-25", checkout="2024-03-05"))
+    models.apply(ev("2024-01-01T09:02:00", EVENT_SEARCH, city="Samarkand", checkin="2024-01-01", checkout="2024-01-03"))
+    models.apply(ev("2024-01-01T09:03:00", EVENT_SEARCH, city="Bukhara", checkin="2024-01-01", checkout="2024-01-03"))
+    demand = models["demand"]
+    assert demand.searches("Tashkent") == 2 and demand.searches("Bukhara") == 0
+    # Nights from 2024-03-01 on are beyond the 60-day horizon
+    assert demand.searches_for_night("Tashkent", "2024-02-29") == 1
+    assert demand.searches_for_night("Tashkent", "2024-03-01") == 0
+    assert len(demand.by_city_night) == 5 + 2
+
+    models.apply(ev("2024-01-02T09:00:00", EVENT_SEARCH, city="Samarkand"))
+    assert demand.searches_for_night("Samarkand", "2024-01-01") == 0
+    assert demand.searches_for_night("Samarkand", "2024-01-02") == 1
+
+def test_finished_bookings_are_compacted(tmp_path):
+    """Once the events reach a booking's checkout its per-booking state is dropped."""
+    models = make_set()
+    for event in EVENTS[:6]:
+        models.apply(event)
+    assert set(models["occupancy"].bookings) == {1, 2}
+    assert set(models["revenue"].paid) == {1, 2}
+
+    # Booking 2 checks out on 2024-02-03, booking 1 on 2024-02-04
+    models.apply(ev("2024-02-03T08:00:00", EVENT_SEARCH, city="Tashkent"))
+    assert set(models["occupancy"].bookings) == {1}
+    assert set(models["revenue"].paid) == {1}
+    # The nights already counted stay in the read models
+    assert models["occupancy"].rooms_booked(8, "2024-02-02") == 2
+    assert models["revenue"].total == 400
+
+    models.apply(ev("2024-02-04T08:00:00", EVENT_SEARCH, city="Tashkent"))
+    path = str(tmp_path / "projections.json")
+    models.save(path)
+    restored = make_set()
+    assert restored.load(path)
+    assert restored["occupancy"].bookings == {} and restored["revenue"].paid == {}
+    assert restored["revenue"].checkouts == {}
@@ -0,0 +1,80 @@
+"""Tests for prefix-sum price tables."""
+import numpy as np
+import pytest
+from core.quotes import PriceTable, to_day
+from core.service import QuoteService
+
+
+@pytest.fixture
+def table():
+    """Rate 1 priced 100/200/300, rate 2 with a gap on the second night."""
+    t = PriceTable()
+    t.load([
+        (1, "2024-01-01", 100), (1, "2024-01-02", 200), (1, "2024-01-03", 300),
+        (2, "2024-01-01", 50), (2, "2024-01-03", 70),
+    ])
+    return t
+
+
+def test_quote_is_prefix_difference(table):
+    """Stay totals over half-open night ranges."""
+    assert table.quote(1, "2024-01-01", "2024-01-04") == 600
+    assert table.quote(1, "2024-01-02", "2024-01-03") == 200
+    assert table.quote(1, "2024-01-01", "2024-01-01") is None
+
+
+def test_quote_gaps_and_range(table):
+    """Unpriced nights and unknown rates do not produce a complete quote."""
+    assert table.quote(2, "2024-01-01", "2024-01-04") is None
+    assert table.quote(2, "2024-01-01", "2024-01-04", require_priced=False) == 120
+    assert table.quote(3, "2024-01-01", "2024-01-02") is None
+    assert table.quote(1, "2023-12-31", "2024-01-02") is None
+
+
+def test_quote_batch(table):
+    """Batch quotes agree with single quotes."""
+    rates = [1, 1, 2, 2, 9]
+    checkins = ["2024-01-01", "2024-01-02", "2024-01-01", "2024-01-03", "2024-01-01"]
+    checkouts = ["2024-01-04", "2024-01-04", "2024-01-02", "2024-01-04", "2024-01-02"]
+    totals, complete = QuoteService.quote_batch(table, rates, checkins, checkouts)
+    assert list(totals) == [600, 500, 50, 70, 0]
+    assert list(complete) == [True, True, True, True, False]
+
+
+def test_set_price_incremental(table):
+    """Single-night changes shift the prefix suffix only."""
+    table.set_price(1, "2024-01-02", 250)
+    assert table.quote(1, "2024-01-01", "2024-01-04") == 650
+    table.set_price(2, "2024-01-02", 10)
+    assert table.quote(2, "2024-01-01", "2024-01-04") == 130
+    assert table.price_of(2, "2024-01-02") == 10
+
+
+def test_set_price_grows_table(table):
+    """Nights outside the window and new rates extend the table."""
+    table.set_price(1, "2024-01-04", 400)
+    table.set_price(1, "2023-12-31", 10)
+    table.set_price(5, "2024-01-02", 99)
+    assert table.quote(1, "2023-12-31", "2024-01-05") == 1010
+    assert table.quote(5, "2024-01-02", "2024-01-03") == 99
+
+
+def test_matches_naive_sum():
+    """Random updates keep the table equal to a plain per-night sum."""
+    rng = np.random.default_rng(1)
+    base = to_day("2024-01-01")
+    nightly = {}
+    table = PriceTable()
+    table.load([])
+    for _ in range(300):
+        rate, day, amount = int(rng.integers(1, 4)), base + int(rng.integers(0, 20)), int(rng.integers(1, 1000))
+        nightly[(rate, day)] = amount
+        table.set_price(rate, day, amount)
+    for rate in (1, 2, 3):
+        expected = sum(nightly.get((rate, d), 0) for d in range(base + 3, base + 15))
+        assert table.quote(rate, base + 3, base + 15, require_priced=False) == expected
+
+
+def test_calculate_quote_with_table(table):
+    """QuoteService uses the table when given."""
+    assert QuoteService.calculate_quote(1, "2024-01-01", "2024-01-03", {}, table=table) == 300
@@ -0,0 +1,195 @@
+"""Tests for run-length rate intervals."""
+import random
+import pytest
+from fastapi import HTTPException
+from core.days import Day, DateRange
+from core.domain import Price
+from core.frp import EventBus, create_event, EVENT_PRICE_CHANGED
+from core.inventory import InventoryIndex
+from core.rates import RateRun, RateSchedule, encode_runs, expand_prices, merge_runs, set_range
+from controllers.rate_controller import RateController
+from controllers.search_engine import SearchEngine
+from models import Hotel, RoomType, RatePlan, RateInterval, Availability
+
+D = Day.parse("2025-01-01")
+
+
+def test_encode_runs():
+    """Consecutive nights with one price become one run; a gap or change splits."""
+    nights = [(D + i, 100, "UZS") for i in range(5)] + [(D + 5, 120, "UZS"), (D + 7, 120, "UZS")]
+    assert encode_runs(nights) == [
+        RateRun(D, D + 5, 100), RateRun(D + 5, D + 6, 120), RateRun(D + 7, D + 8, 120)
+    ]
+
+
+def test_encode_runs_currency_splits():
+    assert len(encode_runs([(D, 100, "UZS"), (D + 1, 100, "USD")])) == 2
+
+
+def test_set_range_splits():
+    """Pricing the middle of a run leaves its two ends."""
+    runs = set_range([RateRun(D, D + 10, 100)], D + 3, D + 5, 150)
+    assert runs == [RateRun(D, D + 3, 100), RateRun(D + 3, D + 5, 150), RateRun(D + 5, D + 10, 100)]
+
+
+def test_set_range_merges():
+    """Setting the old price back merges the three runs into one."""
+    runs = set_range([RateRun(D, D + 3, 100), RateRun(D + 3, D + 5, 150), RateRun(D + 5, D + 10, 100)],
+                     D + 3, D + 5, 100)
+    assert runs == [RateRun(D, D + 10, 100)]
+
+
+def test_set_range_covers_several_runs():
+    runs = set_range([RateRun(D, D + 2, 1), RateRun(D + 2, D + 4, 2), RateRun(D + 4, D + 6, 3)], D + 1, D + 5, 9)
+    assert runs == [RateRun(D, D + 1, 1), RateRun(D + 1, D + 5, 9), RateRun(D + 5, D + 6, 3)]
+
+
+def test_set_range_empty():
+    with pytest.raises(ValueError):
+        set_range([], D + 1, D + 1, 100)
+
+
+def test_set_range_matches_nightly_model():
+    """Random updates agree with a dict of one price per night."""
+    rnd = random.Random(7)
+    runs, nightly = [], {}
+    for _ in range(300):
+        start = D + rnd.randrange(60)
+        end = start + rnd.randrange(1, 15)
+        amount = rnd.choice((100, 120, 150))
+        runs = set_range(runs, start, end, amount)
+        nightly.update((day, amount) for day in range(start, end))
+        assert runs == encode_runs((day, amount, "UZS") for day, amount in nightly.items())
+    assert all(a.end <= b.start for a, b in zip(runs, runs[1:]))
+
+
+def test_schedule_lookups():
+    schedule = RateSchedule([RateRun(D + 5, D + 8, 200), RateRun(D, D + 5, 100)])
+    assert schedule.amount_on(D) == 100
+    assert schedule.amount_on(D + 7) == 200
+    assert schedule.amount_on(D + 8) is None
+    assert schedule.amount_on(D - 1) is None
+    assert schedule.stay_total(D + 3, D + 7) == 2 * 100 + 2 * 200
+    assert schedule.stay_total(D + 6, D + 9) is None
+    assert schedule.stay_total(D + 6, D + 9, require_priced=False) == 400
+    assert list(schedule.nights(D + 4, D + 6)) == [(D + 4, 100, "UZS"), (D + 5, 200, "UZS")]
+
+
+def test_expand_prices():
+    """The adapter yields the per-night Price entities."""
+    prices = list(expand_prices(7, [RateRun(D, D + 2, 100)]))
+    assert prices == [
+        Price(id=0, rate_id=7, date="2025-01-01", amount=100),
+        Price(id=0, rate_id=7, date="2025-01-02", amount=100),
+    ]
+    assert [p.day for p in expand_prices(7, [RateRun(D, D + 10, 1)], D + 8, D + 20)] == [D + 8, D + 9]
+
+
+def test_merge_runs_drops_empty():
+    assert merge_runs([RateRun(D, D, 1), RateRun(D, D + 1, 1), RateRun(D + 1, D + 2, 1)]) == [RateRun(D, D + 2, 1)]
+
+
+@pytest.fixture
+def rate_db(db):
+    """One Tashkent room type with one rate priced for ten nights."""
+    db.add_all([
+        Hotel(id=1, name="A", stars=5, city="Tashkent"),
+        RoomType(id=10, hotel_id=1, name="Std", capacity=2),
+        RatePlan(id=100, hotel_id=1, room_type_id=10, title="BB", meal="BB"),
+        RateInterval(rate_id=100, date_from="2025-01-01", date_to="2025-01-11", amount=100),
+    ])
+    db.add_all(Availability(room_type_id=10, date=(D + i).isoformat(), available=2) for i in range(10))
+    db.commit()
+    return db
+
+
+def test_interval_day_columns(rate_db):
+    row = rate_db.query(RateInterval).one()
+    assert (row.day_from, row.day_to) == (D, D + 10)
+
+
+def test_set_rate_splits_and_merges(rate_db, monkeypatch):
+    bus = EventBus()
+    events = []
+    bus.subscribe(EVENT_PRICE_CHANGED, events.append)
+    monkeypatch.setattr("controllers.rate_controller.event_bus", bus)
+
+    intervals = RateController.set_rate(rate_db, 100, "2025-01-04", "2025-01-06", 150)
+    assert [(i["date_from"], i["date_to"], i["amount"]) for i in intervals] == [
+        ("2025-01-01", "2025-01-04", 100),
+        ("2025-01-04", "2025-01-06", 150),
+        ("2025-01-06", "2025-01-11", 100),
+    ]
+    assert dict(events[0].payload)["date_to"] == "2025-01-06"
+
+    intervals = RateController.set_rate(rate_db, 100, "2025-01-04", "2025-01-06", 100)
+    assert [(i["date_from"], i["date_to"]) for i in intervals] == [("2025-01-01", "2025-01-11")]
+    assert rate_db.query(RateInterval).count() == 1
+
+
+def test_set_rate_extends_and_merges_neighbour(rate_db):
+    """A range right after an equal interval extends it."""
+    intervals = RateController.set_rate(rate_db, 100, "2025-01-11", "2025-01-15", 100)
+    assert [(i["date_from"], i["date_to"]) for i in intervals] == [("2025-01-01", "2025-01-15")]
+
+
+def test_set_rate_errors(rate_db):
+    with pytest.raises(HTTPException) as e:
+        RateController.set_rate(rate_db, 999, "2025-01-01", "2025-01-02", 1)
+    assert e.value.status_code == 404
+    with pytest.raises(HTTPException) as e:
+        RateController.set_rate(rate_db, 100, "2025-01-02", "2025-01-02", 1)
+    assert e.value.status_code == 400
+
+
+def test_price_shaped_reads(rate_db):
+    """Per-night reads through the adapter."""
+    RateController.set_rate(rate_db, 100, "2025-01-02", "2025-01-03", 130)
+    prices = RateController.get_prices(rate_db, 100, "2025-01-01", "2025-01-04")
+    assert [(p["date"], p["amount"]) for p in prices] == [
+        ("2025-01-01", 100), ("2025-01-02", 130), ("2025-01-03", 100)
+    ]
+    assert RateController.night_prices(rate_db, [100], D + 1, D + 3) == {(100, D + 1): 130, (100, D + 2): 100}
+    assert len(list(RateController.price_rows(rate_db))) == 10
+
+
+def test_stay_totals_from_intervals(rate_db):
+    """The search engine sums each interval's overlap with the stay."""
+    RateController.set_rate(rate_db, 100, "2025-01-03", "2025-01-05", 300)
+    stay = DateRange.parse("2025-01-02", "2025-01-06")
+    totals = SearchEngine.fetch_rate_totals(rate_db, "Tashkent", 2, stay)
+    assert [total for _, total in totals[10]] == [100 + 300 + 300 + 100]
+    schedule = RateController.schedules(rate_db, [100], stay.start, stay.end)[100]
+    assert schedule.stay_total(stay.start, stay.end) == 800
+    assert RateController.stay_totals(rate_db, [100, 999], stay.start, stay.end) == {100: 800, 999: None}
+    late = DateRange.parse("2025-01-09", "2025-01-13")
+    assert RateController.stay_totals(rate_db, [100], late.start, late.end) == {100: None}
+    # The stay runs past the priced nights
+    assert SearchEngine.fetch_rate_totals(rate_db, "Tashkent", 2, DateRange.parse("2025-01-09", "2025-01-13")) == {}
+
+
+def test_streamed_offers_are_priced_from_schedules(rate_db, monkeypatch):
+    """Without the index, streamed offers take their totals from RateController.stay_totals."""
+    from controllers.search_controller import SearchController
+
+    RateController.set_rate(rate_db, 100, "2025-01-03", "2025-01-05", 300)
+    calls = []
+    stay_totals = RateController.stay_totals
+
+    def spy(db, rate_ids, start, end):
+        calls.append((start, end))
+        return stay_totals(db, rate_ids, start, end)
+
+    monkeypatch.setattr(RateController, "stay_totals", staticmethod(spy))
+    offers = list(SearchController.stream_offers(rate_db, "Tashkent", "2025-01-02", "2025-01-06", guests=2))
+    assert [(o["rate_plan"]["id"], o["total_price"]) for o in offers] == [(100, 800)]
+    assert calls == [(D + 1, D + 5)]
+    assert list(SearchController.stream_offers(rate_db, "Tashkent", "2025-01-09", "2025-01-13")) == []
+
+def test_price_changed_range_updates_index(rate_db):
+    index = InventoryIndex()
+    index.load([], RateController.price_rows(rate_db))
+    bus = EventBus()
+    index.subscribe(bus)
+    bus.publish(create_event(EVENT_PRICE_CHANGED, rate_id=100, date="2025-01-02", date_to="2025-01-04", amount=50))
+    assert index.stay_total(100, D, D + 4) == 100 + 50 + 50 + 100
@@ -7,7 +7,11 @@ from core.recursion import (
     max_depth,
     count_leaves,
     sum_recursive,
-    reverse_recursive
+    reverse_recursive,
+    trampoline,
+    tail_call,
+    iter_flatten,
+    iter_date_range
 )
 
 
@@ -61,3 +65,57 @@ def test_reverse_recursive():
     items = (1, 2, 3, 4, 5)
     reversed_items = reverse_recursive(items)
     assert reversed_items == (5, 4, 3, 2, 1)
+
+
+def deep_tree(depth: int) -> tuple:
+    """(0, (1, (2, ... (depth - 1,) ...)))."""
+    tree = (depth - 1,)
+    for i in range(depth - 2, -1, -1):
+        tree = (i, tree)
+    return tree
+
+
+def test_trampoline_runs_tail_calls_in_constant_stack():
+    """A countdown far past the recursion limit completes."""
+    def countdown(n):
+        return n if n == 0 else tail_call(countdown, n - 1)
+    
+    assert trampoline(countdown)(100000) == 0
+
+
+def test_split_date_range_is_stack_safe():
+    """Ten thousand nights split without RecursionError."""
+    dates = split_date_range("2000-01-01", "2027-05-19")
+    assert len(dates) == 10000
+    assert dates[-1] == "2027-05-18"
+    assert tuple(iter_date_range("2000-01-01", "2027-05-19")) == dates
+
+
+def test_deep_trees_are_stack_safe():
+    """Tree functions handle nesting far deeper than the recursion limit."""
+    tree = deep_tree(50000)
+    assert max_depth(tree) == 50000
+    assert count_leaves(tree) == 50000
+    assert flatten_tuple(tree) == tuple(range(50000))
+    assert flatten_tuple(filter_tree(lambda x: x % 2 == 0, tree)) == tuple(range(0, 50000, 2))
+
+
+def test_filter_tree_keeps_structure():
+    """Empty branches are dropped and the nesting of kept leaves is preserved."""
+    tree = (1, (2, 3), (4, (5, 6)), (), 7)
+    assert filter_tree(lambda x: x > 3, tree) == ((4, (5, 6)), 7)
+    assert max_depth(((),)) == 2 and count_leaves(((),)) == 0
+
+
+def test_long_sequences_are_linear():
+    """Sum and reverse work far past the recursion limit."""
+    numbers = tuple(range(100000))
+    assert sum_recursive(numbers) == sum(numbers)
+    assert reverse_recursive(numbers)[:3] == (99999, 99998, 99997)
+
+
+def test_iter_flatten_is_lazy():
+    """Leaves stream out before the rest of the tree is visited."""
+    leaves = iter_flatten((1, (2, (3,)), 4))
+    assert next(leaves) == 1
+    assert list(leaves) == [2, 3, 4]
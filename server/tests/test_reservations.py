@@ -0,0 +1,149 @@
+"""Tests for atomic inventory holds."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database.base import Base
+from database.session import apply_sqlite_profile
+from models import CartItem, Booking, Hold
+from controllers.booking_controller import BookingController
+from controllers.reservation_controller import ReservationController
+from core.days import Day
+from core.inventory import InventoryIndex
+from core.frp import EVENT_BOOKED, EVENT_CANCELLED, parse_stays
+
+NIGHTS = ("2025-03-01", "2025-03-02", "2025-03-03")
+CHECKOUT = "2025-03-04"
+# Cart items 1 and 2: the whole stay, and its last night only
+STAYS = ((NIGHTS[0], CHECKOUT), (NIGHTS[2], CHECKOUT))
+
+
+@pytest.fixture
+def inventory(db, seed_hotel):
+    seed_hotel(db, NIGHTS, rooms=2, stays=STAYS)
+    return db
+
+
+def test_booking_takes_every_night(inventory, bus, available):
+    events = []
+    bus.subscribe(EVENT_BOOKED, events.append)
+    booking = BookingController.create_booking(inventory, 1, [1])
+    assert available(inventory) == [1, 1, 1]
+    assert ReservationController.active_holds(inventory, booking["id"]) == [
+        {"room_type_id": 10, "checkin": NIGHTS[0], "checkout": CHECKOUT, "rooms": 1}
+    ]
+    assert parse_stays(dict(events[0].payload)["stays"]) == ((10, NIGHTS[0], CHECKOUT, 1),)
+
+
+def test_booking_publishes_normalised_dates(inventory, bus, available):
+    """A cart item stored with a time suffix books the same nights in the DB and the index."""
+    index = InventoryIndex()
+    index.load([(10, night, 2) for night in NIGHTS], [])
+    index.subscribe(bus)
+    inventory.query(CartItem).filter(CartItem.id == 1).update({"checkin": NIGHTS[0] + "T14:00"})
+    inventory.commit()
+    BookingController.create_booking(inventory, 1, [1])
+    assert available(inventory) == [1, 1, 1]
+    assert [index.min_available(10, Day.parse(night), Day.parse(night) + 1) for night in NIGHTS] == [1, 1, 1]
+    handlers = bus.stats()["handlers"]
+    assert all(stats["failures"] == 0 for stats in handlers.values())
+
+def test_sold_out_night_rolls_back(inventory, bus, available):
+    """One full night fails the whole booking and takes nothing."""
+    BookingController.create_booking(inventory, 1, [2])
+    BookingController.create_booking(inventory, 1, [2])
+    assert available(inventory) == [2, 2, 0]
+    with pytest.raises(HTTPException) as e:
+        BookingController.create_booking(inventory, 1, [1])
+    assert e.value.status_code == 409
+    assert available(inventory) == [2, 2, 0]
+    assert inventory.query(Booking).count() == 2
+    assert inventory.query(Hold).count() == 2
+
+
+def test_multi_item_booking_is_all_or_nothing(inventory, bus, available):
+    """Two items need two rooms on the last night; with one left neither is taken."""
+    BookingController.create_booking(inventory, 1, [2])
+    with pytest.raises(HTTPException):
+        BookingController.create_booking(inventory, 1, [1, 2])
+    assert available(inventory) == [2, 2, 1]
+
+
+def test_cancel_releases_once(inventory, bus, available):
+    events = []
+    bus.subscribe(EVENT_CANCELLED, events.append)
+    booking = BookingController.create_booking(inventory, 1, [1, 2])
+    assert available(inventory) == [1, 1, 0]
+    assert BookingController.cancel_booking(inventory, booking["id"])["status"] == "cancelled"
+    assert available(inventory) == [2, 2, 2]
+    assert len(parse_stays(dict(events[0].payload)["stays"])) == 2
+    with pytest.raises(HTTPException):
+        BookingController.cancel_booking(inventory, booking["id"])
+    assert ReservationController.release(inventory, booking["id"]) == ()
+    assert available(inventory) == [2, 2, 2]
+
+
+def test_reserve_needs_an_inventory_row(inventory, available):
+    """A night without an availability row counts as sold out."""
+    start = Day.parse(NIGHTS[0])
+    assert not ReservationController.reserve(inventory, 10, start, start + 4)
+    inventory.rollback()
+    assert available(inventory) == [2, 2, 2]
+
+
+def test_no_oversell_under_parallel_load(tmp_path, bus, seed_hotel, available):
+    """Hundreds of concurrent bookers on a file database sell exactly the rooms there are."""
+    rooms, bookers = 25, 300
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/stress.db",
+        connect_args={"check_same_thread": False},
+        pool_size=32,
+        max_overflow=0,
+        pool_timeout=60
+    )
+    apply_sqlite_profile(engine, "balanced")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as session:
+        seed_hotel(session, NIGHTS, rooms, STAYS)
+
+    start = threading.Barrier(32)
+    results = []
+
+    def book(i):
+        if i < 32:
+            start.wait()
+        with factory() as session:
+            try:
+                results.append(BookingController.create_booking(session, 1, [1])["id"])
+            except HTTPException as e:
+                assert e.status_code == 409
+                results.append(None)
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        list(pool.map(book, range(bookers)))
+
+    booked = [booking_id for booking_id in results if booking_id is not None]
+    assert len(results) == bookers
+    assert len(booked) == rooms
+    with factory() as session:
+        assert available(session) == [0, 0, 0]
+
+    def cancel(booking_id):
+        with factory() as session:
+            try:
+                BookingController.cancel_booking(session, booking_id)
+                return 1
+            except HTTPException:
+                return 0
+
+    # Every booking cancelled twice at once: each releases exactly once
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        cancelled = sum(pool.map(cancel, booked + booked))
+    assert cancelled == rooms
+    with factory() as session:
+        assert available(session) == [rooms, rooms, rooms]
+        assert session.query(Hold).filter(Hold.status == "active").count() == 0
+    engine.dispose()
@@ -0,0 +1,51 @@
+"""Tests for row-wise range-minimum segment trees."""
+import numpy as np
+from core.rmq import RangeMinTree
+
+
+def test_query_matches_slice_min():
+    """Every range agrees with a plain slice minimum."""
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 10, size=(3, 13))
+    tree = RangeMinTree(values)
+    for row in range(3):
+        for lo in range(13):
+            for hi in range(lo + 1, 14):
+                assert tree.query(row, lo, hi) == values[row, lo:hi].min()
+
+
+def test_query_rows():
+    """Many rows over the same range at once."""
+    values = np.array([[5, 1, 7, 3], [2, 8, 9, 4], [6, 6, 0, 6]])
+    tree = RangeMinTree(values)
+    assert list(tree.query_rows(np.array([0, 1, 2]), 1, 4)) == [1, 4, 0]
+    assert list(tree.query_rows(np.array([2, 0]), 0, 2)) == [6, 1]
+
+
+def test_point_update_and_range_add():
+    """Updates keep every ancestor consistent."""
+    rng = np.random.default_rng(1)
+    values = rng.integers(0, 10, size=(2, 20))
+    tree = RangeMinTree(values.copy())
+    for _ in range(200):
+        row, lo = int(rng.integers(0, 2)), int(rng.integers(0, 20))
+        hi = int(rng.integers(lo + 1, 21))
+        if rng.random() < 0.5:
+            value = int(rng.integers(0, 10))
+            tree.update(row, lo, value)
+            values[row, lo] = value
+        else:
+            delta = int(rng.integers(-2, 3))
+            tree.add(row, lo, hi, delta)
+            values[row, lo:hi] += delta
+        assert tree.query(row, lo, hi) == values[row, lo:hi].min()
+        assert tree.query(row, 0, 20) == values[row].min()
+    assert (tree.values == values).all()
+
+
+def test_single_column():
+    """Degenerate one-leaf trees work."""
+    tree = RangeMinTree(np.array([[4], [2]]))
+    assert tree.query(1, 0, 1) == 2
+    tree.add(1, 0, 1, -2)
+    assert tree.query(1, 0, 1) == 0
@@ -0,0 +1,179 @@
+"""Tests for the set-based search engine."""
+import pytest
+from sqlalchemy import event
+from models import Hotel, RoomType, RatePlan, RateInterval, Availability
+from controllers.search_engine import SearchEngine
+from core.days import DateRange
+from controllers.search_controller import SearchController
+from controllers.search_cache import search_cache
+
+DATES = ("2024-01-01", "2024-01-02", "2024-01-03")
+STAY = DateRange.covering(DATES)
+CHECKOUT = "2024-01-04"  # the stay covers every night in DATES
+
+
+@pytest.fixture
+def catalog(db):
+    """Two Tashkent hotels and one in Samarkand."""
+    db.add_all([
+        Hotel(id=1, name="A", stars=5, city="Tashkent"),
+        Hotel(id=2, name="B", stars=4, city="Tashkent"),
+        Hotel(id=3, name="C", stars=3, city="Samarkand"),
+        RoomType(id=10, hotel_id=1, name="Std", capacity=2),
+        RoomType(id=11, hotel_id=1, name="Single", capacity=1),
+        RoomType(id=20, hotel_id=2, name="Std", capacity=2),
+        RoomType(id=30, hotel_id=3, name="Std", capacity=2),
+        RatePlan(id=100, hotel_id=1, room_type_id=10, title="BB", meal="BB"),
+        RatePlan(id=101, hotel_id=1, room_type_id=10, title="HB", meal="HB"),
+        RatePlan(id=110, hotel_id=1, room_type_id=11, title="BB", meal="BB"),
+        RatePlan(id=200, hotel_id=2, room_type_id=20, title="BB", meal="BB"),
+        RatePlan(id=300, hotel_id=3, room_type_id=30, title="BB", meal="BB"),
+    ])
+    for date in DATES:
+        db.add_all([
+            Availability(room_type_id=10, date=date, available=3),
+            Availability(room_type_id=11, date=date, available=3),
+            Availability(room_type_id=20, date=date, available=0 if date == DATES[1] else 2),
+            Availability(room_type_id=30, date=date, available=5),
+        ])
+    db.add_all([
+        RateInterval(rate_id=100, date_from=DATES[0], date_to=CHECKOUT, amount=1000),
+        RateInterval(rate_id=110, date_from=DATES[0], date_to=CHECKOUT, amount=500),
+        RateInterval(rate_id=200, date_from=DATES[0], date_to=CHECKOUT, amount=700),
+        RateInterval(rate_id=300, date_from=DATES[0], date_to=CHECKOUT, amount=900),
+        # Rate 101 misses a night and must be skipped
+        RateInterval(rate_id=101, date_from=DATES[0], date_to=DATES[2], amount=1),
+    ])
+    db.commit()
+    return db
+
+
+def test_find_offers(catalog):
+    """Only fully available, fully priced room types in the city are offered."""
+    offers = SearchEngine.find_offers(catalog, "Tashkent", STAY, guests=2)
+    assert [o["rate_plan"]["id"] for o in offers] == [100]
+    assert offers[0]["total_price"] == 3000
+    assert offers[0]["nights"] == 3
+    assert offers[0]["hotel"] == {"id": 1, "name": "A", "stars": 5, "city": "Tashkent"}
+
+
+def test_find_offers_guests(catalog):
+    """Smaller parties also see smaller room types."""
+    offers = SearchEngine.find_offers(catalog, "tashkent", STAY, guests=1)
+    assert sorted(o["rate_plan"]["id"] for o in offers) == [100, 110]
+
+
+def test_find_offers_fixed_query_count(catalog, db_engine):
+    """A search costs the same small number of queries regardless of catalog size."""
+    statements = []
+    event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    SearchEngine.find_offers(catalog, "Tashkent", STAY, guests=1)
+    assert len(statements) == 3
+
+
+def test_search_hotels_sorted(catalog):
+    """Controller sorts offers by total price."""
+    offers = SearchController.search_hotels(catalog, "Tashkent", DATES[0], CHECKOUT, guests=1)
+    prices = [o["total_price"] for o in offers]
+    assert prices == sorted(prices)
+
+
+def test_find_offers_indexed_matches_sql(catalog):
+    """The index-backed path returns the same offers as the SQL path."""
+    from controllers.inventory_controller import InventoryController
+    from core.inventory import InventoryIndex
+    index = InventoryController.load_index(catalog, InventoryIndex())
+    for guests in (1, 2):
+        assert SearchEngine.find_offers_indexed(catalog, "Tashkent", STAY, guests, index) == \
+            SearchEngine.find_offers(catalog, "Tashkent", STAY, guests)
+
+
+def test_stream_offers(catalog):
+    """Streaming yields the same offers as the lazy generator, batch by batch."""
+    import json
+    offers = list(SearchController.stream_offers(catalog, "Tashkent", DATES[0], CHECKOUT, guests=1, batch_size=1))
+    assert sorted(o["rate_plan"]["id"] for o in offers) == [100, 110]
+    assert all(o["nights"] == 3 for o in offers)
+
+    lines = "".join(SearchController.stream_ndjson(iter(offers), chunk_size=1)).splitlines()
+    assert [json.loads(line) for line in lines] == offers
+
+
+def test_stream_offers_is_lazy(catalog, db_engine):
+    """Taking the first offer does not read the whole city."""
+    statements = []
+    event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    stream = SearchController.stream_offers(catalog, "Tashkent", DATES[0], CHECKOUT, guests=1, batch_size=1)
+    next(stream)
+    first_batch = len(statements)
+    list(stream)
+    assert len(statements) > first_batch
+
+
+def test_search_page_cursor(catalog):
+    """Paging with the cursor returns each offer once, cheapest first."""
+    first = SearchController.search_page(catalog, "Tashkent", DATES[0], CHECKOUT, guests=1, limit=1)
+    assert [o["rate_plan"]["id"] for o in first["results"]] == [110]
+    second = SearchController.search_page(
+        catalog, "Tashkent", DATES[0], CHECKOUT, guests=1, limit=1, cursor=first["next_cursor"]
+    )
+    assert [o["rate_plan"]["id"] for o in second["results"]] == [100]
+    third = SearchController.search_page(
+        catalog, "Tashkent", DATES[0], CHECKOUT, guests=1, limit=1, cursor=second["next_cursor"]
+    )
+    assert third == {"results": [], "next_cursor": None}
+
+
+def test_search_page_rejects_bad_cursor(catalog):
+    """Invalid cursors and sort keys are client errors."""
+    from fastapi import HTTPException
+    with pytest.raises(HTTPException):
+        SearchController.search_page(catalog, "Tashkent", DATES[0], CHECKOUT, cursor="garbage")
+    with pytest.raises(HTTPException):
+        SearchController.search_page(catalog, "Tashkent", DATES[0], CHECKOUT, sort_by="name")
+
+
+def test_search_page_is_served_from_cache(db, catalog):
+    """A repeated search hits the cache instead of the database."""
+    first = SearchController.search_page(db, "Tashkent", "2024-01-01", "2024-01-03")
+    second = SearchController.search_page(db, "Tashkent", "2024-01-01", "2024-01-03")
+    assert second is first
+    assert search_cache.stats()["hits"] >= 1
+
+
+def test_coalesced_searches_each_publish_search_event(catalog, monkeypatch):
+    """Callers that join an in-flight search still publish their own SEARCH event."""
+    import threading
+    import time
+    from core.frp import EventBus, EVENT_SEARCH
+    from controllers.search_controller import search_flight
+
+    bus = EventBus()
+    events = []
+    bus.subscribe(EVENT_SEARCH, events.append)
+    monkeypatch.setattr("controllers.search_controller.event_bus", bus)
+    release = threading.Event()
+    compute = SearchController.search_page
+
+    def slow_page(*args):
+        release.wait(5)
+        return compute(*args)
+
+    monkeypatch.setattr(SearchController, "search_page", slow_page)
+    coalesced = search_flight.stats()["coalesced"]
+    results = []
+
+    def search():
+        results.append(SearchController.search_hotels(catalog, "Tashkent", DATES[0], CHECKOUT, guests=2))
+
+    threads = [threading.Thread(target=search) for _ in range(2)]
+    for t in threads:
+        t.start()
+    while search_flight.stats()["coalesced"] < coalesced + 1:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(results) == 2 and results[0] is results[1]
+    assert len(events) == 2
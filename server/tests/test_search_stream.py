@@ -0,0 +1,143 @@
+"""HTTP tests for the streaming NDJSON search endpoint."""
+import asyncio
+import base64
+import json
+from urllib.parse import urlencode
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database import get_db
+from database.base import Base
+from models import Hotel, RoomType, RatePlan, RateInterval, Availability
+from app.main import app
+
+CHECKIN, CHECKOUT = "2024-01-01", "2024-01-03"
+HOTELS = 23
+QUERY = {"city": "Tashkent", "checkin": CHECKIN, "checkout": CHECKOUT}
+
+
+def seed(session):
+    """One bookable rate in each of ``HOTELS`` Tashkent hotels."""
+    for i in range(1, HOTELS + 1):
+        session.add_all([
+            Hotel(id=i, name=f"H{i}", stars=3, city="Tashkent"),
+            RoomType(id=i, hotel_id=i, name="Std", capacity=2),
+            RatePlan(id=i, hotel_id=i, room_type_id=i, title="BB", meal="BB"),
+            RateInterval(rate_id=i, date_from=CHECKIN, date_to=CHECKOUT, amount=1000 + i),
+            Availability(room_type_id=i, date="2024-01-01", available=2),
+            Availability(room_type_id=i, date="2024-01-02", available=2),
+        ])
+    session.commit()
+
+
+@pytest.fixture
+def stream_app(tmp_path):
+    """The app on a seeded file database."""
+    path = tmp_path / "stream.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as session:
+        seed(session)
+
+    def override_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_db
+    try:
+        yield app
+    finally:
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+
+async def body_messages(query: dict, disconnect_after: int = None) -> list:
+    """Call the endpoint over raw ASGI and collect each body message sent.
+
+    With ``disconnect_after`` the client goes away once that many messages
+    arrived.
+    """
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/search/stream", "raw_path": b"/search/stream",
+        "root_path": "", "query_string": urlencode(query).encode(),
+        "headers": [(b"host", b"test")], "client": ("test", 1), "server": ("test", 80),
+    }
+    bodies = []
+    gone = asyncio.Event()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await gone.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            bodies.append(message["body"].decode())
+            if disconnect_after is not None and len(bodies) >= disconnect_after:
+                gone.set()
+
+    await asyncio.wait_for(app(scope, receive, send), 10)
+    return bodies
+
+
+def test_stream_lines_match_search(stream_app):
+    """Every line is one offer; together they are the offers /search returns."""
+    client = TestClient(stream_app)
+    with client.stream("GET", "/search/stream", params={**QUERY, "chunk_size": 5}) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        offers = [json.loads(line) for line in response.iter_lines() if line]
+    page = client.get("/search/", params={**QUERY, "limit": 200})
+    assert page.status_code == 200
+    assert len(offers) == HOTELS
+    assert sorted((o["rate_plan"]["id"], o["total_price"]) for o in offers) == sorted(
+        (o["rate_plan"]["id"], o["total_price"]) for o in page.json()
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_flushes_chunk_size_offers_per_message(stream_app):
+    """Each body message is at most chunk_size complete lines."""
+    bodies = await body_messages({**QUERY, "chunk_size": 5})
+    assert all(body.endswith("\n") for body in bodies)
+    sizes = [len(body.splitlines()) for body in bodies]
+    assert sizes == [5, 5, 5, 5, 3]
+    assert all(json.loads(line)["currency"] == "UZS" for body in bodies for line in body.splitlines())
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_when_client_disconnects(stream_app):
+    bodies = await body_messages({**QUERY, "chunk_size": 1}, disconnect_after=1)
+    assert 1 <= len(bodies) < HOTELS
+
+
+def test_overlong_stay_is_rejected_before_publishing(stream_app, monkeypatch):
+    from core.frp import EventBus, EVENT_SEARCH
+
+    bus = EventBus()
+    events = []
+    bus.subscribe(EVENT_SEARCH, events.append)
+    monkeypatch.setattr("controllers.search_controller.event_bus", bus)
+    client = TestClient(stream_app)
+    query = {**QUERY, "checkin": "1000-01-01", "checkout": "2999-12-31"}
+    assert client.get("/search/", params=query).status_code == 400
+    assert client.get("/search/stream", params=query).status_code == 400
+    assert client.get("/search/", params={**QUERY, "checkin": "soon"}).status_code == 400
+    assert events == []
+
+
+@pytest.mark.parametrize("key", [5, ["a"]])
+def test_malformed_cursor_is_a_bad_request(stream_app, key):
+    cursor = base64.urlsafe_b64encode(json.dumps(["price", key]).encode()).decode().rstrip("=")
+    response = TestClient(stream_app).get("/search/", params={**QUERY, "cursor": cursor})
+    assert response.status_code == 400
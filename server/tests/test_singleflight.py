@@ -0,0 +1,87 @@
+"""Tests for single-flight request coalescing."""
+import asyncio
+import threading
+import time
+import pytest
+from core.singleflight import SingleFlight
+
+
+def test_concurrent_threads_share_one_execution():
+    """Threads asking for the same key while it runs get the leader's result."""
+    flight = SingleFlight("test")
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"value": 42}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", compute)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", compute))) for _ in range(4)]
+    for t in followers:
+        t.start()
+    while flight.stats()["coalesced"] < 4:
+        time.sleep(0.001)
+    release.set()
+    for t in [leader, *followers]:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 5 and all(r is results[0] for r in results)
+    stats = flight.stats()
+    assert (stats["executions"], stats["coalesced"], stats["in_flight"]) == (1, 4, 0)
+    assert stats["keys"]["'k'"] == {"executions": 1, "coalesced": 4}
+
+
+def test_finished_calls_run_again():
+    """Nothing is cached once the leader is done."""
+    flight = SingleFlight()
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 2
+    assert flight.stats()["executions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_callers_share_result_and_errors():
+    """Coroutines coalesce on one task; an exception reaches every waiter."""
+    flight = SingleFlight()
+    calls = []
+
+    async def compute(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(*(flight.do_async(("city", 1), compute, 7) for _ in range(10)))
+    assert results == [7] * 10 and calls == [7]
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    outcomes = await asyncio.gather(*(flight.do_async("bad", fail) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(o, ValueError) for o in outcomes)
+    assert flight.stats()["keys"]["'bad'"] == {"executions": 1, "coalesced": 2}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    """Followers still get the result when the leader's request goes away."""
+    flight = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    leader = asyncio.ensure_future(flight.do_async("k", compute))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do_async("k", compute))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == "ok"
@@ -0,0 +1,60 @@
+"""Tests for the SQLite performance profiles."""
+import pytest
+from sqlalchemy import create_engine, text
+from config.settings import settings
+from database.session import SQLITE_PROFILES, apply_sqlite_profile, engine_options, sqlite_pragmas
+
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_profile_pragmas_in_order():
+    """journal_mode comes before the pragmas that touch the file."""
+    pragmas = dict(sqlite_pragmas("balanced"))
+    assert pragmas == SQLITE_PROFILES["balanced"]
+    names = [name for name, _ in sqlite_pragmas("balanced")]
+    assert names.index("journal_mode") < names.index("synchronous")
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        sqlite_pragmas("turbo")
+
+
+def test_settings_override_profile(monkeypatch):
+    """A DB_* setting replaces the profile's value."""
+    monkeypatch.setattr(settings, "DB_SYNCHRONOUS", "FULL")
+    monkeypatch.setattr(settings, "DB_JOURNAL_MODE", "DELETE")
+    pragmas = dict(sqlite_pragmas("fast"))
+    assert pragmas["synchronous"] == "FULL"
+    assert pragmas["journal_mode"] == "DELETE"
+    assert pragmas["cache_size"] == SQLITE_PROFILES["fast"]["cache_size"]
+
+
+def test_apply_profile_on_file_database(tmp_path):
+    """Every new connection runs the profile's pragmas."""
+    engine = create_engine(f"sqlite:///{tmp_path}/app.db", **engine_options(f"sqlite:///{tmp_path}/app.db"))
+    apply_sqlite_profile(engine, "balanced")
+    assert _pragma(engine, "journal_mode") == "wal"
+    assert _pragma(engine, "synchronous") == 1  # NORMAL
+    assert _pragma(engine, "temp_store") == 2  # MEMORY
+    assert _pragma(engine, "busy_timeout") == 5000
+    assert _pragma(engine, "foreign_keys") == 1
+    assert engine.pool.size() == settings.DB_POOL_SIZE
+    engine.dispose()
+
+
+def test_legacy_profile_keeps_sqlite_defaults(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/app.db")
+    assert apply_sqlite_profile(engine, "legacy") == ()
+    assert _pragma(engine, "journal_mode") == "delete"
+    engine.dispose()
+
+
+def test_engine_options():
+    """SQL logging is off by default; in-memory databases get no pool sizing."""
+    assert engine_options("sqlite://")["echo"] is False
+    assert "pool_size" not in engine_options("sqlite://")
+    assert engine_options("sqlite:///./hotel.db")["max_overflow"] == settings.DB_MAX_OVERFLOW
@@ -0,0 +1,92 @@
+"""Tests for the hashed timing wheel."""
+import random
+import pytest
+from core.timing_wheel import TimingWheel
+
+
+def test_fires_at_first_tick_after_deadline():
+    wheel = TimingWheel(tick=1.0, slots=8)
+    wheel.schedule("a", 2.5)
+    assert wheel.advance(2.9) == []
+    assert wheel.advance(3.0) == [("a", 2.5)]
+    assert "a" not in wheel and len(wheel) == 0
+
+
+def test_never_fires_early():
+    """A deadline on a tick boundary fires at that boundary, not before."""
+    wheel = TimingWheel(tick=1.0, slots=8)
+    wheel.schedule("a", 3.0)
+    assert wheel.advance(2.999) == []
+    assert wheel.advance(3.0) == [("a", 3.0)]
+
+
+def test_cancel_and_reschedule():
+    wheel = TimingWheel(tick=1.0, slots=8)
+    wheel.schedule("a", 2)
+    wheel.schedule("b", 2)
+    assert wheel.cancel("a")
+    assert not wheel.cancel("a")
+    wheel.schedule("b", 5)
+    assert wheel.deadline("b") == 5
+    assert wheel.advance(4) == []
+    assert wheel.advance(5) == [("b", 5)]
+    assert wheel.deadline("b") is None
+
+
+def test_deadlines_beyond_one_turn_wait_their_turn():
+    """Keys sharing a bucket fire on their own turn of the wheel."""
+    wheel = TimingWheel(tick=1.0, slots=4)
+    wheel.schedule("near", 2)
+    wheel.schedule("far", 10)
+    assert wheel.advance(2) == [("near", 2)]
+    assert wheel.advance(9) == []
+    assert wheel.advance(10) == [("far", 10)]
+
+
+def test_jump_over_many_turns_returns_earliest_first():
+    wheel = TimingWheel(tick=1.0, slots=4, start=100)
+    wheel.schedule("c", 150)
+    wheel.schedule("a", 101)
+    wheel.schedule("b", 107)
+    wheel.schedule("later", 1000)
+    assert wheel.advance(200) == [("a", 101), ("b", 107), ("c", 150)]
+    assert len(wheel) == 1
+
+
+def test_past_deadline_fires_on_next_advance():
+    wheel = TimingWheel(tick=1.0, slots=8, start=50)
+    wheel.schedule("late", 10)
+    assert wheel.advance(51) == [("late", 10)]
+
+
+def test_matches_sorted_deadlines():
+    """Random schedules, cancels and advances agree with a plain dict."""
+    rnd = random.Random(11)
+    wheel = TimingWheel(tick=0.5, slots=16)
+    pending = {}
+    now = 0.0
+    for _ in range(2000):
+        action = rnd.random()
+        key = rnd.randrange(200)
+        if action < 0.5:
+            deadline = now + rnd.uniform(0, 30)
+            wheel.schedule(key, deadline)
+            pending[key] = deadline
+        elif action < 0.7:
+            assert wheel.cancel(key) == (pending.pop(key, None) is not None)
+        else:
+            now += rnd.uniform(0, 3)
+            fired = wheel.advance(now)
+            boundary = (now // 0.5) * 0.5
+            expected = sorted(((k, d) for k, d in pending.items() if d <= boundary), key=lambda item: item[1])
+            assert fired == expected
+            for k, _ in fired:
+                del pending[k]
+        assert len(wheel) == len(pending)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        TimingWheel(tick=0)
+    with pytest.raises(ValueError):
+        TimingWheel(slots=0)
@@ -0,0 +1,77 @@
+"""Tests for top-k selection and pagination cursors."""
+import base64
+import json
+import pytest
+from core.domain import Hotel, RoomType, RatePlan, SearchOffer
+from core.topk import top_k, search_offer_key, encode_cursor, decode_cursor
+from core.service import FilterService
+
+
+def make_offer(rate_id: int, price: int, stars: int = 4) -> SearchOffer:
+    """Offer with a unique rate plan id."""
+    hotel = Hotel(rate_id, f"H{rate_id}", stars, "Tashkent")
+    room = RoomType(rate_id, rate_id, "Std", 2)
+    rate = RatePlan(rate_id, rate_id, rate_id, "BB", "BB", True, 1)
+    return SearchOffer(hotel, room, rate, price, True)
+
+
+OFFERS = tuple(make_offer(i, price, stars) for i, (price, stars) in enumerate(
+    [(500, 3), (100, 5), (300, 4), (100, 3), (900, 5), (200, 4), (700, 3)], start=1
+))
+
+
+def test_top_k_matches_full_sort():
+    """Bounded selection equals sorting and slicing."""
+    key = search_offer_key("price")
+    assert top_k(iter(OFFERS), 3, key) == sorted(OFFERS, key=key)[:3]
+    assert top_k(iter(OFFERS), 0, key) == []
+
+
+def test_pagination_walks_every_offer_once():
+    """Pages chained by cursor cover all offers in order without repeats."""
+    for sort_by in ("price", "stars", "price_per_night"):
+        key = search_offer_key(sort_by, nights=2)
+        seen, after = [], None
+        while True:
+            page = top_k(iter(OFFERS), 2, key, after)
+            if not page:
+                break
+            seen.extend(page)
+            cursor = encode_cursor(sort_by, key(page[-1]))
+            after = decode_cursor(cursor, sort_by).get_right()
+        assert seen == sorted(OFFERS, key=key)
+
+
+def test_stars_sort_best_first():
+    """Stars sort puts more stars first, cheaper first within a class."""
+    page = top_k(iter(OFFERS), 3, search_offer_key("stars"))
+    assert [(o.hotel.stars, o.total_price) for o in page] == [(5, 100), (5, 900), (4, 200)]
+
+
+def test_decode_cursor_errors():
+    """Garbage and cursors of another sort order are rejected."""
+    assert decode_cursor("not-a-cursor", "price").is_left()
+    assert decode_cursor(encode_cursor("stars", (1, 2)), "price").is_left()
+
+
+
+def test_decode_cursor_rejects_malformed_keys():
+    """Well-encoded cursors whose key is not the sort order's numbers are rejected."""
+    def raw(document) -> str:
+        return base64.urlsafe_b64encode(json.dumps(document).encode()).decode().rstrip("=")
+
+    assert decode_cursor(raw(["price", 5]), "price").is_left()
+    assert decode_cursor(raw(["price", ["a"]]), "price").is_left()
+    assert decode_cursor(raw(["price", ["a", 1]]), "price").is_left()
+    assert decode_cursor(raw(["stars", [-5, 100]]), "stars").is_left()
+    assert decode_cursor(raw(["price", [True, 1]]), "price").is_left()
+    assert decode_cursor(raw(["price"]), "price").is_left()
+    assert decode_cursor(raw(["price", [100, 1]]), "price").get_right() == (100, 1)
+
+
+def test_apply_filters_with_limit():
+    """FilterService keeps only the best offers when given a limit."""
+    result = FilterService.apply_filters(OFFERS, min_price=150, limit=2)
+    assert [o.total_price for o in result] == [200, 300]
+    full = FilterService.apply_filters(OFFERS, min_price=150)
+    assert result == full[:2]